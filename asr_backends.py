@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+음성 인식 엔진 (백엔드)
+모든 백엔드는 load(), transcribe(audio, **options), stream(audio, **options)을 제공하고,
+openai-whisper와 같은 모양의 결과 {'text', 'segments', 'language'}(stream은 세그먼트를 하나씩)를
+돌려주므로 파일 생성기는 어떤 엔진을 쓰든 그대로 동작합니다.
+
+- whisper: openai-whisper (PyTorch)
+- ct2: faster-whisper (CTranslate2, CPU에서는 int8 양자화)
+"""
+
+import os
+
+DEFAULT_BACKEND = 'whisper'
+
+# 구간별 디코딩(stream_windows)에서 한 번에 디코딩하는 구간 길이 (초, 무음 지점에서 자름)
+STREAM_MIN_SECONDS = 20
+STREAM_MAX_SECONDS = 30
+
+# 다음 구간에 이어 줄 이전 텍스트 길이 (디코더 문맥)
+PROMPT_CHARS = 200
+
+
+class WhisperBackend:
+    """openai-whisper (PyTorch) 엔진"""
+
+    name = 'whisper'
+
+    def __init__(self, model_size="base", device=None, model_dir=None):
+        self.model_size = model_size
+        self.device = device
+        self.model_dir = model_dir
+        self.model = None
+
+    def load(self):
+        if self.model is None:
+            import whisper
+            self.model = whisper.load_model(self.model_size, device=self.device, download_root=self.model_dir)
+        return self.model
+
+    def transcribe(self, audio, **options):
+        return self.load().transcribe(audio, **options)
+
+    def stream(self, audio, **options):
+        """무음 지점에서 자른 짧은 구간을 차례로 디코딩하며 세그먼트를 바로 반환"""
+        return stream_windows(self, audio, **options)
+
+
+class CTranslate2Backend:
+    """faster-whisper (CTranslate2) 엔진, CPU에서는 int8로 실행"""
+
+    name = 'ct2'
+
+    def __init__(self, model_size="base", device=None, model_dir=None, compute_type=None):
+        self.model_size = model_size
+        self.device = device or 'cpu'
+        self.model_dir = model_dir
+        self.compute_type = compute_type or os.getenv(
+            'CT2_COMPUTE_TYPE', 'int8' if self.device == 'cpu' else 'float16')
+        self.model = None
+        self.language = None
+
+    def load(self):
+        if self.model is None:
+            from faster_whisper import WhisperModel
+
+            # 로컬 모델 폴더(변환된 CTranslate2 모델)가 있으면 그것을 사용
+            model_path = self.model_size
+            if self.model_dir and os.path.isdir(os.path.join(self.model_dir, self.model_size)):
+                model_path = os.path.join(self.model_dir, self.model_size)
+            elif self.model_dir and os.path.isfile(os.path.join(self.model_dir, 'model.bin')):
+                model_path = self.model_dir
+            self.model = WhisperModel(
+                model_path,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=int(os.getenv('CT2_CPU_THREADS', '0')),
+                download_root=self.model_dir,
+            )
+        return self.model
+
+    def stream(self, audio, language=None, word_timestamps=False, verbose=None, **options):
+        """faster-whisper가 디코딩하는 대로 세그먼트를 하나씩 반환"""
+        options.pop('fp16', None)
+        segments, info = self.load().transcribe(
+            audio, language=language, word_timestamps=word_timestamps, **options)
+        self.language = info.language
+
+        for index, segment in enumerate(segments):
+            words = []
+            for word in segment.words or ():
+                words.append({'word': word.word, 'start': word.start, 'end': word.end,
+                              'probability': word.probability})
+            if verbose:
+                print(f"[{segment.start:.3f} --> {segment.end:.3f}] {segment.text}")
+            yield {
+                'id': index,
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'words': words,
+            }
+
+    def transcribe(self, audio, **options):
+        segments = list(self.stream(audio, **options))
+        return {'text': ''.join(s['text'] for s in segments), 'segments': segments, 'language': self.language}
+
+
+def shift_segment(segment, offset):
+    """세그먼트(및 단어) 타임스탬프를 offset초만큼 이동한 사본"""
+    segment = dict(segment)
+    segment['start'] = segment['start'] + offset
+    segment['end'] = segment['end'] + offset
+    if segment.get('words'):
+        segment['words'] = [dict(word, start=word['start'] + offset, end=word['end'] + offset)
+                            for word in segment['words']]
+    return segment
+
+
+def decode_windows(model, audio, windows, prompt=None, **options):
+    """
+    (번호, (시작, 끝)) 샘플 구간을 차례로 디코딩
+
+    model: transcribe()가 있는 백엔드 또는 상주 작업자
+    각 구간마다 (번호, 전체 타임스탬프로 옮긴 세그먼트 목록, 다음 구간용 프롬프트) 반환
+    """
+    from audio_io import SAMPLE_RATE
+
+    for index, (start, end) in windows:
+        result = model.transcribe(audio[start:end], initial_prompt=prompt, **options)
+        offset = start / SAMPLE_RATE
+        segments = [shift_segment(segment, offset) for segment in result['segments']]
+        prompt = (result.get('text') or '')[-PROMPT_CHARS:] or prompt
+        yield index, segments, prompt
+
+
+def stream_windows(model, audio, min_seconds=STREAM_MIN_SECONDS, max_seconds=STREAM_MAX_SECONDS, **options):
+    """
+    무음 지점에서 자른 구간을 차례로 디코딩하며 세그먼트를 하나씩 반환 (어떤 백엔드든 같은 방식)
+
+    audio: 경로면 메모리 맵(PcmAudio)으로 열어 구간만 읽으므로 음성 길이와 관계없이 메모리 일정
+    model: transcribe()가 있는 백엔드 또는 상주 작업자 (상주 작업자는 구간마다 모델 잠금을 잡았다 풂)
+    """
+    from parallel_transcribe import plan_chunks
+
+    if isinstance(audio, (str, os.PathLike)):
+        from audio_io import open_pcm
+        with open_pcm(audio) as pcm:
+            yield from stream_windows(model, pcm, min_seconds, max_seconds, **options)
+        return
+
+    prompt = options.pop('initial_prompt', None)
+    windows = plan_chunks(audio, min_seconds=min_seconds, max_seconds=max_seconds)
+    index = 0
+    for _, segments, prompt in decode_windows(model, audio, enumerate(windows), prompt, **options):
+        for segment in segments:
+            segment['id'] = index
+            index += 1
+            yield segment
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    CTranslate2Backend.name: CTranslate2Backend,
+}
+
+
+def create_backend(name=None, model_size="base", device=None, model_dir=None):
+    """이름(없으면 ASR_BACKEND 환경 변수)으로 백엔드 생성"""
+    name = name or os.getenv('ASR_BACKEND', DEFAULT_BACKEND)
+    model_dir = model_dir or os.getenv('ASR_MODEL_DIR') or None
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 음성 인식 백엔드: {name} (사용 가능: {', '.join(BACKENDS)})")
+    return backend_class(model_size, device=device, model_dir=model_dir)
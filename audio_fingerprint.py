@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+음성 지문 (스펙트럼 피크 해시)
+16 kHz PCM을 8 kHz로 줄여 STFT를 구하고, 프레임마다 주파수 대역별 가장 강한 피크를 고른 뒤
+가까운 피크 쌍 (주파수1, 주파수2, 시간 차이)을 24비트 해시로 만듭니다.
+해시와 시간은 지역 색인(SQLite)에 넣고, 새 음성의 해시로 (음성, 시간 차이) 투표를 해서
+같은 음성이나 한쪽이 다른 쪽에 포함된 음성(쇼츠, 재업로드)과 그 시작 위치를 찾습니다.
+음성은 블록 단위로 읽으므로 메모리 맵 음성의 길이와 관계없이 메모리가 일정합니다.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+from audio_io import SAMPLE_RATE
+
+# 지문 계산용 STFT (8 kHz, 512점 FFT, 32 ms 간격)
+FP_DECIMATE = 2
+FP_SAMPLE_RATE = SAMPLE_RATE // FP_DECIMATE
+FFT_SIZE = 512
+HOP_SIZE = 256
+FRAME_SECONDS = HOP_SIZE / FP_SAMPLE_RATE
+
+# 피크를 고르는 주파수 대역 (FFT 빈 번호, 약 300 Hz ~ 4 kHz)
+PEAK_BANDS = ((20, 40), (40, 70), (70, 110), (110, 160), (160, 256))
+PEAK_MIN_DB = 12.0      # 프레임 중앙값보다 이만큼 커야 피크
+PEAK_FREQ_REACH = 3     # 피크는 주파수 ±3빈 안에서 가장 커야 함
+SILENCE_DB = -70.0      # 이보다 조용한 프레임은 건너뜀
+
+# 피크 쌍: 앵커 뒤 1~63 프레임 안의 피크 최대 FAN_OUT개
+FAN_OUT = 3
+MAX_PAIR_FRAMES = 63
+
+# 한 번에 처리하는 STFT 프레임 수
+BLOCK_FRAMES = 4096
+
+# 일치 판정: 같은 시간 차이에 모인 해시 수와 비율
+MIN_MATCHES = 20
+MIN_MATCH_RATIO = 0.05
+# 포함 관계 판정 여유 (초)
+CONTAIN_TOLERANCE = 1.0
+
+FINGERPRINT_FILE = 'fingerprints.sqlite'
+
+
+def spectral_peaks(audio):
+    """
+    (프레임 번호, 주파수 빈) 피크 배열 두 개
+
+    audio: 16 kHz 모노 float 배열 또는 PcmAudio (블록 단위로 슬라이스)
+    """
+    import numpy as np
+
+    window = np.hanning(FFT_SIZE).astype(np.float32)
+    span = FFT_SIZE * FP_DECIMATE
+    step = HOP_SIZE * FP_DECIMATE
+    count = max(0, (len(audio) - span) // step + 1)
+
+    times = []
+    freqs = []
+    for first in range(0, count, BLOCK_FRAMES):
+        n = min(BLOCK_FRAMES, count - first)
+        block = np.asarray(audio[first * step:(first + n - 1) * step + span], dtype=np.float32)
+        # 두 샘플 평균으로 8 kHz로 줄임 (간단한 저역 통과)
+        block = block[:len(block) // 2 * 2].reshape(-1, 2).mean(axis=1)
+        frames = np.lib.stride_tricks.sliding_window_view(block, FFT_SIZE)[::HOP_SIZE][:n]
+        spectrum = 20.0 * np.log10(np.abs(np.fft.rfft(frames * window, axis=1)) + 1e-6)
+
+        loud = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-12) > SILENCE_DB
+        floor = np.median(spectrum, axis=1)
+        neighborhood = _local_max(spectrum)
+        for low, high in PEAK_BANDS:
+            band = spectrum[:, low:high]
+            peak = np.argmax(band, axis=1)
+            value = band[np.arange(n), peak]
+            # 대역 경계에 걸친 경사면이 아니라 주변(주파수 ±3빈, 시간 ±1프레임)에서 가장 큰 점만 사용
+            keep = loud & (value > floor + PEAK_MIN_DB) & (value >= neighborhood[np.arange(n), peak + low])
+            times.append(np.nonzero(keep)[0] + first)
+            freqs.append(peak[keep] + low)
+
+    if not times:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    times = np.concatenate(times).astype(np.int64)
+    freqs = np.concatenate(freqs).astype(np.int64)
+    order = np.lexsort((freqs, times))
+    return times[order], freqs[order]
+
+
+def _local_max(spectrum, freq_reach=PEAK_FREQ_REACH, time_reach=1):
+    """각 점 주변 (주파수 ±freq_reach, 시간 ±time_reach)의 최댓값"""
+    import numpy as np
+
+    result = spectrum.copy()
+    for shift in range(1, freq_reach + 1):
+        result[:, shift:] = np.maximum(result[:, shift:], spectrum[:, :-shift])
+        result[:, :-shift] = np.maximum(result[:, :-shift], spectrum[:, shift:])
+    along_freq = result.copy()
+    for shift in range(1, time_reach + 1):
+        result[shift:] = np.maximum(result[shift:], along_freq[:-shift])
+        result[:-shift] = np.maximum(result[:-shift], along_freq[shift:])
+    return result
+
+
+def landmark_hashes(times, freqs):
+    """피크 쌍 해시 (uint32: 주파수1 9비트 · 주파수2 9비트 · 시간 차이 6비트)와 앵커 프레임 번호"""
+    import numpy as np
+
+    n = len(times)
+    if n < 2:
+        return np.zeros(0, np.uint32), np.zeros(0, np.uint32)
+    # 같은 프레임의 다른 대역 피크를 건너뛸 수 있게 넉넉히 본 뒤 앞에서 FAN_OUT개만 사용
+    reach = FAN_OUT + len(PEAK_BANDS)
+    anchors = np.arange(n)[:, None]
+    targets = anchors + np.arange(1, reach + 1)[None, :]
+    inside = targets < n
+    targets = np.minimum(targets, n - 1)
+    dt = times[targets] - times[anchors]
+    valid = inside & (dt >= 1) & (dt <= MAX_PAIR_FRAMES)
+    valid &= np.cumsum(valid, axis=1) <= FAN_OUT
+
+    rows, cols = np.nonzero(valid)
+    f1 = freqs[rows]
+    f2 = freqs[targets[rows, cols]]
+    hashes = (f1 << 15) | (f2 << 6) | dt[rows, cols]
+    return hashes.astype(np.uint32), times[rows].astype(np.uint32)
+
+
+def fingerprint(audio):
+    """음성 배열의 지문 → (해시 배열, 시간 배열, 길이(초))"""
+    hashes, times = landmark_hashes(*spectral_peaks(audio))
+    return hashes, times, len(audio) / SAMPLE_RATE
+
+
+def fingerprint_file(audio_file):
+    """음성 파일의 지문 (WAV는 메모리 맵으로, 그 밖의 형식은 FFmpeg로 풀어서 읽음)"""
+    from audio_io import open_pcm
+
+    with open_pcm(audio_file) as audio:
+        return fingerprint(audio)
+
+
+class FingerprintIndex:
+    """음성 해시(SHA-256) → 지문을 담는 지역 색인 (SQLite, 해시로 역색인)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS audio ('
+                       'id INTEGER PRIMARY KEY, digest TEXT UNIQUE, duration REAL, hashes INTEGER)')
+            db.execute('CREATE TABLE IF NOT EXISTS landmarks (hash INTEGER, audio INTEGER, time INTEGER)')
+            db.execute('CREATE INDEX IF NOT EXISTS landmarks_hash ON landmarks (hash)')
+
+    @contextmanager
+    def _connect(self):
+        """트랜잭션 하나 (끝나면 커밋하고 연결을 닫음)"""
+        db = sqlite3.connect(str(self.path), timeout=60)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def __contains__(self, digest):
+        with self._connect() as db:
+            return db.execute('SELECT 1 FROM audio WHERE digest = ?', (digest,)).fetchone() is not None
+
+    def add(self, digest, hashes, times, duration):
+        """음성 하나의 지문 등록 (이미 있으면 그대로)"""
+        import numpy as np
+
+        pairs = np.unique(np.stack([hashes.astype(np.int64), times.astype(np.int64)], axis=1), axis=0) \
+            if len(hashes) else np.zeros((0, 2), np.int64)
+        with self._connect() as db:
+            if db.execute('SELECT 1 FROM audio WHERE digest = ?', (digest,)).fetchone():
+                return
+            audio_id = db.execute('INSERT INTO audio (digest, duration, hashes) VALUES (?, ?, ?)',
+                                  (digest, float(duration), len(pairs))).lastrowid
+            db.executemany('INSERT INTO landmarks (hash, audio, time) VALUES (?, ?, ?)',
+                           ((int(h), audio_id, int(t)) for h, t in pairs))
+
+    def match(self, hashes, times, duration, exclude=None, batch=500):
+        """
+        지문이 겹치는 음성 후보를 점수 순으로 반환
+
+        각 후보: {'digest', 'offset'(초, 새 음성이 저장된 음성의 어디서 시작하는지), 'matches', 'ratio',
+                 'duration'(저장된 음성 길이), 'contained'(새 음성이 저장된 음성 안에 들어가는지)}
+        """
+        import numpy as np
+
+        if not len(hashes):
+            return []
+        order = np.argsort(hashes, kind='stable')
+        query_hashes = hashes[order].astype(np.int64)
+        query_times = times[order].astype(np.int64)
+        unique_hashes = np.unique(query_hashes)
+
+        audio_ids = []
+        deltas = []
+        with self._connect() as db:
+            for first in range(0, len(unique_hashes), batch):
+                chunk = [int(h) for h in unique_hashes[first:first + batch]]
+                rows = db.execute(f"SELECT hash, audio, time FROM landmarks WHERE hash IN ({','.join('?' * len(chunk))})",
+                                  chunk).fetchall()
+                if not rows:
+                    continue
+                rows = np.array(rows, dtype=np.int64)
+                low = np.searchsorted(query_hashes, rows[:, 0], 'left')
+                high = np.searchsorted(query_hashes, rows[:, 0], 'right')
+                repeat = high - low
+                # 저장된 해시 하나 × 같은 해시를 가진 질의 시각 모두
+                starts = np.repeat(low, repeat)
+                within = np.arange(repeat.sum()) - np.repeat(np.cumsum(repeat) - repeat, repeat)
+                audio_ids.append(np.repeat(rows[:, 1], repeat))
+                deltas.append(np.repeat(rows[:, 2], repeat) - query_times[starts + within])
+            known = {row[0]: (row[1], row[2]) for row in
+                     db.execute('SELECT id, digest, duration FROM audio').fetchall()}
+
+        if not audio_ids:
+            return []
+        audio_ids = np.concatenate(audio_ids)
+        deltas = np.concatenate(deltas)
+        candidates = []
+        for audio_id in np.unique(audio_ids):
+            digest, stored_duration = known[int(audio_id)]
+            if digest == exclude:
+                continue
+            values, counts = np.unique(deltas[audio_ids == audio_id], return_counts=True)
+            # 프레임 경계가 어긋나 이웃한 시간 차이로 나뉜 표를 합침
+            following = np.zeros_like(counts)
+            adjacent = np.nonzero(np.diff(values) == 1)[0]
+            following[adjacent] = counts[adjacent + 1]
+            best = int(np.argmax(counts + following))
+            matches = int(counts[best] + following[best])
+            offset = float(values[best]) * FRAME_SECONDS
+            candidates.append({
+                'digest': digest,
+                'offset': offset,
+                'matches': matches,
+                'ratio': matches / len(unique_hashes),
+                'duration': stored_duration,
+                'contained': (offset >= -CONTAIN_TOLERANCE
+                              and offset + duration <= stored_duration + CONTAIN_TOLERANCE),
+            })
+        candidates = [c for c in candidates if c['matches'] >= MIN_MATCHES and c['ratio'] >= MIN_MATCH_RATIO]
+        candidates.sort(key=lambda c: c['matches'], reverse=True)
+        return candidates
+
+
+def clip_segments(segments, offset, duration):
+    """저장된 세그먼트에서 [offset, offset + duration] 구간만 골라 새 음성 기준 시간으로 옮김"""
+    from asr_backends import shift_segment
+
+    clipped = []
+    for segment in segments:
+        if segment['end'] <= offset or segment['start'] >= offset + duration:
+            continue
+        segment = shift_segment(segment, -offset)
+        segment['start'] = max(0.0, segment['start'])
+        segment['end'] = min(duration, segment['end'])
+        if segment.get('words'):
+            segment['words'] = [word for word in segment['words'] if 0.0 <= word['start'] < duration]
+        segment['id'] = len(clipped)
+        clipped.append(segment)
+    return clipped
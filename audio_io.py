@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+음성 인식용 오디오 입출력
+다운로드 단계에서 16 kHz 모노 PCM(WAV)을 바로 만들어 Whisper가 다시 디코딩하지 않게 합니다.
+"""
+
+import os
+import wave
+import struct
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Whisper 입력 형식
+SAMPLE_RATE = 16000
+
+# 음성 인식에 충분한 가장 작은 오디오 전용 스트림 (초저음질 제외)
+ASR_FORMAT = 'worstaudio[abr>=48]/worstaudio/bestaudio/best'
+
+# ffmpeg 한 번으로 16 kHz 모노 변환
+PCM_FFMPEG_ARGS = ['-ar', str(SAMPLE_RATE), '-ac', '1']
+
+AUDIO_MODES = ('pcm', 'mp3')
+
+
+def audio_extension(audio_mode):
+    """다운로드 모드별 확장자"""
+    return 'wav' if audio_mode == 'pcm' else 'mp3'
+
+
+def ytdlp_cli_args(audio_mode):
+    """yt-dlp 명령행 형식/추출 옵션"""
+    if audio_mode == 'pcm':
+        return [
+            '-f', ASR_FORMAT,
+            '-x',  # 오디오만 추출
+            '--audio-format', 'wav',
+            '--postprocessor-args', 'ExtractAudio:' + ' '.join(PCM_FFMPEG_ARGS),
+        ]
+    return [
+        '-f', 'bestaudio',
+        '-x',  # 오디오만 추출
+        '--audio-format', 'mp3',
+        '--audio-quality', '0',  # 최고 품질
+    ]
+
+
+def ytdlp_options(audio_mode):
+    """yt_dlp.YoutubeDL 형식/추출 옵션"""
+    if audio_mode == 'pcm':
+        return {
+            'format': ASR_FORMAT,
+            'postprocessors': [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'wav',
+            }],
+            'postprocessor_args': {'extractaudio': list(PCM_FFMPEG_ARGS)},
+        }
+    return {
+        'format': 'bestaudio/best',
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            'preferredquality': '192',
+        }],
+    }
+
+
+def audio_mime_type(audio_file):
+    """HTML <audio>용 MIME 타입"""
+    return 'audio/wav' if Path(audio_file).suffix.lower() == '.wav' else 'audio/mpeg'
+
+
+def is_asr_ready(audio_file):
+    """16 kHz 모노 16비트 WAV인지 확인"""
+    if Path(audio_file).suffix.lower() != '.wav':
+        return False
+    try:
+        with wave.open(str(audio_file), 'rb') as wav:
+            return (wav.getnchannels() == 1 and wav.getframerate() == SAMPLE_RATE
+                    and wav.getsampwidth() == 2)
+    except (OSError, wave.Error, EOFError):
+        return False
+
+
+def audio_duration(audio_file):
+    """WAV 음성 길이 (초, 헤더만 읽음), 다른 형식이면 None"""
+    try:
+        with wave.open(str(audio_file), 'rb') as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (OSError, EOFError, wave.Error):
+        return None
+
+
+def wav_data_range(audio_file):
+    """WAV 파일의 data 청크 (시작 바이트, 길이)"""
+    file_size = os.path.getsize(audio_file)
+    with open(audio_file, 'rb') as f:
+        riff = f.read(12)
+        if riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+            raise ValueError(f"WAV 파일이 아닙니다: {audio_file}")
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"WAV data 청크가 없습니다: {audio_file}")
+            chunk_id, size = header[:4], struct.unpack('<I', header[4:])[0]
+            if chunk_id == b'data':
+                offset = f.tell()
+                # 파이프로 만든 WAV는 길이가 비어 있거나 최대값이므로 파일 크기로 제한
+                return offset, min(size, file_size - offset)
+            f.seek(size + (size & 1), 1)
+
+
+class PcmAudio:
+    """
+    16 kHz 모노 16비트 PCM을 메모리 맵으로 연 음성
+
+    len()은 샘플 수, audio[start:end]는 그 구간만 float32 배열로 읽어 반환하므로
+    음성 길이와 관계없이 메모리 사용량이 일정함
+    """
+
+    def __init__(self, path, offset=0, size=None, temporary=False):
+        import numpy as np
+
+        self.path = str(path)
+        self.temporary = temporary
+        if size is None:
+            size = os.path.getsize(self.path) - offset
+        count = size // 2
+        if count:
+            self._data = np.memmap(self.path, dtype='<i2', mode='r', offset=offset, shape=(count,))
+        else:
+            self._data = np.zeros(0, dtype='<i2')
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, key):
+        import numpy as np
+
+        if not isinstance(key, slice):
+            raise TypeError("PcmAudio는 구간(slice)으로만 읽을 수 있습니다.")
+        return np.asarray(self._data[key], dtype=np.float32) / 32768.0
+
+    def iter_windows(self, window_samples):
+        """고정 길이 구간을 차례로 (시작 샘플, float32 배열) 반환"""
+        for start in range(0, len(self), window_samples):
+            yield start, self[start:start + window_samples]
+
+    def close(self):
+        """메모리 맵을 닫고, 임시 PCM이면 삭제"""
+        self._data = None
+        if self.temporary:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def decode_to_pcm(audio_file, pcm_file, ffmpeg='ffmpeg'):
+    """ffmpeg로 16 kHz 모노 raw PCM 파일을 만듦 (디스크로 바로 스트리밍)"""
+    subprocess.run(
+        [ffmpeg, '-nostdin', '-v', 'error', '-y', '-i', str(audio_file),
+         *PCM_FFMPEG_ARGS, '-f', 's16le', '-acodec', 'pcm_s16le', str(pcm_file)],
+        check=True,
+    )
+    return pcm_file
+
+
+def open_pcm(audio_file):
+    """
+    음성을 메모리 맵 PcmAudio로 열기
+
+    ASR용 WAV는 data 청크를 그대로 매핑하고, 그 밖의 형식은 ffmpeg로 옆에 임시 raw PCM을 만들어 매핑
+    (임시 파일은 close() 때 삭제)
+    """
+    if is_asr_ready(audio_file):
+        offset, size = wav_data_range(audio_file)
+        return PcmAudio(audio_file, offset, size)
+
+    audio_file = Path(audio_file)
+    fd, pcm_file = tempfile.mkstemp(prefix=f'.{audio_file.stem}.', suffix='.pcm', dir=audio_file.parent)
+    os.close(fd)
+    try:
+        decode_to_pcm(audio_file, pcm_file)
+    except BaseException:
+        os.unlink(pcm_file)
+        raise
+    return PcmAudio(pcm_file, temporary=True)
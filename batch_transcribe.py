@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+여러 YouTube URL 일괄 처리
+다운로드(N+1) · 음성 인식(N) · 파일 생성(N-1)을 파이프라인으로 겹쳐 실행합니다.
+"""
+
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BatchResult:
+    """URL 하나의 처리 결과"""
+
+    __slots__ = ('url', 'ok', 'cached', 'stage', 'error', 'outputs', 'elapsed')
+
+    def __init__(self, url):
+        self.url = url
+        self.ok = False
+        self.cached = False
+        self.stage = 'download'
+        self.error = None
+        self.outputs = None
+        self.elapsed = 0.0
+
+
+def read_urls(source):
+    """파일 경로 또는 '-'(표준 입력)에서 URL 목록 읽기 (빈 줄 · # 주석 무시)"""
+    if source == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+    urls = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            urls.append(line)
+    return urls
+
+
+def run_batch(urls, download, transcribe, postprocess=None, prefetch=2,
+              download_workers=1, post_workers=2, warmup=None):
+    """
+    URL 목록을 파이프라인으로 처리
+
+    download(url) -> audio_file, None, 또는 캐시 적중 시 {종류: 경로} dict
+    transcribe(audio_file) -> result
+    postprocess(result, audio_file, url) -> 결과 파일 정보 (백그라운드 풀에서 실행)
+    """
+    results = [BatchResult(url) for url in urls]
+    started = {}
+
+    download_pool = ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix='download')
+    post_pool = ThreadPoolExecutor(max_workers=post_workers, thread_name_prefix='writer')
+    post_futures = []
+
+    try:
+        # 모델 로딩을 첫 다운로드와 겹치기
+        warmup_future = post_pool.submit(warmup) if warmup else None
+
+        pending = deque()
+        next_index = 0
+
+        def fill():
+            nonlocal next_index
+            while next_index < len(urls) and len(pending) <= prefetch:
+                started[next_index] = time.time()
+                pending.append((next_index, download_pool.submit(download, urls[next_index])))
+                next_index += 1
+
+        fill()
+        if warmup_future is not None:
+            try:
+                warmup_future.result()
+            except Exception as e:
+                # 미리 올리지 못해도 영상마다 다시 시도하고, 실패는 결과 요약에 남김
+                print(f"⚠️ 모델 미리 로드 실패: {e}")
+
+        while pending:
+            index, future = pending.popleft()
+            fill()  # 음성 인식 중에 다음 영상 다운로드
+            item = results[index]
+
+            try:
+                audio_file = future.result()
+            except Exception as e:
+                audio_file = None
+                item.error = str(e)
+            if not audio_file:
+                item.error = item.error or "음성 다운로드 실패"
+                item.elapsed = time.time() - started[index]
+                continue
+            if isinstance(audio_file, dict):
+                # 캐시 적중: 음성 인식과 파일 생성 생략
+                item.ok = True
+                item.cached = True
+                item.stage = 'done'
+                item.outputs = audio_file
+                item.elapsed = time.time() - started[index]
+                continue
+
+            item.stage = 'transcribe'
+            try:
+                result = transcribe(audio_file)
+            except Exception as e:
+                item.error = str(e)
+                item.elapsed = time.time() - started[index]
+                continue
+
+            if postprocess is None:
+                item.ok = True
+                item.stage = 'done'
+                item.outputs = {'audio': audio_file}
+                item.elapsed = time.time() - started[index]
+                continue
+
+            item.stage = 'write'
+            post_futures.append((index, post_pool.submit(_timed, postprocess, result, audio_file, urls[index])))
+            del result
+
+        for index, future in post_futures:
+            item = results[index]
+            try:
+                item.outputs, finished = future.result()
+                item.ok = True
+                item.stage = 'done'
+            except Exception as e:
+                item.error = str(e)
+                finished = time.time()
+            item.elapsed = finished - started[index]
+    finally:
+        download_pool.shutdown(wait=True)
+        post_pool.shutdown(wait=True)
+
+    return results
+
+
+def _timed(func, *args):
+    """함수 실행 결과와 완료 시각을 함께 반환"""
+    return func(*args), time.time()
+
+
+def print_summary(results):
+    """URL별 성공/실패 요약 출력"""
+    succeeded = sum(1 for r in results if r.ok)
+    cached = sum(1 for r in results if r.cached)
+    print()
+    print("=" * 50)
+    print(f"📊 일괄 처리 결과: 성공 {succeeded} (캐시 {cached}) / 실패 {len(results) - succeeded} / 전체 {len(results)}")
+    print("=" * 50)
+    for r in results:
+        if r.cached:
+            print(f"⚡ {r.url} (캐시)")
+        elif r.ok:
+            print(f"✅ {r.url} ({r.elapsed:.1f}초)")
+        else:
+            print(f"❌ {r.url} [{r.stage}] {r.error}")
+    return succeeded == len(results)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크 결과 비교
+두 결과 JSON(run_benchmarks.py가 저장)의 중앙값을 항목별로 비교하고,
+기준보다 느려진 항목이 있으면 종료 코드 1을 돌려줍니다.
+
+사용법:
+    python benchmarks/compare_results.py 기준.json 새.json [--threshold 0.10]
+"""
+
+import sys
+import json
+
+from run_benchmarks import REGRESSION_THRESHOLD, compare, print_comparison
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument('baseline', help="기준 결과 JSON")
+    parser.add_argument('current', help="비교할 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="성능 저하로 볼 중앙값 증가 비율 (기본값: 0.10)")
+    args = parser.parse_args(argv)
+
+    baseline = load(args.baseline)
+    current = load(args.current)
+    print(f"기준: {baseline.get('commit') or '?'} ({baseline.get('created')})")
+    print(f"현재: {current.get('commit') or '?'} ({current.get('created')})")
+    if baseline.get('environment') != current.get('environment'):
+        print("⚠️ 실행 환경(인터프리터 · 플랫폼 · 패키지 버전)이 달라 결과를 직접 비교하기 어렵습니다.")
+    rows, regressions = compare(baseline, current, args.threshold)
+    print_comparison(rows, regressions, args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+파이프라인 단계별 오프라인 벤치마크
+합성 자막(100 ~ 100k 자막)과 합성 음성으로 타임스탬프 변환, SRT/VTT/JSON 생성, SRT 파싱(srt_to_json,
+srt_to_word_highlight), HTML 플레이어 생성, 로컬 캐시의 tiny 모델로 하는 전체 변환 시간을 잽니다.
+네트워크를 쓰지 않으며, 모델이나 패키지가 없는 항목은 이유와 함께 건너뜀으로 기록합니다.
+
+결과는 JSON 파일(커밋 · 환경 정보 포함)로 저장하고, --baseline으로 이전 결과와 비교해
+중앙값이 기준보다 느려진 항목이 있으면 종료 코드 1을 돌려줍니다.
+
+사용법:
+    python benchmarks/run_benchmarks.py [--sizes 100,1000,10000,100000] [--repeat 5] [--only 'write_*']
+                                        [--output 결과.json] [--baseline 이전.json] [--no-e2e]
+    python benchmarks/compare_results.py 이전.json 새.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import fnmatch
+import platform
+import statistics
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from synthetic import synthetic_segments, write_srt_file, write_wav_file  # noqa: E402
+
+RESULT_VERSION = 1
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+DEFAULT_RESULTS_DIR = BENCH_DIR / 'results'
+
+# 기준보다 중앙값이 이 비율 이상 느려지면 성능 저하로 판단
+REGRESSION_THRESHOLD = float(os.getenv('BENCH_REGRESSION_THRESHOLD', '0.10'))
+
+# 전체 변환 벤치마크 (합성 음성 길이, 모델)
+E2E_AUDIO_SECONDS = 30
+E2E_MODEL = os.getenv('BENCH_MODEL', 'tiny')
+
+# 결과 파일에 버전을 남길 패키지
+PACKAGES = ('numpy', 'opencc-python-reimplemented', 'openai-whisper', 'faster-whisper')
+
+
+class Skip(Exception):
+    """패키지나 모델이 없어 건너뛰는 벤치마크"""
+
+
+def measure(run, repeat, setup=None):
+    """준비 실행 1회 후 repeat회 실행한 시간 목록 (초, 출력은 버림, setup은 시간에서 제외)"""
+    times = []
+    for k in range(repeat + 1):
+        if setup:
+            setup()
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+        if k:
+            times.append(elapsed)
+    return times
+
+
+def summarize(times, items):
+    """시간 목록 → 통계 (항목당 시간 · 초당 처리량 포함)"""
+    median = statistics.median(times)
+    return {
+        'runs': len(times),
+        'min': round(min(times), 6),
+        'median': round(median, 6),
+        'mean': round(statistics.mean(times), 6),
+        'stdev': round(statistics.stdev(times), 6) if len(times) > 1 else 0.0,
+        'per_item_us': round(median / items * 1e6, 3) if items else None,
+        'items_per_second': round(items / median, 1) if median else None,
+    }
+
+
+def clear_simplified_memo():
+    """번체→간체 변환 메모를 비워 매 실행이 같은 조건에서 시작하도록"""
+    from text_normalize import to_simplified
+    to_simplified.cache_clear()
+
+
+# 자막 개수별 벤치마크: (이름, 준비 함수) — 준비 함수는 (size, 작업 폴더) → (run, setup)
+
+def bench_format_timestamp(size, work):
+    from transcript_writers import format_timestamp
+
+    values = [segment['start'] for segment in synthetic_segments(size, words=False)]
+
+    def run():
+        for value in values:
+            format_timestamp(value)
+    return run, None
+
+
+def bench_write_srt(size, work):
+    from youtube_to_transcript import write_srt
+
+    segments = synthetic_segments(size)
+    return (lambda: write_srt(segments, work / 'bench.srt')), None
+
+
+def bench_write_vtt(size, work):
+    from youtube_to_transcript import write_vtt
+
+    segments = synthetic_segments(size)
+    return (lambda: write_vtt(segments, work / 'bench.vtt')), None
+
+
+def bench_write_json(size, work):
+    from youtube_transcript_standalone import write_json
+
+    segments = synthetic_segments(size)
+    result = {'language': 'zh', 'text': ''.join(segment['text'] for segment in segments), 'segments': segments}
+    return (lambda: write_json(result, work / 'bench.json')), clear_simplified_memo
+
+
+def bench_srt_to_json(size, work):
+    from srt_to_json import srt_to_json
+
+    srt_file = write_srt_file(work / 'input.srt', size)
+    return (lambda: srt_to_json(srt_file, work / 'input_simplified.json')), clear_simplified_memo
+
+
+def bench_srt_to_word_highlight(size, work):
+    from srt_to_word_highlight import create_word_highlight_json
+
+    srt_file = write_srt_file(work / 'input.srt', size)
+    return (lambda: create_word_highlight_json(srt_file, work / 'input_word_highlight.json')), None
+
+
+def bench_create_html_player(size, work):
+    from youtube_transcript_standalone import create_html_player
+
+    srt_file = write_srt_file(work / 'input.srt', size)
+    audio_file = work / 'audio.wav'
+    audio_file.touch()
+    return (lambda: create_html_player(srt_file, str(audio_file))), None
+
+
+CUE_BENCHMARKS = (
+    ('format_timestamp', bench_format_timestamp),
+    ('write_srt', bench_write_srt),
+    ('write_vtt', bench_write_vtt),
+    ('write_json', bench_write_json),
+    ('srt_to_json', bench_srt_to_json),
+    ('srt_to_word_highlight', bench_srt_to_word_highlight),
+    ('create_html_player', bench_create_html_player),
+)
+
+
+def cached_model(model, backend, model_dir=None):
+    """로컬에 이미 받아 둔 모델인지 확인 (없으면 Skip, 다운로드하지 않음)"""
+    from env_probe import find_module
+
+    if backend == 'ct2':
+        if not find_module('faster_whisper'):
+            raise Skip("faster-whisper가 설치되지 않음")
+        os.environ.setdefault('HF_HUB_OFFLINE', '1')  # 캐시에 없으면 다운로드 대신 실패
+        return
+    if not find_module('whisper'):
+        raise Skip("openai-whisper가 설치되지 않음")
+    root = model_dir or os.path.join(os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'whisper')
+    if not os.path.isfile(os.path.join(root, f"{model}.pt")):
+        raise Skip(f"로컬 캐시에 {model} 모델이 없음 ({root})")
+
+
+def bench_transcribe(work, repeat, model, backend, model_dir=None, seconds=E2E_AUDIO_SECONDS):
+    """합성 음성을 전체 파이프라인(인식 + 결과 파일 생성)으로 변환 → [모델 로딩 결과, 변환 결과]"""
+    import transcript_pipeline
+    from whisper_worker import get_worker
+    from youtube_to_transcript import PIPELINE as pipeline
+
+    cached_model(model, backend, model_dir)
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        raise Skip("numpy가 설치되지 않음 (합성 음성 생성)")
+
+    audio_file = str(write_wav_file(work / 'benchvideo0' / 'audio.wav', seconds))
+    transcript_pipeline.ASR_BACKEND = backend
+    transcript_pipeline.ASR_MODEL_DIR = model_dir
+    worker = get_worker(model, 'cpu', backend=backend, model_dir=model_dir)
+
+    try:
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            worker.load()
+            load_seconds = time.perf_counter() - start
+    except Exception as e:
+        raise Skip(f"모델 로딩 실패: {e}")
+
+    def run():
+        if pipeline.transcribe_audio(audio_file, worker) is None:
+            raise RuntimeError("변환 실패")
+
+    times = measure(run, repeat)
+    transcribe = dict(summarize(times, seconds), real_time_factor=round(statistics.median(times) / seconds, 4))
+    return [
+        dict(name='model_load', size=model, unit='model', **summarize([load_seconds], 1)),
+        dict(name='transcribe_e2e', size=seconds, unit='audio_seconds', model=model, backend=backend, **transcribe),
+    ]
+
+
+def git_revision():
+    """(커밋 해시, 작업 트리 변경 여부), git이 없으면 (None, None)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def environment_info():
+    """결과 비교용 실행 환경 (인터프리터, 플랫폼, 패키지 버전)"""
+    from importlib import metadata
+
+    packages = {}
+    for name in PACKAGES:
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'packages': packages,
+    }
+
+
+def result_key(entry):
+    return f"{entry['name']}[{entry['size']}]"
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """
+    두 결과 파일의 중앙값 비교 → (행 목록, 성능 저하 행 목록)
+
+    행: (이름[크기], 기준 중앙값, 현재 중앙값, 비율)
+    """
+    base = {result_key(entry): entry for entry in baseline['results'] if 'median' in entry}
+    rows = []
+    regressions = []
+    for entry in current['results']:
+        key = result_key(entry)
+        if 'median' not in entry or key not in base or not base[key]['median']:
+            continue
+        ratio = entry['median'] / base[key]['median']
+        row = (key, base[key]['median'], entry['median'], ratio)
+        rows.append(row)
+        if ratio > 1 + threshold:
+            regressions.append(row)
+    return rows, regressions
+
+
+def print_comparison(rows, regressions, threshold=REGRESSION_THRESHOLD):
+    print(f"\n{'벤치마크':<36} {'기준(초)':>12} {'현재(초)':>12} {'비율':>8}")
+    for key, base, new, ratio in rows:
+        mark = '  ⚠️' if ratio > 1 + threshold else ''
+        print(f"{key:<36} {base:>12.6f} {new:>12.6f} {ratio:>7.2f}x{mark}")
+    if regressions:
+        print(f"\n⚠️ {len(regressions)}개 항목이 기준보다 {threshold:.0%} 이상 느려졌습니다.")
+    else:
+        print(f"\n✅ 기준보다 {threshold:.0%} 이상 느려진 항목이 없습니다.")
+
+
+def run_benchmarks(sizes, repeat, only=None, e2e=True, model=E2E_MODEL, backend='whisper', model_dir=None):
+    """벤치마크 실행 → 결과 항목 목록"""
+    import pipeline_metrics
+
+    # 벤치마크 중에는 단계별 측정값을 기록하지 않음
+    pipeline_metrics.METRICS_FILE = ''
+
+    def selected(name):
+        return not only or any(fnmatch.fnmatch(name, pattern) for pattern in only)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench-') as tmp:
+        for name, prepare in CUE_BENCHMARKS:
+            if not selected(name):
+                continue
+            for size in sizes:
+                work = Path(tmp) / name / str(size)
+                work.mkdir(parents=True)
+                try:
+                    run, setup = prepare(size, work)
+                    stats = summarize(measure(run, repeat, setup), size)
+                    entry = dict(name=name, size=size, unit='cues', **stats)
+                    print(f"⏱️ {name:<24} {size:>7}개  중앙값 {stats['median']:.4f}초  "
+                          f"({stats['per_item_us']:.2f}µs/개)")
+                except ImportError as e:
+                    entry = {'name': name, 'size': size, 'skipped': f"모듈 없음: {e}"}
+                    print(f"⏭️ {name:<24} {size:>7}개  건너뜀: {entry['skipped']}")
+                results.append(entry)
+
+        if e2e and selected('transcribe_e2e'):
+            work = Path(tmp) / 'e2e'
+            try:
+                entries = bench_transcribe(work, max(1, min(repeat, 3)), model, backend, model_dir)
+                for entry in entries:
+                    print(f"⏱️ {entry['name']:<24} {entry['size']!s:>7}   중앙값 {entry['median']:.4f}초")
+                results.extend(entries)
+            except Skip as e:
+                results.append({'name': 'transcribe_e2e', 'size': E2E_AUDIO_SECONDS, 'skipped': str(e)})
+                print(f"⏭️ transcribe_e2e 건너뜀: {e}")
+    return results
+
+
+def parse_args(argv=None):
+    """명령줄 인자 파싱"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 오프라인 벤치마크")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="합성 자막 개수 목록 (쉼표 구분, 기본값: 100,1000,10000,100000)")
+    parser.add_argument('--repeat', type=int, default=5, help="측정 반복 횟수 (준비 실행 1회 별도, 기본값: 5)")
+    parser.add_argument('--only', action='append', metavar='PATTERN',
+                        help="실행할 벤치마크 이름 패턴 (예: 'write_*', 여러 번 지정 가능)")
+    parser.add_argument('--no-e2e', action='store_true', help="모델을 쓰는 전체 변환 벤치마크 생략")
+    parser.add_argument('--model', default=E2E_MODEL, help="전체 변환에 쓸 모델 (기본값: tiny)")
+    parser.add_argument('--backend', choices=['whisper', 'ct2'], default='whisper', help="음성 인식 백엔드")
+    parser.add_argument('--model-dir', metavar='DIR', default=os.getenv('ASR_MODEL_DIR') or None,
+                        help="로컬 모델 폴더 (기본값: ASR_MODEL_DIR 또는 엔진 기본 캐시)")
+    parser.add_argument('--output', metavar='FILE', default=None,
+                        help="결과 JSON 경로 (기본값: benchmarks/results/<커밋>.json)")
+    parser.add_argument('--baseline', metavar='FILE', default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="성능 저하로 볼 중앙값 증가 비율 (기본값: 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    commit, dirty = git_revision()
+
+    print("🏁 파이프라인 벤치마크")
+    print("=" * 50)
+    started = time.time()
+    results = run_benchmarks(sizes, args.repeat, args.only, not args.no_e2e,
+                             args.model, args.backend, args.model_dir)
+
+    report = {
+        'version': RESULT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'dirty': dirty,
+        'elapsed': round(time.time() - started, 3),
+        'settings': {'sizes': sizes, 'repeat': args.repeat},
+        'environment': environment_info(),
+        'results': results,
+    }
+    output = args.output
+    if not output:
+        output = DEFAULT_RESULTS_DIR / f"{(commit or 'local')[:12]}{'-dirty' if dirty else ''}.json"
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📄 결과 저장: {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows, regressions = compare(baseline, report, args.threshold)
+        print_comparison(rows, regressions, args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 합성 데이터
+네트워크 없이 만들 수 있는 중국어 자막(SRT)과 말소리 비슷한 음성(16 kHz 모노 WAV)을 생성합니다.
+같은 시드면 항상 같은 데이터가 나와 커밋끼리 결과를 비교할 수 있습니다.
+"""
+
+import math
+import random
+import wave
+from pathlib import Path
+
+SAMPLE_RATE = 16000
+
+# 번체 · 간체가 섞인 글자 (OpenCC 변환이 실제로 일어나도록)
+CHARS = (
+    "我們你他她這那個時候說話學習語言中國臺灣電視節目聽見看到覺得現在開始"
+    "今天明天昨天朋友老師學生問題知道應該還是因為所以但是如果已經可以沒有"
+    "的了是在不有人大小上下來去會要想做好很多少點頭對錯長短書報紙車東西"
+)
+PUNCTUATION = "，。？！"
+
+
+def cue_text(rng):
+    """자막 한 줄 (4~24자, 가끔 문장부호)"""
+    length = rng.randint(4, 24)
+    chars = [rng.choice(CHARS) for _ in range(length)]
+    if length > 8 and rng.random() < 0.5:
+        chars.insert(rng.randint(3, length - 3), rng.choice(PUNCTUATION[:1]))
+    chars.append(rng.choice(PUNCTUATION[1:]))
+    return ''.join(chars)
+
+
+def synthetic_segments(count, seed=0, words=True):
+    """
+    정규화된 세그먼트 레코드 count개 (write_transcript 입력 형식)
+
+    words=True면 글자마다 단어 타이밍을 붙여 하이라이트 생성 경로도 실제처럼 동작
+    """
+    rng = random.Random(seed)
+    segments = []
+    start = 0.0
+    for i in range(1, count + 1):
+        text = cue_text(rng)
+        duration = 0.25 * len(text) * rng.uniform(0.7, 1.3)
+        end = start + duration
+        segment = {'id': i, 'start': round(start, 3), 'end': round(end, 3), 'text': text, 'words': []}
+        if words:
+            step = duration / len(text)
+            segment['words'] = [
+                {'word': char, 'start': round(start + k * step, 3), 'end': round(start + (k + 1) * step, 3)}
+                for k, char in enumerate(text)
+            ]
+        segments.append(segment)
+        start = end + rng.uniform(0.05, 0.8)
+    return segments
+
+
+def write_srt_file(path, count, seed=0):
+    """합성 자막 count개를 SRT 파일로 저장 (자막 생성기를 거치지 않고 직접 기록)"""
+    from transcript_writers import format_timestamp
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for segment in synthetic_segments(count, seed, words=False):
+            f.write(f"{segment['id']}\n{format_timestamp(segment['start'])} --> "
+                    f"{format_timestamp(segment['end'])}\n{segment['text']}\n\n")
+    return path
+
+
+def speech_like_audio(seconds, seed=0):
+    """
+    말소리 비슷한 신호 (float32 numpy 배열, 16 kHz)
+
+    음절(0.12~0.3초)마다 기본 주파수가 움직이는 배음 + 포먼트 대역 잡음, 구 사이에는 쉼
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = np.zeros(total, dtype=np.float32)
+    pos = int(0.3 * SAMPLE_RATE)
+    while pos < total:
+        # 구(phrase): 음절 3~12개 뒤 0.2~0.8초 쉼
+        for _ in range(int(rng.integers(3, 13))):
+            length = int(rng.uniform(0.12, 0.3) * SAMPLE_RATE)
+            if pos + length >= total:
+                break
+            t = np.arange(length) / SAMPLE_RATE
+            f0 = rng.uniform(110, 240)
+            glide = f0 * (1 + rng.uniform(-0.25, 0.25) * t / t[-1])  # 성조처럼 음높이 이동
+            phase = 2 * math.pi * np.cumsum(glide) / SAMPLE_RATE
+            voiced = sum(np.sin(phase * h) / h for h in range(1, 9))
+            formant = rng.uniform(500, 2500)
+            noise = rng.standard_normal(length) * np.sin(2 * math.pi * formant * t)
+            envelope = np.sin(math.pi * np.arange(length) / length) ** 2
+            audio[pos:pos + length] = (0.25 * voiced + 0.03 * noise) * envelope
+            pos += length + int(rng.uniform(0.01, 0.06) * SAMPLE_RATE)
+        pos += int(rng.uniform(0.2, 0.8) * SAMPLE_RATE)
+    return audio
+
+
+def write_wav_file(path, seconds, seed=0):
+    """합성 음성을 16 kHz 모노 16비트 WAV로 저장 (ASR용 PCM 형식과 같음)"""
+    import numpy as np
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pcm = (np.clip(speech_like_audio(seconds, seed), -1, 1) * 32767).astype('<i2')
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm.tobytes())
+    return path
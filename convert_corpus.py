@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+자막 묶음 일괄 변환기
+폴더 아래의 모든 SRT/VTT를 프로세스 풀에서 srt_to_json · srt_to_word_highlight 형식으로 변환합니다.
+결과 파일이 입력보다 새롭거나 입력 내용 해시가 그대로면 건너뛰고, 결과는 매니페스트에 기록합니다.
+
+사용법:
+    python convert_corpus.py ROOT [--to json|highlight|all] [--workers N] [--force]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from transcript_cache import hash_file
+
+MANIFEST_NAME = '.convert_manifest.json'
+MANIFEST_VERSION = 1
+
+# 변환 종류 → (결과 파일 접미사, 형식 버전)
+# 출력 형식을 바꾸면 버전을 올려 전체를 다시 변환
+CONVERTERS = {
+    'json': ('_simplified.json', 1),
+    # 파이프라인의 audio_word_highlight.json(실제 단어 타이밍)을 덮어쓰지 않도록 다른 접미사 사용
+    'highlight': ('_srt_highlight.json', 3),
+}
+
+SUBTITLE_SUFFIXES = ('.srt', '.vtt')
+
+
+def output_path(subtitle_file, kind):
+    """자막 파일 옆 결과 경로 (예: a.srt → a_srt_highlight.json)"""
+    subtitle_file = Path(subtitle_file)
+    return subtitle_file.with_name(subtitle_file.stem + CONVERTERS[kind][0])
+
+
+def find_subtitles(root):
+    """
+    root 아래 SRT/VTT 파일 목록 (숨김 폴더 제외, 정렬)
+
+    같은 이름의 SRT와 VTT가 함께 있으면 결과 파일 이름이 겹치므로 SRT만 사용
+    """
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        srt_stems = {name[:-4] for name in filenames if name.lower().endswith('.srt')}
+        for name in sorted(filenames):
+            lower = name.lower()
+            if not lower.endswith(SUBTITLE_SUFFIXES):
+                continue
+            if lower.endswith('.vtt') and name[:-4] in srt_stems:
+                continue
+            found.append(Path(dirpath) / name)
+    return found
+
+
+def load_manifest(root):
+    """매니페스트 읽기 (없거나 버전이 다르면 빈 매니페스트)"""
+    try:
+        with open(Path(root) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': MANIFEST_VERSION, 'files': {}}
+
+
+def save_manifest(root, manifest):
+    """매니페스트를 원자적으로 저장"""
+    from transcript_writers import AtomicFile
+
+    with AtomicFile(Path(root) / MANIFEST_NAME) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+def plan_kinds(subtitle_file, entry, kinds, force=False):
+    """
+    다시 변환해야 할 종류 목록과 (필요하면) 계산한 입력 해시
+
+    건너뛰는 경우: 매니페스트의 형식 버전이 같고, 결과 파일이 입력보다 새롭거나 입력 해시가 그대로
+    """
+    if force:
+        return list(kinds), None
+    entry = entry or {}
+    recorded = entry.get('outputs', {})
+    input_mtime = subtitle_file.stat().st_mtime_ns
+
+    pending = []
+    for kind in kinds:
+        out = output_path(subtitle_file, kind)
+        if not out.exists():
+            pending.append(kind)
+        elif kind in recorded and recorded[kind] != CONVERTERS[kind][1]:
+            pending.append(kind)  # 형식 버전이 바뀜
+        elif out.stat().st_mtime_ns < input_mtime:
+            pending.append(kind)  # 입력이 더 새로움 → 해시로 다시 확인
+
+    digest = None
+    if pending and entry.get('hash'):
+        digest = hash_file(subtitle_file)
+        if digest == entry['hash']:
+            # 내용은 그대로 (mtime만 바뀜): 형식 버전이 같고 결과가 있는 종류는 건너뜀
+            pending = [kind for kind in pending
+                       if recorded.get(kind) != CONVERTERS[kind][1] or not output_path(subtitle_file, kind).exists()]
+    return pending, digest
+
+
+def convert_one(subtitle_file, kinds, digest=None):
+    """작업 프로세스: 한 파일을 kinds 형식으로 변환 → (파일, 해시, 결과 {종류: 버전}, 오류)"""
+    from srt_to_json import srt_to_json
+    from srt_to_word_highlight import create_word_highlight_json
+
+    functions = {'json': srt_to_json, 'highlight': create_word_highlight_json}
+    try:
+        digest = digest or hash_file(subtitle_file)
+        done = {}
+        with redirect_stdout(io.StringIO()):  # 파일마다 나오는 완료 메시지 숨김
+            for kind in kinds:
+                functions[kind](subtitle_file, output_path(subtitle_file, kind))
+                done[kind] = CONVERTERS[kind][1]
+        return str(subtitle_file), digest, done, None
+    except Exception as e:
+        return str(subtitle_file), digest, {}, str(e)
+
+
+def convert_corpus(root, kinds=('json', 'highlight'), workers=None, force=False):
+    """root 아래 모든 자막을 병렬로 변환하고 매니페스트 갱신 (변환/건너뜀/실패 개수 반환)"""
+    root = Path(root)
+    started = time.time()
+    manifest = load_manifest(root)
+    files = manifest['files']
+
+    jobs = []
+    skipped = 0
+    for subtitle_file in find_subtitles(root):
+        key = subtitle_file.relative_to(root).as_posix()
+        pending, digest = plan_kinds(subtitle_file, files.get(key), kinds, force)
+        if pending:
+            jobs.append((subtitle_file, pending, digest))
+        else:
+            skipped += 1
+
+    print(f"📂 {root}: 변환 {len(jobs)}개, 건너뜀 {skipped}개")
+    converted = failed = 0
+    if jobs:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            chunksize = max(1, len(jobs) // (workers * 8))
+            results = pool.map(convert_one, *zip(*jobs), chunksize=chunksize)
+            for path, digest, done, error in results:
+                key = Path(path).relative_to(root).as_posix()
+                entry = files.setdefault(key, {})
+                entry['outputs'] = dict(entry.get('outputs', {}), **done)
+                if error:
+                    failed += 1
+                    entry.pop('hash', None)  # 다음 실행에서 다시 시도
+                    print(f"❌ {key}: {error}")
+                else:
+                    converted += 1
+                    entry['hash'] = digest
+
+    # 사라진 입력 파일은 매니페스트에서 제거
+    for key in [key for key in files if not (root / key).exists()]:
+        del files[key]
+    manifest['updated'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+    save_manifest(root, manifest)
+
+    print(f"✅ 완료: 변환 {converted}개, 건너뜀 {skipped}개, 실패 {failed}개 ({time.time() - started:.1f}초)")
+    return converted, skipped, failed
+
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="자막 폴더 일괄 변환 (SRT/VTT → JSON · 글자별 하이라이트 JSON)")
+    parser.add_argument('root', help="자막 파일을 찾을 폴더")
+    parser.add_argument('--to', choices=['json', 'highlight', 'all'], default='all', help="변환할 형식")
+    parser.add_argument('--workers', type=int, default=None, help="작업 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument('--force', action='store_true', help="건너뛰기 없이 모두 다시 변환")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    kinds = tuple(CONVERTERS) if args.to == 'all' else (args.to,)
+    _, _, failed = convert_corpus(args.root, kinds, args.workers, args.force)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
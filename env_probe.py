@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+실행 환경 확인 결과 캐시
+패키지 설치 여부는 import 없이 importlib로만 확인하고(whisper → torch 로딩 없음),
+FFmpeg는 'ffmpeg -version'을 실행하지 않고 PATH에서 찾습니다.
+결과는 작은 상태 파일에 저장하고, 인터프리터나 PATH가 바뀌거나 기록된 파일이 사라졌을 때만 다시 확인합니다.
+"""
+
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+
+STATE_VERSION = 1
+
+# 상태 파일 위치 (기본값: 변환 캐시 폴더)
+STATE_FILE = os.getenv('ENV_STATE_FILE', './output/.cache/env_state.json')
+
+
+def environment_key():
+    """인터프리터와 PATH를 나타내는 키 (바뀌면 상태 파일 무효)"""
+    payload = json.dumps([sys.executable, sys.version, sys.prefix, os.environ.get('PATH', '')])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def find_module(name):
+    """모듈을 import하지 않고 설치 위치만 확인 (없으면 None)"""
+    import importlib.util
+
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    if spec.origin and spec.origin not in ('namespace', 'built-in', 'frozen'):
+        return spec.origin
+    locations = list(spec.submodule_search_locations or [])
+    return locations[0] if locations else spec.origin
+
+
+def find_ffmpeg_binary():
+    """PATH에서 ffmpeg 실행 파일 경로 찾기 (없으면 None)"""
+    import shutil
+
+    return shutil.which('ffmpeg')
+
+
+def _load_state(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION and state.get('key') == environment_key():
+            return state
+    except (OSError, ValueError):
+        pass
+    return {'version': STATE_VERSION, 'key': environment_key(), 'modules': {}, 'ffmpeg': None}
+
+
+def _save_state(path, state):
+    from transcript_writers import AtomicFile
+
+    try:
+        with AtomicFile(path) as f:
+            json.dump(state, f, ensure_ascii=False)
+    except OSError:
+        pass  # 상태 파일은 최적화일 뿐이라 저장 실패는 무시
+
+
+def _still_there(location):
+    return bool(location) and os.path.exists(location)
+
+
+def probe_environment(modules=(), ffmpeg=False, state_file=None):
+    """
+    모듈 설치 위치와 FFmpeg 경로 확인 → {'modules': {모듈: 경로 또는 None}, 'ffmpeg': 경로 또는 None}
+
+    상태 파일에 기록된 경로가 아직 있으면 그대로 쓰고, 없는 것만 다시 확인
+    """
+    path = Path(state_file or STATE_FILE)
+    state = _load_state(path)
+    changed = False
+
+    found = {}
+    for name in modules:
+        location = state['modules'].get(name)
+        if not _still_there(location):
+            location = find_module(name)
+            changed = changed or location != state['modules'].get(name)
+            state['modules'][name] = location
+        found[name] = location
+
+    ffmpeg_path = None
+    if ffmpeg:
+        ffmpeg_path = state.get('ffmpeg')
+        if not _still_there(ffmpeg_path):
+            ffmpeg_path = find_ffmpeg_binary()
+            changed = changed or ffmpeg_path != state.get('ffmpeg')
+            state['ffmpeg'] = ffmpeg_path
+
+    if changed or not path.exists():
+        _save_state(path, state)
+    return {'modules': found, 'ffmpeg': ffmpeg_path}
+
+
+def missing_modules(modules, state_file=None):
+    """설치되지 않은 모듈 이름 목록"""
+    found = probe_environment(modules, state_file=state_file)['modules']
+    return [name for name in modules if not found[name]]
+
+
+def forget(state_file=None):
+    """상태 파일 삭제 (패키지를 설치한 뒤 등)"""
+    try:
+        os.unlink(state_file or STATE_FILE)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FFmpeg 자동 설치 (스트리밍 · 캐시)
+압축 파일(tar.xz / zip)을 디스크에 저장하지 않고 내려받는 동안 바로 풀어서
+ffmpeg · ffprobe 실행 파일만 꺼내고, 내려받은 바이트의 SHA-256을 확인합니다.
+기대 체크섬(FFMPEG_SHA256)이 없으면 설치하지 않습니다 (검증하지 않은 실행 파일을 PATH에 넣지 않음).
+결과는 실행 간 · 컨테이너 간 공유하는 캐시 폴더(<캐시>/<이름>-<체크섬 앞 12자리>/bin)에 두므로
+같은 주소라도 체크섬을 새 릴리스 값으로 바꾸면 새로 설치하고, 이미 있으면 다운로드 없이 그대로 씁니다.
+
+FFMPEG_URL로 내려받을 주소(버전이 고정된 릴리스 주소 권장, 로컬 HTTP 서버 등), FFMPEG_SHA256으로
+그 압축 파일의 기대 체크섬, FFMPEG_CACHE_DIR로 캐시 폴더를 바꿀 수 있습니다.
+"""
+
+import os
+import sys
+import json
+import zlib
+import shutil
+import struct
+import hashlib
+from pathlib import Path
+
+# (운영체제, 아키텍처) → 기본 다운로드 주소 (최신 빌드라 내용이 바뀌므로 FFMPEG_SHA256을 함께 지정해야 설치됨)
+FFMPEG_URLS = {
+    ('windows', 'x86_64'): 'https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip',
+    ('windows', 'amd64'): 'https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip',
+    ('windows', 'x86'): 'https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win32-gpl.zip',
+    ('linux', 'x86_64'): 'https://johnvansickle.com/ffmpeg/releases/ffmpeg-release-amd64-static.tar.xz',
+    ('darwin', 'x86_64'): 'https://evermeet.cx/ffmpeg/getrelease/zip',
+}
+
+# 꺼낼 실행 파일 (ffmpeg는 필수, 나머지는 있으면)
+BINARIES = ('ffmpeg', 'ffprobe')
+
+CHUNK_SIZE = 1 << 16
+
+
+def default_cache_dir():
+    """공유 캐시 폴더 (FFMPEG_CACHE_DIR, 기본값: ~/.cache/youtube-transcript/ffmpeg)"""
+    configured = os.getenv('FFMPEG_CACHE_DIR')
+    if configured:
+        return Path(configured)
+    return Path.home() / '.cache' / 'youtube-transcript' / 'ffmpeg'
+
+
+def default_url():
+    """이 운영체제 · 아키텍처용 다운로드 주소 (FFMPEG_URL 우선, 지원하지 않으면 None)"""
+    import platform
+
+    if os.getenv('FFMPEG_URL'):
+        return os.getenv('FFMPEG_URL')
+    return FFMPEG_URLS.get((platform.system().lower(), platform.machine().lower()))
+
+
+def exe_name(name):
+    return name + '.exe' if sys.platform == 'win32' else name
+
+
+def expected_checksum(expected_sha256=None):
+    """기대 SHA-256 (인자, 없으면 FFMPEG_SHA256, 둘 다 없으면 None)"""
+    return (expected_sha256 or os.getenv('FFMPEG_SHA256') or '').strip().lower() or None
+
+
+def _archive_stem(url):
+    stem = url.rstrip('/').split('/')[-1].split('?')[0]
+    for suffix in ('.tar.xz', '.zip', '.tar.gz', '.tgz'):
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+    return stem or 'ffmpeg'
+
+
+def install_dir(url, sha256, cache_dir=None):
+    """압축 파일별 설치 폴더 (<캐시>/<파일 이름>-<체크섬 앞 12자리>, 내용이 바뀌면 폴더도 바뀜)"""
+    return Path(cache_dir or default_cache_dir()) / f"{_archive_stem(url)}-{sha256[:12]}"
+
+
+def cached_ffmpeg_dir(url=None, cache_dir=None, expected_sha256=None):
+    """
+    이미 설치된 bin 폴더 (없으면 None)
+
+    기대 체크섬이 있으면 그 압축 파일로 설치한 폴더만, 없으면 이 주소로 검증해 설치한 폴더 중 가장 최근 것
+    """
+    url = url or default_url()
+    if not url:
+        return None
+    expected_sha256 = expected_checksum(expected_sha256)
+    if expected_sha256:
+        candidates = [install_dir(url, expected_sha256, cache_dir)]
+    else:
+        root = Path(cache_dir or default_cache_dir())
+        candidates = []
+        for folder in root.glob(f"{_archive_stem(url)}-*"):
+            try:
+                with open(folder / 'manifest.json', 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if manifest.get('url') == url and manifest.get('verified'):
+                candidates.append(folder)
+        candidates.sort(key=lambda folder: folder.stat().st_mtime, reverse=True)
+    for folder in candidates:
+        if (folder / 'bin' / exe_name('ffmpeg')).exists():
+            return folder / 'bin'
+    return None
+
+
+class _Download:
+    """응답 스트림을 읽으며 SHA-256과 크기를 계산하고, 읽은 바이트를 되돌려 놓을 수 있는 래퍼"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self._pushback = b''
+
+    def read(self, size=-1):
+        if self._pushback:
+            if size is None or size < 0:
+                data, self._pushback = self._pushback + self._read_raw(-1), b''
+            else:
+                data, self._pushback = self._pushback[:size], self._pushback[size:]
+            return data
+        return self._read_raw(size)
+
+    def _read_raw(self, size):
+        data = self.raw.read(size)
+        self.sha256.update(data)
+        self.size += len(data)
+        return data
+
+    def unread(self, data):
+        self._pushback = data + self._pushback
+
+    def read_exact(self, size):
+        parts = []
+        while size > 0:
+            data = self.read(size)
+            if not data:
+                raise EOFError("압축 파일이 중간에 끝났습니다.")
+            parts.append(data)
+            size -= len(data)
+        return b''.join(parts)
+
+    def drain(self):
+        """남은 바이트를 끝까지 읽어 체크섬 완성"""
+        self._pushback = b''
+        while self._read_raw(CHUNK_SIZE):
+            pass
+
+
+def iter_tar_members(stream):
+    """tar.xz 스트림에서 (이름, 내용 조각 이터레이터)를 차례로 반환 (일반 파일만)"""
+    import tarfile
+
+    with tarfile.open(fileobj=stream, mode='r|*') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            source = tar.extractfile(member)
+            yield member.name, iter(lambda: source.read(CHUNK_SIZE), b'')
+
+
+def _zip64_sizes(extra, compressed, uncompressed):
+    """zip64 추가 필드에서 실제 크기 읽기"""
+    pos = 0
+    while pos + 4 <= len(extra):
+        field_id, length = struct.unpack_from('<HH', extra, pos)
+        if field_id == 1:
+            values = iter(struct.unpack_from(f'<{length // 8}Q', extra, pos + 4))
+            if uncompressed == 0xFFFFFFFF:
+                uncompressed = next(values)
+            if compressed == 0xFFFFFFFF:
+                compressed = next(values)
+            return compressed, uncompressed, True
+        pos += 4 + length
+    return compressed, uncompressed, False
+
+
+def iter_zip_members(stream):
+    """
+    zip 스트림을 로컬 파일 헤더 순서대로 읽어 (이름, 내용 조각 이터레이터)를 차례로 반환
+
+    중앙 디렉터리(파일 끝)를 기다리지 않으므로 내려받는 동안 풀 수 있음
+    크기를 모르는 항목(데이터 설명자 사용)은 deflate 스트림 끝으로 경계를 찾음
+    """
+    while True:
+        signature = stream.read_exact(4)
+        if signature != b'PK\x03\x04':
+            return  # 중앙 디렉터리 시작 → 모든 항목을 읽음
+        (_, flags, method, _, _, crc, compressed, uncompressed,
+         name_length, extra_length) = struct.unpack('<HHHHHIIIHH', stream.read_exact(26))
+        raw_name = stream.read_exact(name_length)
+        extra = stream.read_exact(extra_length)
+        name = raw_name.decode('utf-8' if flags & 0x800 else 'cp437')
+        compressed, uncompressed, zip64 = _zip64_sizes(extra, compressed, uncompressed)
+
+        if flags & 0x1:
+            raise ValueError(f"암호화된 zip 항목은 지원하지 않습니다: {name}")
+        if method not in (0, 8):
+            raise ValueError(f"지원하지 않는 zip 압축 방식({method}): {name}")
+        if flags & 0x8 and method != 8:
+            raise ValueError(f"크기를 알 수 없는 비압축 zip 항목: {name}")
+
+        chunks = _zip_member_chunks(stream, name, flags, method, crc, compressed, zip64)
+        if not name.endswith('/'):
+            yield name, chunks
+        for _ in chunks:  # 읽지 않은 항목은 건너뜀
+            pass
+
+
+def _zip_member_chunks(stream, name, flags, method, crc, compressed, zip64):
+    decompressor = zlib.decompressobj(-15) if method == 8 else None
+    checksum = 0
+
+    if flags & 0x8:
+        # 데이터 설명자: deflate 스트림이 끝날 때까지 읽고 남은 바이트는 되돌림
+        while not decompressor.eof:
+            data = stream.read(CHUNK_SIZE)
+            if not data:
+                raise EOFError(f"zip 항목이 중간에 끝났습니다: {name}")
+            out = decompressor.decompress(data)
+            checksum = zlib.crc32(out, checksum)
+            yield out
+        stream.unread(decompressor.unused_data)
+        descriptor = stream.read_exact(4)
+        if descriptor == b'PK\x07\x08':
+            descriptor = stream.read_exact(4)
+        crc = struct.unpack('<I', descriptor)[0]
+        stream.read_exact(16 if zip64 else 8)
+    else:
+        remaining = compressed
+        while remaining > 0:
+            data = stream.read(min(CHUNK_SIZE, remaining))
+            if not data:
+                raise EOFError(f"zip 항목이 중간에 끝났습니다: {name}")
+            remaining -= len(data)
+            out = decompressor.decompress(data) if decompressor else data
+            checksum = zlib.crc32(out, checksum)
+            yield out
+        if decompressor:
+            out = decompressor.flush()
+            checksum = zlib.crc32(out, checksum)
+            yield out
+
+    if checksum != crc:
+        raise ValueError(f"zip 항목 CRC 불일치: {name}")
+
+
+def _extract(stream, target_dir, names):
+    """스트림에서 names에 해당하는 실행 파일만 target_dir에 저장 → {이름: 경로}"""
+    head = stream.read_exact(6)
+    stream.unread(head)
+    members = iter_zip_members(stream) if head.startswith(b'PK') else iter_tar_members(stream)
+
+    extracted = {}
+    for member_name, chunks in members:
+        base = member_name.rstrip('/').split('/')[-1]
+        if base not in names or base in extracted:
+            continue
+        path = target_dir / base
+        with open(path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.chmod(path, 0o755)
+        extracted[base] = path
+        if len(extracted) == len(names):
+            break
+    return extracted
+
+
+def install_ffmpeg(url=None, cache_dir=None, expected_sha256=None, timeout=60):
+    """
+    FFmpeg를 캐시 폴더에 설치하고 bin 폴더 경로 반환 (이미 있으면 바로 반환)
+
+    expected_sha256: 압축 파일의 기대 SHA-256 (없으면 FFMPEG_SHA256, 둘 다 없으면 설치하지 않음)
+    실패하면 예외 발생 (체크섬이 없으면 RuntimeError, 불일치는 ValueError)
+    """
+    from urllib.request import urlopen
+
+    url = url or default_url()
+    if not url:
+        raise RuntimeError("이 운영체제/아키텍처용 FFmpeg 다운로드 주소가 없습니다. FFMPEG_URL을 지정해주세요.")
+    expected_sha256 = expected_checksum(expected_sha256)
+    if not expected_sha256:
+        raise RuntimeError(f"FFmpeg 압축 파일의 기대 체크섬이 없어 설치하지 않습니다. "
+                           f"FFMPEG_SHA256에 {url} 의 SHA-256을 지정해주세요.")
+    cached = cached_ffmpeg_dir(url, cache_dir, expected_sha256)
+    if cached:
+        return cached
+
+    target = install_dir(url, expected_sha256, cache_dir)
+    staging = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    names = {exe_name(name) for name in BINARIES}
+    shutil.rmtree(staging, ignore_errors=True)
+    (staging / 'bin').mkdir(parents=True)
+
+    print(f"📥 FFmpeg 다운로드 중 (받는 동안 압축 해제): {url}")
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            stream = _Download(response)
+            extracted = _extract(stream, staging / 'bin', names)
+            stream.drain()
+
+        digest = stream.sha256.hexdigest()
+        if digest != expected_sha256:
+            raise ValueError(f"FFmpeg 체크섬 불일치: 기대 {expected_sha256}, 실제 {digest}")
+        if exe_name('ffmpeg') not in extracted:
+            raise ValueError("압축 파일에서 ffmpeg 실행 파일을 찾을 수 없습니다.")
+
+        with open(staging / 'manifest.json', 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'sha256': digest, 'verified': True, 'size': stream.size,
+                       'files': sorted(extracted)}, f, ensure_ascii=False, indent=1)
+
+        # 완성된 폴더를 한 번에 이름 변경 (다른 프로세스가 먼저 설치했으면 그쪽 사용)
+        try:
+            os.replace(staging, target)
+        except OSError:
+            if not cached_ffmpeg_dir(url, cache_dir):
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    print(f"✅ FFmpeg 설치 완료: {target / 'bin'} ({stream.size / 1e6:.1f} MB)")
+    return target / 'bin'
+
+
+def add_to_path(bin_dir):
+    """bin 폴더를 PATH 앞에 추가 (이미 있으면 그대로)"""
+    bin_dir = str(bin_dir)
+    if bin_dir not in os.environ.get('PATH', '').split(os.pathsep):
+        os.environ['PATH'] = bin_dir + os.pathsep + os.environ.get('PATH', '')
+    return bin_dir
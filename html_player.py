@@ -0,0 +1,719 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+자막 하이라이트 HTML 플레이어
+영상마다 작은 HTML 페이지와 자막 데이터 파일(*.cues.js)만 만들고, 스타일 · 스크립트는
+번들 폴더(파이프라인은 출력 폴더, 따로 지정하지 않으면 페이지 옆)의 player/ 아래
+공용 번들(내용 해시로 버전을 붙인 파일명이라 브라우저가 계속 캐시)로 공유합니다.
+출력 폴더의 index.html(라이브러리)은 영상을 열 때만 그 영상의 자막 데이터를 불러옵니다.
+
+자막 데이터는 [시작, 끝, "텍스트"] 한 줄씩 스트리밍으로 쓰므로 다른 파일 형식과 같은 순회에서 만들 수 있고,
+브라우저에서는 시간을 Float64Array로 한 번 옮긴 뒤 이진 탐색(마지막 위치 캐시)으로 현재 자막을 찾고,
+보이는 범위의 자막만 그리는 가상 목록으로 표시합니다.
+데이터 파일은 <script>로 불러오는 JS라서 file:// 로 열어도 동작합니다.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from html import escape
+from pathlib import Path
+
+# 공용 번들 폴더 (번들 폴더 기준)와 라이브러리 파일 · 여러 프로세스용 잠금 파일
+ASSETS_DIRNAME = 'player'
+LIBRARY_FILE = 'library.json'
+LIBRARY_LOCK = '.library.lock'
+INDEX_FILE = 'index.html'
+CUES_SUFFIX = '.cues.js'
+
+PLAYER_CSS = '''body {
+    font-family: 'Arial', sans-serif;
+    max-width: 800px;
+    margin: 0 auto;
+    padding: 20px;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    min-height: 100vh;
+}
+.container {
+    background: white;
+    border-radius: 15px;
+    padding: 30px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+}
+h1 {
+    text-align: center;
+    color: #333;
+    margin-bottom: 30px;
+}
+.audio-player {
+    width: 100%;
+    margin-bottom: 30px;
+}
+.audio-player audio {
+    width: 100%;
+}
+.audio-info {
+    background: #f8f9fa;
+    padding: 15px;
+    border-radius: 8px;
+    margin-bottom: 20px;
+    border-left: 4px solid #2196f3;
+}
+.subtitle-container {
+    height: 400px;
+    overflow-y: auto;
+    border: 2px solid #e0e0e0;
+    border-radius: 10px;
+    padding: 0 20px;
+    background: #f8f9fa;
+}
+.subtitle-spacer {
+    position: relative;
+}
+.subtitle-item {
+    position: absolute;
+    left: 0;
+    right: 0;
+    height: 86px;
+    box-sizing: border-box;
+    padding: 10px;
+    border-radius: 8px;
+    cursor: pointer;
+    transition: background 0.3s ease, transform 0.3s ease;
+    border-left: 4px solid transparent;
+    overflow: hidden;
+}
+.subtitle-item:hover {
+    background: #e3f2fd;
+    border-left-color: #2196f3;
+}
+.subtitle-item.active {
+    background: #2196f3;
+    color: white;
+    border-left-color: #1976d2;
+    transform: scale(1.02);
+}
+.timestamp {
+    font-size: 0.8em;
+    color: #666;
+    margin-bottom: 5px;
+}
+.subtitle-text {
+    font-size: 1.05em;
+    line-height: 1.35;
+    white-space: pre-line;
+    display: -webkit-box;
+    -webkit-line-clamp: 2;
+    -webkit-box-orient: vertical;
+    overflow: hidden;
+}
+.controls {
+    text-align: center;
+    margin: 20px 0;
+}
+.btn {
+    background: #2196f3;
+    color: white;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 5px;
+    cursor: pointer;
+    margin: 0 5px;
+    font-size: 14px;
+}
+.btn:hover {
+    background: #1976d2;
+}
+.progress-bar {
+    width: 100%;
+    height: 6px;
+    background: #e0e0e0;
+    border-radius: 3px;
+    margin: 10px 0;
+    overflow: hidden;
+}
+.progress-fill {
+    height: 100%;
+    background: #2196f3;
+    width: 0%;
+    transition: width 0.1s ease;
+}
+.warning {
+    background: #fff3cd;
+    border: 1px solid #ffeaa7;
+    color: #856404;
+    padding: 10px;
+    border-radius: 5px;
+    margin-bottom: 15px;
+}
+.library-list {
+    list-style: none;
+    padding: 0;
+    margin: 0 0 20px 0;
+    max-height: 300px;
+    overflow-y: auto;
+}
+.library-item {
+    display: flex;
+    justify-content: space-between;
+    padding: 10px;
+    margin: 5px 0;
+    border-radius: 8px;
+    cursor: pointer;
+    background: #f8f9fa;
+    border-left: 4px solid transparent;
+}
+.library-item:hover, .library-item.active {
+    background: #e3f2fd;
+    border-left-color: #2196f3;
+}
+.library-meta {
+    font-size: 0.8em;
+    color: #666;
+}
+'''
+
+PLAYER_JS = r'''(function () {
+    'use strict';
+
+    // 가상 목록: 고정 높이 행, 보이는 범위 + 여유분만 그림
+    const ROW_HEIGHT = 96;
+    const OVERSCAN = 6;
+
+    const TEMPLATE =
+        '<h1>🎬 자막 하이라이트 플레이어</h1>' +
+        '<div class="warning">' +
+        '<strong>⚠️ 음성 재생 문제 해결:</strong><br>' +
+        '1. 브라우저에서 F12를 눌러 개발자 도구를 열어주세요<br>' +
+        '2. Console 탭에서 오류 메시지를 확인해주세요<br>' +
+        '3. 음성이 재생되지 않으면 아래 "음성 파일 다운로드" 버튼을 사용해주세요' +
+        '</div>' +
+        '<div class="audio-info">' +
+        '<strong>📁 음성 파일:</strong> <span data-role="audio-name"></span><br>' +
+        '<button class="btn" data-action="download">🎵 음성 파일 다운로드</button>' +
+        '</div>' +
+        '<div class="audio-player"><audio controls preload="metadata">' +
+        '<source data-role="source">브라우저가 오디오를 지원하지 않습니다.</audio></div>' +
+        '<div class="controls">' +
+        '<button class="btn" data-action="play">▶️ 재생/일시정지</button>' +
+        '<button class="btn" data-action="restart">⏮️ 처음부터</button>' +
+        '<button class="btn" data-action="scroll">📜 자동 스크롤</button>' +
+        '<button class="btn" data-action="open">📂 음성 파일 열기</button>' +
+        '</div>' +
+        '<div class="progress-bar"><div class="progress-fill" data-role="progress"></div></div>' +
+        '<div class="subtitle-container" data-role="container"><div class="subtitle-spacer" data-role="spacer"></div></div>';
+
+    function formatTime(seconds) {
+        const ms = Math.round(seconds * 1000);
+        const h = Math.floor(ms / 3600000);
+        const m = Math.floor(ms / 60000) % 60;
+        const s = Math.floor(ms / 1000) % 60;
+        const pad = (n, w) => String(n).padStart(w, '0');
+        return pad(h, 2) + ':' + pad(m, 2) + ':' + pad(s, 2) + ',' + pad(ms % 1000, 3);
+    }
+
+    // 플레이어를 root 안에 만들고 { destroy } 반환
+    // data: { audio, type, cues: [[시작, 끝, 텍스트], ...] }, baseUrl: 데이터 파일 폴더 (음성 경로 기준)
+    function mount(root, data, baseUrl) {
+        // 모든 이벤트를 한 신호에 묶어 destroy()에서 한 번에 해제 (라이브러리에서 영상을 바꿔도 쌓이지 않음)
+        const listeners = new AbortController();
+        const signal = listeners.signal;
+
+        root.innerHTML = TEMPLATE;
+        const $ = (role) => root.querySelector('[data-role="' + role + '"]');
+        const audio = root.querySelector('audio');
+        const progressFill = $('progress');
+        const subtitleContainer = $('container');
+        const subtitleSpacer = $('spacer');
+        const audioUrl = (baseUrl || '') + data.audio;
+        let autoScroll = true;
+
+        $('audio-name').textContent = data.audio;
+        $('source').src = audioUrl;
+        $('source').type = data.type;
+        audio.load();
+
+        // 자막 시간은 타입 배열로 한 번만 옮겨 둠
+        const cues = data.cues;
+        const cueCount = cues.length;
+        const cueStarts = new Float64Array(cueCount);
+        const cueEnds = new Float64Array(cueCount);
+        const cueTexts = new Array(cueCount);
+        for (let i = 0; i < cueCount; i++) {
+            cueStarts[i] = cues[i][0];
+            cueEnds[i] = cues[i][1];
+            cueTexts[i] = cues[i][2];
+        }
+
+        const renderedRows = new Map();  // 자막 번호 → 행 요소
+        let activeIndex = -1;
+        let lastIndex = 0;
+        let renderQueued = false;
+        subtitleSpacer.style.height = (cueCount * ROW_HEIGHT + 10) + 'px';
+
+        function createRow(index) {
+            const item = document.createElement('div');
+            item.className = 'subtitle-item' + (index === activeIndex ? ' active' : '');
+            item.style.top = (index * ROW_HEIGHT + 5) + 'px';
+            item.dataset.index = index;
+            item.title = cueTexts[index];
+
+            const timestamp = document.createElement('div');
+            timestamp.className = 'timestamp';
+            timestamp.textContent = formatTime(cueStarts[index]) + ' → ' + formatTime(cueEnds[index]);
+            const text = document.createElement('div');
+            text.className = 'subtitle-text';
+            text.textContent = cueTexts[index];
+
+            item.appendChild(timestamp);
+            item.appendChild(text);
+            return item;
+        }
+
+        function renderRows() {
+            renderQueued = false;
+            const top = subtitleContainer.scrollTop;
+            const first = Math.max(0, Math.floor(top / ROW_HEIGHT) - OVERSCAN);
+            const last = Math.min(cueCount - 1,
+                Math.ceil((top + subtitleContainer.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+
+            for (const [index, item] of renderedRows) {
+                if (index < first || index > last) {
+                    item.remove();
+                    renderedRows.delete(index);
+                }
+            }
+            for (let i = first; i <= last; i++) {
+                if (!renderedRows.has(i)) {
+                    const item = createRow(i);
+                    renderedRows.set(i, item);
+                    subtitleSpacer.appendChild(item);
+                }
+            }
+        }
+
+        function queueRender() {
+            if (!renderQueued && !signal.aborted) {
+                renderQueued = true;
+                requestAnimationFrame(renderRows);
+            }
+        }
+
+        // 현재 시간의 자막 번호 (없으면 -1): 마지막 위치 근처를 먼저 보고, 아니면 이진 탐색
+        function findCue(time) {
+            if (cueCount === 0) {
+                return -1;
+            }
+            let index = -1;
+            if (cueStarts[lastIndex] <= time && (lastIndex + 1 === cueCount || time < cueStarts[lastIndex + 1])) {
+                index = lastIndex;
+            } else if (lastIndex + 1 < cueCount && cueStarts[lastIndex + 1] <= time &&
+                       (lastIndex + 2 >= cueCount || time < cueStarts[lastIndex + 2])) {
+                index = lastIndex + 1;
+            } else {
+                let lo = 0;
+                let hi = cueCount - 1;
+                while (lo <= hi) {
+                    const mid = (lo + hi) >> 1;
+                    if (cueStarts[mid] <= time) {
+                        index = mid;
+                        lo = mid + 1;
+                    } else {
+                        hi = mid - 1;
+                    }
+                }
+            }
+            if (index < 0) {
+                return -1;
+            }
+            lastIndex = index;
+            return time <= cueEnds[index] ? index : -1;
+        }
+
+        // 자막 하이라이트 업데이트 (현재 자막이 바뀔 때만 DOM 변경)
+        function updateSubtitles() {
+            const currentTime = audio.currentTime;
+            const index = findCue(currentTime);
+
+            if (index !== activeIndex) {
+                const previous = renderedRows.get(activeIndex);
+                if (previous) {
+                    previous.classList.remove('active');
+                }
+                activeIndex = index;
+                const current = renderedRows.get(index);
+                if (current) {
+                    current.classList.add('active');
+                }
+                if (autoScroll && index >= 0) {
+                    subtitleContainer.scrollTo({
+                        top: index * ROW_HEIGHT - (subtitleContainer.clientHeight - ROW_HEIGHT) / 2,
+                        behavior: 'smooth'
+                    });
+                }
+            }
+
+            // 진행률 업데이트
+            if (audio.duration) {
+                const progress = (currentTime / audio.duration) * 100;
+                progressFill.style.width = progress + '%';
+            }
+        }
+
+        function play() {
+            audio.play().catch(e => {
+                console.error('재생 실패:', e);
+                alert('음성 재생에 실패했습니다. 브라우저 설정을 확인해주세요.');
+            });
+        }
+
+        const actions = {
+            // 재생/일시정지
+            play: () => (audio.paused ? play() : audio.pause()),
+            // 처음부터 재생
+            restart: () => {
+                audio.currentTime = 0;
+                play();
+            },
+            // 자동 스크롤 토글
+            scroll: (btn) => {
+                autoScroll = !autoScroll;
+                btn.textContent = autoScroll ? '📜 자동 스크롤' : '📜 수동 스크롤';
+            },
+            // 음성 파일 다운로드
+            download: () => {
+                const link = document.createElement('a');
+                link.href = audioUrl;
+                link.download = data.audio;
+                document.body.appendChild(link);
+                link.click();
+                document.body.removeChild(link);
+            },
+            // 음성 파일 열기
+            open: () => {
+                const input = document.createElement('input');
+                input.type = 'file';
+                input.accept = 'audio/*';
+                input.onchange = function (e) {
+                    const file = e.target.files[0];
+                    if (file) {
+                        audio.src = URL.createObjectURL(file);
+                        audio.load();
+                    }
+                };
+                input.click();
+            }
+        };
+
+        // 버튼과 자막 클릭은 root 한 곳에서 처리
+        root.addEventListener('click', (e) => {
+            const button = e.target.closest('[data-action]');
+            if (button && actions[button.dataset.action]) {
+                actions[button.dataset.action](button);
+                return;
+            }
+            const item = e.target.closest('.subtitle-item');
+            if (item) {
+                audio.currentTime = cueStarts[Number(item.dataset.index)];
+                play();
+            }
+        }, { signal });
+
+        audio.addEventListener('error', (e) => {
+            console.error('오디오 로드 오류:', e);
+        }, { signal });
+        audio.addEventListener('timeupdate', updateSubtitles, { signal });
+        audio.addEventListener('seeked', updateSubtitles, { signal });
+        subtitleContainer.addEventListener('scroll', queueRender, { passive: true, signal });
+        window.addEventListener('resize', queueRender, { signal });
+
+        // 초기화
+        renderRows();
+        updateSubtitles();
+
+        return {
+            destroy() {
+                listeners.abort();
+                audio.pause();
+                root.innerHTML = '';
+            }
+        };
+    }
+
+    // 자막 데이터 파일(*.cues.js)을 <script>로 불러오기 (file:// 에서도 동작)
+    const loaded = new Map();
+
+    function load(src, callback) {
+        if (loaded.has(src)) {
+            callback(loaded.get(src));
+            return;
+        }
+        const script = document.createElement('script');
+        script.src = src;
+        script.onCues = (data) => {
+            loaded.set(src, data);
+            callback(data);
+        };
+        script.onerror = () => alert('자막 데이터를 불러올 수 없습니다: ' + src);
+        document.head.appendChild(script);
+    }
+
+    // 데이터 파일이 호출: 불러온 <script>가 있으면 그쪽에 넘기고, 아니면 current에 보관
+    function register(data, info) {
+        data.info = info || {};
+        const script = document.currentScript;
+        if (script && script.onCues) {
+            script.onCues(data);
+        } else {
+            SubtitlePlayer.current = data;
+        }
+    }
+
+    // 라이브러리 페이지: 목록만 먼저 그리고, 영상을 열 때 그 영상의 자막만 불러옴
+    // entries: [{ id, html, cues, count, duration, updated }]
+    function library(listElement, playerElement, entries) {
+        let player = null;
+        let activeItem = null;
+
+        entries.forEach((entry) => {
+            const item = document.createElement('li');
+            item.className = 'library-item';
+            const title = document.createElement('span');
+            title.textContent = entry.id;
+            const meta = document.createElement('span');
+            meta.className = 'library-meta';
+            meta.textContent = entry.count + '개 자막 · ' + formatTime(entry.duration).slice(0, 8) + ' · ' + entry.updated;
+            item.appendChild(title);
+            item.appendChild(meta);
+            item.addEventListener('click', () => {
+                const base = entry.cues.slice(0, entry.cues.lastIndexOf('/') + 1);
+                load(entry.cues, (data) => {
+                    if (player) {
+                        player.destroy();
+                    }
+                    if (activeItem) {
+                        activeItem.classList.remove('active');
+                    }
+                    activeItem = item;
+                    item.classList.add('active');
+                    player = mount(playerElement, data, base);
+                });
+            });
+            listElement.appendChild(item);
+        });
+    }
+
+    const SubtitlePlayer = { mount, load, register, library, current: null };
+    window.SubtitlePlayer = SubtitlePlayer;
+})();
+'''
+
+# 번들 버전 = 내용 해시 (내용이 바뀌면 파일명이 바뀌므로 브라우저 캐시를 오래 둘 수 있음)
+PLAYER_VERSION = hashlib.sha256((PLAYER_CSS + PLAYER_JS).encode('utf-8')).hexdigest()[:10]
+PLAYER_CSS_NAME = f'player-{PLAYER_VERSION}.css'
+PLAYER_JS_NAME = f'player-{PLAYER_VERSION}.js'
+
+PLAYER_PAGE = '''<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>자막 하이라이트 플레이어 - __TITLE__</title>
+    <link rel="stylesheet" href="__CSS__">
+</head>
+<body>
+    <div class="container" id="player"></div>
+    <script src="__JS__"></script>
+    <script src="__CUES__"></script>
+    <script>
+        SubtitlePlayer.mount(document.getElementById('player'), SubtitlePlayer.current, '');
+    </script>
+</body>
+</html>
+'''
+
+INDEX_PAGE = '''<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>자막 라이브러리</title>
+    <link rel="stylesheet" href="__CSS__">
+</head>
+<body>
+    <div class="container">
+        <h1>📚 자막 라이브러리 (__COUNT__개 영상)</h1>
+        <ul class="library-list" id="library"></ul>
+        <div id="player"></div>
+    </div>
+    <script src="__JS__"></script>
+    <script>
+        SubtitlePlayer.library(document.getElementById('library'), document.getElementById('player'), __ENTRIES__);
+    </script>
+</body>
+</html>
+'''
+
+# 자막 데이터 파일 (앞부분 · 자막 한 줄 · 뒷부분)
+CUES_HEAD = 'SubtitlePlayer.register({"audio": __AUDIO__, "type": __AUDIO_TYPE__, "cues": ['
+CUES_ROW = '\n[__START__, __END__, __TEXT__],'
+CUES_TAIL = '\n]}, {"count": __COUNT__, "duration": __DURATION__});\n'
+
+_CUES_INFO = re.compile(r'\{"count": (\d+), "duration": ([0-9.]+)\}\);\s*$')
+
+# 공용 번들과 라이브러리는 여러 작성 스레드가 함께 갱신하므로 잠금 (프로세스 사이는 LIBRARY_LOCK 파일 잠금)
+_library_lock = threading.Lock()
+
+
+def js_string(text):
+    """<script> 안에 안전하게 넣을 JS 문자열 리터럴"""
+    return json.dumps(text, ensure_ascii=False).replace('</', '<\\/')
+
+
+def cues_path_for(html_file):
+    """플레이어 페이지의 자막 데이터 파일 경로 (audio_highlight.html → audio_highlight.cues.js)"""
+    return Path(html_file).with_suffix(CUES_SUFFIX)
+
+
+def render_head(audio_file):
+    """자막 데이터 파일 앞부분 (음성 파일 정보)"""
+    from audio_io import audio_mime_type
+
+    return (CUES_HEAD
+            .replace('__AUDIO_TYPE__', js_string(audio_mime_type(audio_file)))
+            .replace('__AUDIO__', js_string(os.path.basename(audio_file))))
+
+
+def render_cue(segment):
+    """자막 데이터 한 줄 ([시작, 끝, "텍스트"])"""
+    return (CUES_ROW
+            .replace('__START__', repr(round(float(segment['start']), 3)))
+            .replace('__END__', repr(round(float(segment['end']), 3)))
+            .replace('__TEXT__', js_string(segment['text'])))
+
+
+def render_tail(count, duration):
+    """자막 데이터 파일 뒷부분 (라이브러리 목록용 자막 수 · 길이)"""
+    return (CUES_TAIL
+            .replace('__COUNT__', str(int(count)))
+            .replace('__DURATION__', repr(round(float(duration), 3))))
+
+
+def _relative_url(path, start):
+    return Path(os.path.relpath(path, start)).as_posix()
+
+
+def ensure_assets(assets_root):
+    """공용 번들(player-<버전>.css/js)이 없으면 생성하고 (css, js) 경로 반환"""
+    from transcript_writers import AtomicFile
+
+    assets_dir = Path(assets_root) / ASSETS_DIRNAME
+    css_file = assets_dir / PLAYER_CSS_NAME
+    js_file = assets_dir / PLAYER_JS_NAME
+    with _library_lock:
+        for path, content in ((css_file, PLAYER_CSS), (js_file, PLAYER_JS)):
+            if not path.exists():
+                with AtomicFile(path) as f:
+                    f.write(content)
+    return css_file, js_file
+
+
+def write_player_page(html_file, cues_file, assets_root=None):
+    """
+    영상별 플레이어 페이지 (공용 번들 + 자막 데이터 파일을 불러오는 작은 HTML)
+
+    assets_root: 공용 번들(player/)을 둘 폴더, 없으면 페이지와 같은 폴더
+    """
+    from transcript_writers import AtomicFile
+
+    html_file = Path(html_file)
+    css_file, js_file = ensure_assets(assets_root if assets_root is not None else html_file.parent)
+    page_dir = html_file.resolve().parent
+    page = (PLAYER_PAGE
+            .replace('__TITLE__', escape(page_dir.name))
+            .replace('__CSS__', escape(_relative_url(css_file.resolve(), page_dir)))
+            .replace('__JS__', escape(_relative_url(js_file.resolve(), page_dir)))
+            .replace('__CUES__', escape(_relative_url(Path(cues_file).resolve(), page_dir))))
+    with AtomicFile(html_file) as f:
+        f.write(page)
+    return html_file
+
+
+def read_cues_info(cues_file):
+    """자막 데이터 파일 끝에서 (자막 수, 길이) 읽기 (파일 전체를 읽지 않음)"""
+    with open(cues_file, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 256))
+        match = _CUES_INFO.search(f.read().decode('utf-8', 'ignore'))
+    if not match:
+        return 0, 0.0
+    return int(match.group(1)), float(match.group(2))
+
+
+def library_entry(root, html_file):
+    """라이브러리 목록 항목 하나"""
+    root = Path(root).resolve()
+    html_file = Path(html_file).resolve()
+    cues_file = cues_path_for(html_file)
+    count, duration = read_cues_info(cues_file)
+    return {
+        'id': html_file.parent.name,
+        'html': _relative_url(html_file, root),
+        'cues': _relative_url(cues_file, root),
+        'count': count,
+        'duration': duration,
+        'updated': time.strftime('%Y-%m-%d %H:%M', time.localtime(cues_file.stat().st_mtime)),
+    }
+
+
+def scan_library(root):
+    """출력 폴더를 훑어 모든 플레이어 페이지의 항목 목록 생성"""
+    root = Path(root)
+    entries = {}
+    for video_dir in sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith('.')):
+        for cues_file in sorted(video_dir.glob('*' + CUES_SUFFIX)):
+            html_file = cues_file.with_name(cues_file.name[:-len(CUES_SUFFIX)] + '.html')
+            if html_file.exists():
+                entry = library_entry(root, html_file)
+                entries[entry['html']] = entry
+    return entries
+
+
+def update_library(root, html_file=None):
+    """
+    라이브러리(index.html)를 갱신
+
+    html_file이 있으면 그 항목만 추가/교체하고, 라이브러리 파일이 없으면 출력 폴더 전체를 훑어 새로 만듦
+    여러 프로세스(변환 스크립트 · 서버)가 같은 출력 폴더를 갱신해도 파일 잠금으로 항목을 잃지 않음
+    """
+    from transcript_cache import file_lock
+    from transcript_writers import AtomicFile
+
+    root = Path(root)
+    css_file, js_file = ensure_assets(root)
+    library_file = root / ASSETS_DIRNAME / LIBRARY_FILE
+    with _library_lock, file_lock(root / ASSETS_DIRNAME / LIBRARY_LOCK):
+        try:
+            with open(library_file, 'r', encoding='utf-8') as f:
+                entries = {entry['html']: entry for entry in json.load(f)}
+        except (OSError, ValueError):
+            entries = scan_library(root)
+        if html_file is not None and Path(html_file).exists():
+            entry = library_entry(root, html_file)
+            entries[entry['html']] = entry
+        # 지워진 영상은 목록에서 제외
+        entries = [entry for key, entry in sorted(entries.items()) if (root / key).exists()]
+
+        with AtomicFile(library_file) as f:
+            json.dump(entries, f, ensure_ascii=False)
+        page = (INDEX_PAGE
+                .replace('__CSS__', escape(_relative_url(css_file, root)))
+                .replace('__JS__', escape(_relative_url(js_file, root)))
+                .replace('__COUNT__', str(len(entries)))
+                .replace('__ENTRIES__', js_string(entries)))
+        with AtomicFile(root / INDEX_FILE) as f:
+            f.write(page)
+    return root / INDEX_FILE
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+영상별 출력 폴더 구성
+output/<영상 ID>/audio.<확장자> 형태로 저장하며, 각 다운로드는 자기 임시 폴더에서 받은 뒤
+원자적 이동(os.replace)으로 자리를 잡아 여러 다운로드가 같은 출력 루트를 안전하게 공유합니다.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+AUDIO_BASENAME = "audio"
+
+
+def safe_video_id(video_id):
+    """폴더 이름으로 쓸 수 있는 영상 ID"""
+    return re.sub(r'[^A-Za-z0-9_-]', '_', str(video_id)) or 'unknown'
+
+
+def video_dir(output_root, video_id):
+    """영상 ID별 출력 폴더 경로"""
+    return Path(output_root) / safe_video_id(video_id)
+
+
+def video_id_of(audio_file):
+    """음성 파일 경로에서 영상 ID (output/<영상 ID>/audio.wav → <영상 ID>)"""
+    return Path(audio_file).parent.name
+
+
+def make_download_dir(output_root):
+    """다운로드 전용 임시 폴더 (출력 루트와 같은 파일 시스템)"""
+    Path(output_root).mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(prefix='.download-', dir=str(output_root)))
+
+
+def place_audio(downloaded_file, output_root, video_id):
+    """다운로드한 파일을 output/<영상 ID>/audio.<확장자>로 원자적 이동"""
+    target_dir = video_dir(output_root, video_id)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    target = target_dir / f"{AUDIO_BASENAME}{Path(downloaded_file).suffix}"
+    os.replace(downloaded_file, target)
+    return target
+
+
+def remove_download_dir(download_dir):
+    """임시 다운로드 폴더 정리"""
+    shutil.rmtree(download_dir, ignore_errors=True)
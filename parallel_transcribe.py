@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+무음 구간 분할 병렬 음성 인식 (CPU 전용 환경용)
+에너지 기반 VAD로 무음 지점을 찾아 길이가 제한된 조각으로 자르고,
+프로세스 풀에서 조각별로 변환한 뒤 전체 타임스탬프와 세그먼트 번호로 다시 이어 붙입니다.
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from audio_io import SAMPLE_RATE
+
+# VAD 프레임 길이와 조각 길이 제한 (초)
+FRAME_SECONDS = 0.03
+SMOOTH_SECONDS = 0.3
+MIN_CHUNK_SECONDS = 30
+MAX_CHUNK_SECONDS = 120
+
+# 프로세스별 상주 모델 (asr_backends 백엔드)
+_model = None
+
+# (모델 크기, 디바이스, 작업자 수, 백엔드, 모델 폴더) → 프로세스 풀, 여러 영상에서 재사용
+_pools = {}
+
+
+# 에너지 계산 시 한 번에 읽는 프레임 수 (메모리 맵 음성을 조금씩 읽기 위함)
+ENERGY_BLOCK_FRAMES = 2000
+
+
+def frame_energy_db(audio, sample_rate=SAMPLE_RATE, frame_seconds=FRAME_SECONDS):
+    """프레임별 RMS 에너지 (dBFS), 음성은 블록 단위로 읽음"""
+    import numpy as np
+
+    frame = max(1, int(sample_rate * frame_seconds))
+    count = len(audio) // frame
+    energy = np.zeros(count, dtype=np.float32)
+    for first in range(0, count, ENERGY_BLOCK_FRAMES):
+        n = min(ENERGY_BLOCK_FRAMES, count - first)
+        frames = audio[first * frame:(first + n) * frame].reshape(n, frame)
+        energy[first:first + n] = 20.0 * np.log10(np.sqrt(np.mean(frames * frames, axis=1) + 1e-12))
+    return energy
+
+
+def plan_chunks(audio, sample_rate=SAMPLE_RATE, min_seconds=MIN_CHUNK_SECONDS, max_seconds=MAX_CHUNK_SECONDS):
+    """
+    무음 지점에서 자른 (시작, 끝) 샘플 구간 목록
+
+    각 조각은 min_seconds ~ max_seconds 길이이며, 그 범위 안에서 에너지가 가장 낮은 지점에서 자름
+    """
+    import numpy as np
+
+    total = len(audio)
+    if total <= max_seconds * sample_rate:
+        return [(0, total)]
+
+    frame = max(1, int(sample_rate * FRAME_SECONDS))
+    energy = frame_energy_db(audio, sample_rate)
+    smooth = max(1, int(SMOOTH_SECONDS / FRAME_SECONDS))
+    energy = np.convolve(energy, np.ones(smooth) / smooth, mode='same')
+
+    chunks = []
+    start = 0
+    while total - start > max_seconds * sample_rate:
+        lo = (start + int(min_seconds * sample_rate)) // frame
+        hi = min(len(energy), (start + int(max_seconds * sample_rate)) // frame)
+        cut = (lo + int(np.argmin(energy[lo:hi]))) * frame if hi > lo else start + int(max_seconds * sample_rate)
+        chunks.append((start, cut))
+        start = cut
+    chunks.append((start, total))
+    return chunks
+
+
+def _init_worker(model_size, device, threads, backend, model_dir):
+    """작업 프로세스 초기화: 모델을 한 번만 로드"""
+    global _model
+    from asr_backends import create_backend
+
+    os.environ['CT2_CPU_THREADS'] = str(threads)
+    _model = create_backend(backend, model_size, device=device, model_dir=model_dir)
+    if _model.name == 'whisper':
+        import torch
+        torch.set_num_threads(threads)
+    _model.load()
+
+
+def _transcribe_chunk(audio_chunk, options):
+    return _model.transcribe(audio_chunk, **options)
+
+
+def get_pool(model_size, device="cpu", workers=None, backend=None, model_dir=None):
+    """모델이 미리 로드된 프로세스 풀 (같은 설정이면 재사용)"""
+    workers = workers or os.cpu_count() or 1
+    key = (model_size, device, workers, backend, model_dir)
+    pool = _pools.get(key)
+    if pool is None:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(model_size, device, threads, backend, model_dir),
+        )
+        _pools[key] = pool
+    return pool
+
+
+def shutdown_pools():
+    """모든 프로세스 풀 종료"""
+    for pool in _pools.values():
+        pool.shutdown(wait=True)
+    _pools.clear()
+
+
+def stitch_results(chunk_results, offsets):
+    """조각별 결과를 전체 타임스탬프와 연속 번호로 합치기"""
+    from asr_backends import shift_segment
+
+    segments = []
+    texts = []
+    language = None
+    for result, offset in zip(chunk_results, offsets):
+        language = language or result.get('language')
+        texts.append(result.get('text', ''))
+        for segment in result['segments']:
+            segment = shift_segment(segment, offset)
+            segment['id'] = len(segments)
+            segments.append(segment)
+    return {'text': ''.join(texts), 'segments': segments, 'language': language}
+
+
+def transcribe_parallel(audio_file, model_size, device="cpu", workers=None, backend=None, model_dir=None,
+                        **options):
+    """음성을 무음 지점에서 나눠 여러 CPU 코어에서 동시에 변환"""
+    from audio_io import open_pcm
+
+    options = dict(options)
+    options['verbose'] = None  # 작업 프로세스 출력 억제
+    pool = get_pool(model_size, device, workers, backend, model_dir)
+    in_flight = 2 * (workers or os.cpu_count() or 1)
+
+    with open_pcm(audio_file) as audio:
+        chunks = plan_chunks(audio)
+        print(f"🧩 무음 구간 기준 {len(chunks)}개 조각으로 나눠 병렬 변환 중...")
+
+        # 작업자 수의 두 배까지만 조각을 읽어 보내 메모리 사용량을 제한
+        futures = []
+        results = []
+        for start, end in chunks:
+            if len(futures) - len(results) >= in_flight:
+                results.append(futures[len(results)].result())
+            futures.append(pool.submit(_transcribe_chunk, audio[start:end], options))
+        results.extend(future.result() for future in futures[len(results):])
+    return stitch_results(results, [start / SAMPLE_RATE for start, _ in chunks])
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단계별 측정값 (용량 계획용)
+환경 설정 · 다운로드 · 모델 로딩 · 음성 인식 · 파일 생성 등 단계마다 경과 시간, CPU 시간,
+입출력 바이트, 최대 메모리(RSS)를 재고, 음성 인식은 실시간 배율(처리 초 / 음성 초)도 계산합니다.
+같은 값을 모아 Prometheus 텍스트 형식으로 내보낼 수 있고, METRICS_FILE을 지정하면
+한 단계가 끝날 때마다 JSON Lines 파일에 한 줄씩 추가합니다(영상 ID · 모델 · 디바이스 태그 포함,
+METRICS_MAX_BYTES를 넘으면 .1로 돌려 씀). METRICS_PORT를 지정하면 /metrics 서버를 띄웁니다.
+
+단계별 최대 RSS는 Linux에서 단계 시작 때 /proc/self/clear_refs로 최고치(VmHWM)를 되돌리고
+끝날 때 VmHWM을 읽어 잽니다. 되돌릴 수 없으면 프로세스 시작 이후 최대값을 기록하고,
+어느 쪽인지 peak_rss_scope(stage · shared · process)에 남깁니다.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+# 단계별 기록 파일 (선택, 예: ./output/.cache/metrics.jsonl)과 돌려 쓰는 크기
+METRICS_FILE = os.getenv('METRICS_FILE', '')
+METRICS_MAX_BYTES = int(os.getenv('METRICS_MAX_BYTES', str(10 * 1024 * 1024)))
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0') or 0)
+
+# 모든 측정값에 붙는 공통 태그 (모델, 디바이스, 백엔드 등)
+METRIC_TAGS = {}
+
+# Prometheus 레이블 (영상 ID는 값이 계속 늘어나므로 JSON Lines에만 기록)
+PROMETHEUS_LABELS = ('stage', 'model', 'device')
+
+_lock = threading.Lock()
+_totals = {}        # 레이블 값 → 누적 합계
+_last_rtf = {}      # (모델, 디바이스) → 마지막 실시간 배율
+_stage_hooks = []   # 단계마다 함께 실행할 훅 (프로파일러 등)
+_active_stages = 0  # 지금 실행 중인 단계 수 (최고치는 아무 단계도 없을 때만 되돌림)
+_process_peak = 0   # 되돌리기 전 최고치를 모은 프로세스 최대 RSS
+
+
+def set_tags(**tags):
+    """공통 태그 설정 (None 값은 제거)"""
+    for key, value in tags.items():
+        if value is None:
+            METRIC_TAGS.pop(key, None)
+        else:
+            METRIC_TAGS[key] = value
+
+
+def add_stage_hook(hook):
+    """단계마다 함께 실행할 훅 등록 (hook(단계 이름, 태그) → 컨텍스트 관리자, 측정 시간 밖에서 시작 · 종료)"""
+    if hook not in _stage_hooks:
+        _stage_hooks.append(hook)
+
+
+def _maxrss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def high_water_rss_bytes():
+    """마지막으로 되돌린 뒤 최대 RSS (/proc/self/status의 VmHWM, Linux 외에는 None)"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def reset_peak_rss():
+    """최대 RSS(VmHWM)를 현재 RSS로 되돌림 (Linux, 성공하면 True, 그 전 최고치는 프로세스 최대값에 보관)"""
+    global _process_peak
+
+    _process_peak = max(_process_peak, high_water_rss_bytes() or 0)
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes():
+    """프로세스 시작 이후 최대 RSS (바이트, 알 수 없으면 None)"""
+    # clear_refs로 되돌리면 ru_maxrss도 함께 줄어들 수 있어 보관한 최고치와 비교
+    values = [v for v in (_maxrss_bytes(), high_water_rss_bytes(), _process_peak) if v]
+    return max(values) if values else None
+
+
+def current_rss_bytes():
+    """현재 RSS (바이트, Linux 외에는 None)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def file_size(path):
+    """파일 크기 (없으면 0)"""
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+class StageMetrics:
+    """단계 하나의 측정값 (with stage(...) as m: 안에서 바이트 · 음성 길이 등을 채움)"""
+
+    __slots__ = ('name', 'tags', 'bytes_in', 'bytes_out', 'audio_seconds', 'failed', 'extra')
+
+    def __init__(self, name, tags):
+        self.name = name
+        self.tags = tags
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.audio_seconds = None
+        self.failed = False  # 예외 없이 실패를 반환하는 단계 (다운로드 실패 → None 등)
+        self.extra = {}
+
+
+@contextmanager
+def stage(name, **tags):
+    """
+    단계 하나를 측정해 기록
+
+    CPU 시간은 프로세스 전체 기준 (모델이 여러 스레드를 쓰므로), 다른 단계와 동시에 실행되면 함께 포함됨
+    최대 RSS는 다른 단계가 실행 중이 아닐 때만 되돌리므로, 겹쳐 실행되면 앞 단계 시작 이후 값(shared)
+    """
+    global _active_stages
+
+    metrics = StageMetrics(name, dict(METRIC_TAGS, **{k: v for k, v in tags.items() if v is not None}))
+    with ExitStack() as hooks:
+        for hook in list(_stage_hooks):
+            hooks.enter_context(hook(name, metrics.tags))
+        with _lock:
+            scope = 'shared'
+            if _active_stages == 0:
+                scope = 'stage' if reset_peak_rss() else 'process'
+            _active_stages += 1
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        ok = False
+        try:
+            yield metrics
+            ok = True
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            with _lock:
+                _active_stages -= 1
+            record(metrics, wall, cpu, ok and not metrics.failed, scope)
+
+
+def record(metrics, wall, cpu, ok=True, peak_scope='process'):
+    """
+    측정값 한 줄을 기록하고 Prometheus 합계에 더함
+
+    peak_scope: peak_rss_bytes의 범위 (stage: 이 단계만, shared: 겹친 단계 포함, process: 프로세스 시작 이후)
+    """
+    peak = high_water_rss_bytes() if peak_scope != 'process' else None
+    if peak is None:
+        peak_scope = 'process'
+        peak = peak_rss_bytes()
+    rtf = wall / metrics.audio_seconds if metrics.audio_seconds else None
+    entry = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'stage': metrics.name,
+        'ok': ok,
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(cpu, 4),
+        'bytes_in': metrics.bytes_in,
+        'bytes_out': metrics.bytes_out,
+        'peak_rss_bytes': peak,
+        'peak_rss_scope': peak_scope,
+        'rss_bytes': current_rss_bytes(),
+    }
+    if metrics.audio_seconds:
+        entry['audio_seconds'] = round(metrics.audio_seconds, 3)
+        entry['real_time_factor'] = round(rtf, 4)
+    entry.update(metrics.extra)
+    entry.update(metrics.tags)
+
+    labels = tuple(str(entry.get(label, '')) for label in PROMETHEUS_LABELS)
+    with _lock:
+        totals = _totals.setdefault(labels, {'runs': 0, 'failures': 0, 'wall': 0.0, 'cpu': 0.0,
+                                             'bytes_in': 0, 'bytes_out': 0, 'audio': 0.0})
+        totals['runs'] += 1
+        totals['failures'] += 0 if ok else 1
+        totals['wall'] += wall
+        totals['cpu'] += cpu
+        totals['bytes_in'] += metrics.bytes_in
+        totals['bytes_out'] += metrics.bytes_out
+        totals['audio'] += metrics.audio_seconds or 0.0
+        if rtf is not None:
+            _last_rtf[labels[1:]] = rtf
+        if METRICS_FILE:
+            _append(entry)
+    return entry
+
+
+def _append(entry):
+    try:
+        path = Path(METRICS_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 크기 제한을 넘으면 이전 기록은 .1로 옮기고 새로 시작 (최근 기록 두 개만 유지)
+        if METRICS_MAX_BYTES and path.exists() and path.stat().st_size >= METRICS_MAX_BYTES:
+            os.replace(path, path.with_name(path.name + '.1'))
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    except OSError as e:
+        print(f"⚠️ 측정값 기록 실패: {e}")
+
+
+def _label_text(names, values):
+    pairs = []
+    for name, value in zip(names, values):
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def render_prometheus():
+    """누적 측정값을 Prometheus 텍스트 형식으로"""
+    counters = (
+        ('transcript_stage_runs_total', 'runs', "단계 실행 횟수"),
+        ('transcript_stage_failures_total', 'failures', "실패한 단계 실행 횟수"),
+        ('transcript_stage_wall_seconds_total', 'wall', "단계 경과 시간 합계 (초)"),
+        ('transcript_stage_cpu_seconds_total', 'cpu', "단계 CPU 시간 합계 (초)"),
+        ('transcript_stage_bytes_in_total', 'bytes_in', "단계 입력 바이트 합계"),
+        ('transcript_stage_bytes_out_total', 'bytes_out', "단계 출력 바이트 합계"),
+        ('transcript_stage_audio_seconds_total', 'audio', "단계에서 처리한 음성 길이 합계 (초)"),
+    )
+    with _lock:
+        totals = {labels: dict(values) for labels, values in _totals.items()}
+        last_rtf = dict(_last_rtf)
+
+    lines = []
+    for metric, key, help_text in counters:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for labels, values in sorted(totals.items()):
+            lines.append(f"{metric}{_label_text(PROMETHEUS_LABELS, labels)} {values[key]}")
+    lines.append("# HELP transcript_real_time_factor 마지막 음성 인식의 실시간 배율 (처리 초 / 음성 초)")
+    lines.append("# TYPE transcript_real_time_factor gauge")
+    for labels, value in sorted(last_rtf.items()):
+        lines.append(f"transcript_real_time_factor{_label_text(PROMETHEUS_LABELS[1:], labels)} {value}")
+    peak = peak_rss_bytes()
+    if peak is not None:
+        lines.append("# HELP transcript_peak_rss_bytes 프로세스 최대 RSS (바이트)")
+        lines.append("# TYPE transcript_peak_rss_bytes gauge")
+        lines.append(f"transcript_peak_rss_bytes {peak}")
+    return '\n'.join(lines) + '\n'
+
+
+def start_metrics_server(port=None, host='127.0.0.1'):
+    """GET /metrics로 Prometheus 텍스트를 내보내는 서버를 백그라운드 스레드로 시작 (포트가 0이면 None)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    port = METRICS_PORT if port is None else port
+    if not port:
+        return None
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    print(f"📊 측정값 서버: http://{host}:{server.server_port}/metrics")
+    return server
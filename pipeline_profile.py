@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+파이프라인 프로파일링
+pipeline_metrics.stage() 지점마다 cProfile을 걸어 단계별 통계(.prof, 상위 함수 .txt)를 남기고,
+음성 인식 · 파일 생성 단계는 tracemalloc으로 가장 많이 할당한 위치를 기록합니다.
+선택적으로 단계 스레드의 스택을 주기적으로 샘플링해 플레임 그래프(.folded, .svg)도 만듭니다.
+
+결과는 출력 폴더 옆 profile 폴더에 실행마다 따로 저장합니다:
+    output/<영상 ID>/profile/<실행 ID>/transcribe.prof, transcribe.txt, transcribe-memory.txt, ...
+    output/profile/<실행 ID>/setup.prof, model_load.prof, ...   (영상과 무관한 단계)
+
+PIPELINE_PROFILE=1(또는 결과 루트 폴더)로 켜고, PIPELINE_PROFILE_FLAME=1이면 플레임 그래프도 만듭니다.
+cProfile은 한 번에 한 단계만 걸 수 있어, 일괄 처리에서 겹쳐 실행되는 단계는 먼저 시작한 단계만 기록합니다.
+"""
+
+import io
+import os
+import sys
+import time
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+PROFILE = os.getenv('PIPELINE_PROFILE', '')
+PROFILE_FLAME = os.getenv('PIPELINE_PROFILE_FLAME', '0') == '1'
+
+# 플레임 그래프 샘플링 간격 (초)
+FLAME_INTERVAL = float(os.getenv('PIPELINE_PROFILE_INTERVAL', '0.005'))
+
+# tracemalloc을 거는 단계 (추적 중에는 할당마다 비용이 들어 필요한 단계만)
+MEMORY_STAGES = ('transcribe', 'write')
+MEMORY_FRAMES = 15
+MEMORY_TOP = 30
+
+# 통계 텍스트에 남길 상위 함수 수
+STATS_TOP = 40
+
+OUTPUT_ROOT = './output'
+
+_root = None
+_flame = False
+_run_id = None
+_lock = threading.Lock()
+_profiler_busy = False
+_tracemalloc_users = 0      # tracemalloc을 쓰는 중인 단계 수 (겹치는 단계가 서로 끄지 않도록)
+_tracemalloc_owned = False  # 이 모듈이 시작한 추적인지 (외부에서 켠 추적은 끄지 않음)
+_names = {}         # 폴더 → 이미 쓴 단계 이름 (같은 단계가 여러 번이면 -2, -3 ...)
+
+
+def enable_profiling(target=None, flame=False):
+    """
+    프로파일링 켜기 (결과 루트 폴더 반환, 꺼져 있으면 None)
+
+    target: '1'이면 출력 폴더, 아니면 결과를 둘 루트 폴더 (--profile-dir), 없으면 PIPELINE_PROFILE
+    """
+    global _root, _flame, _run_id
+    from pipeline_metrics import add_stage_hook
+
+    target = target or PROFILE
+    if not target or target == '0':
+        return None
+    _root = Path(OUTPUT_ROOT if target in ('1', 'true', 'yes') else target)
+    _flame = flame or PROFILE_FLAME
+    _run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    add_stage_hook(profile_stage)
+    print(f"🔬 프로파일링 켜짐: {_root}/…/profile/{_run_id}/" + (" (플레임 그래프 포함)" if _flame else ""))
+    return _root
+
+
+def profile_dir(tags):
+    """단계 태그에 맞는 결과 폴더 (영상 ID가 있으면 영상 폴더 아래)"""
+    from output_layout import video_dir
+
+    video_id = tags.get('video_id')
+    base = video_dir(_root, video_id) if video_id else _root
+    return base / 'profile' / _run_id
+
+
+def _stage_prefix(directory, name):
+    with _lock:
+        used = _names.setdefault(directory, {})
+        used[name] = used.get(name, 0) + 1
+        count = used[name]
+    return name if count == 1 else f"{name}-{count}"
+
+
+def _start_profiler():
+    """cProfile 시작 (다른 단계가 이미 쓰고 있으면 None)"""
+    global _profiler_busy
+    import cProfile
+
+    with _lock:
+        if _profiler_busy:
+            return None
+        _profiler_busy = True
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # 다른 프로파일러(디버거 등)가 이미 켜져 있음
+        with _lock:
+            _profiler_busy = False
+        return None
+    return profiler
+
+
+def _stop_profiler(profiler):
+    global _profiler_busy
+
+    profiler.disable()
+    with _lock:
+        _profiler_busy = False
+
+
+def save_stats(profiler, directory, prefix):
+    """cProfile 결과 → <단계>.prof (pstats · snakeviz용) + <단계>.txt (누적 시간 상위 함수)"""
+    import pstats
+
+    profiler.dump_stats(str(directory / f"{prefix}.prof"))
+    text = io.StringIO()
+    stats = pstats.Stats(profiler, stream=text)
+    stats.sort_stats('cumulative').print_stats(STATS_TOP)
+    stats.sort_stats('tottime').print_stats(STATS_TOP)
+    (directory / f"{prefix}.txt").write_text(text.getvalue(), encoding='utf-8')
+
+
+def _start_tracemalloc():
+    """tracemalloc 사용 시작 (첫 사용자가 추적을 켜고 최대 사용량을 초기화)"""
+    global _tracemalloc_users, _tracemalloc_owned
+    import tracemalloc
+
+    with _lock:
+        if _tracemalloc_users == 0:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start(MEMORY_FRAMES)
+                _tracemalloc_owned = True
+        _tracemalloc_users += 1
+    return True
+
+
+def _stop_tracemalloc():
+    """tracemalloc 사용 끝 (마지막 사용자가 나갈 때만 추적 중지)"""
+    global _tracemalloc_users, _tracemalloc_owned
+    import tracemalloc
+
+    with _lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+def save_memory(directory, prefix):
+    """
+    tracemalloc 스냅샷 → <단계>-memory.txt (최대 사용량, 위치별 · 호출 경로별 상위 할당)
+
+    겹쳐 실행되는 단계가 있으면 최대 사용량과 할당 목록에 그 단계의 할당도 함께 들어감
+    """
+    import tracemalloc
+
+    if not tracemalloc.is_tracing():
+        return
+    current, peak = tracemalloc.get_traced_memory()
+    # 프로파일러 자신의 할당은 제외
+    import cProfile
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ))
+
+    lines = [f"현재 추적 중인 메모리: {current / 1e6:.1f} MB", f"단계 중 최대: {peak / 1e6:.1f} MB", "",
+             f"== 위치별 상위 {MEMORY_TOP}개 =="]
+    for stat in snapshot.statistics('lineno')[:MEMORY_TOP]:
+        lines.append(str(stat))
+    lines += ["", "== 호출 경로별 상위 10개 =="]
+    for stat in snapshot.statistics('traceback')[:10]:
+        lines.append(f"\n{stat.size / 1e6:.2f} MB, {stat.count}개 블록")
+        lines.extend(stat.traceback.format())
+    (directory / f"{prefix}-memory.txt").write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+class StackSampler:
+    """한 스레드의 파이썬 스택을 주기적으로 읽어 (스택 → 샘플 수)를 모음"""
+
+    def __init__(self, thread_id, interval=FLAME_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                key = tuple(reversed(stack))
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+
+def save_flame(samples, directory, prefix):
+    """샘플 → <단계>.folded (flamegraph.pl · speedscope 형식) + <단계>-flame.svg"""
+    with open(directory / f"{prefix}.folded", 'w', encoding='utf-8') as f:
+        for stack, count in sorted(samples.items()):
+            f.write(f"{';'.join(stack)} {count}\n")
+    (directory / f"{prefix}-flame.svg").write_text(render_flame_svg(samples, prefix), encoding='utf-8')
+
+
+def render_flame_svg(samples, title, width=1200, row_height=16):
+    """스택 샘플로 간단한 플레임 그래프 SVG 생성 (아래가 바깥 호출, 마우스를 올리면 함수 · 비율 표시)"""
+    root = {'value': 0, 'children': {}}
+    for stack, count in samples.items():
+        root['value'] += count
+        node = root
+        for name in stack:
+            node = node['children'].setdefault(name, {'value': 0, 'children': {}})
+            node['value'] += count
+
+    total = root['value'] or 1
+    frames = []
+
+    def layout(node, x, depth):
+        for name, child in sorted(node['children'].items()):
+            w = child['value'] / total * width
+            if w >= 0.5:
+                frames.append((name, x, depth, w, child['value']))
+                layout(child, x, depth + 1)
+            x += w
+
+    layout(root, 0.0, 0)
+    depth = max((frame[2] for frame in frames), default=0) + 1
+    height = (depth + 2) * row_height
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'font-family="monospace" font-size="11">',
+             f'<text x="4" y="12">{escape(title)} — {root["value"]}개 샘플</text>']
+    for name, x, level, w, value in frames:
+        y = height - (level + 1) * row_height
+        hue = zlib.crc32(name.encode('utf-8')) % 40  # 함수마다 고정된 주황 계열 색
+        label = escape(name[:int(w / 7)]) if w > 30 else ''
+        parts.append(
+            f'<g><title>{escape(name)} ({value}개, {value / total:.1%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" fill="hsl({hue},85%,60%)"/>'
+            f'<text x="{x + 3:.1f}" y="{y + 11}">{label}</text></g>')
+    parts.append('</svg>')
+    return '\n'.join(parts) + '\n'
+
+
+@contextmanager
+def profile_stage(name, tags):
+    """pipeline_metrics.stage() 훅: 단계 하나를 프로파일링해 결과 폴더에 저장"""
+    directory = profile_dir(tags)
+    profiler = _start_profiler()
+    traced = name in MEMORY_STAGES and _start_tracemalloc()
+    sampler = StackSampler(threading.get_ident()).start() if _flame else None
+    try:
+        yield
+    finally:
+        samples = sampler.stop() if sampler else None
+        if profiler:
+            _stop_profiler(profiler)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            prefix = _stage_prefix(directory, name)
+            # 메모리 스냅샷을 먼저 떠서 통계 정리 중의 할당이 섞이지 않게
+            if traced:
+                save_memory(directory, prefix)
+            if profiler:
+                save_stats(profiler, directory, prefix)
+            if samples is not None:
+                save_flame(samples, directory, prefix)
+        except OSError as e:
+            print(f"⚠️ 프로파일 저장 실패 ({name}): {e}")
+        finally:
+            if traced:
+                _stop_tracemalloc()
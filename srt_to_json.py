@@ -1,31 +1,21 @@
 import json
-import re
 from pathlib import Path
 
-# 번체→간체 변환기 (opencc 필요)
-def to_simplified(text):
-    try:
-        from opencc import OpenCC
-        cc = OpenCC('t2s')
-        return cc.convert(text)
-    except ImportError:
-        print('opencc가 설치되어 있지 않습니다. pip install opencc-python-reimplemented')
-        return text
+# 공용 SRT/VTT 스트리밍 파서
+from subtitle_parser import read_cues, format_ms
 
-def srt_to_json(srt_path, json_path):
-    with open(srt_path, 'r', encoding='utf-8') as f:
-        srt_content = f.read()
+# 번체→간체 변환기 (opencc 필요, 프로세스 전체에서 공유 + 결과 메모)
+from text_normalize import to_simplified
 
-    pattern = re.compile(r'(\d+)\n([\d:,]+) --> ([\d:,]+)\n(.+?)(?=\n\d+\n|\Z)', re.S)
+def srt_to_json(srt_path, json_path):
     segments = []
-    for match in pattern.finditer(srt_content):
-        idx, start, end, text = match.groups()
-        text = text.replace('\n', ' ').strip()
+    for cue in read_cues(srt_path):
+        text = cue.text.replace('\n', ' ').strip()
         text_simp = to_simplified(text)
         segments.append({
-            'id': int(idx),
-            'start_time': start,
-            'end_time': end,
+            'id': cue.index if isinstance(cue.index, int) else len(segments) + 1,
+            'start_time': format_ms(cue.start_ms),
+            'end_time': format_ms(cue.end_ms),
             'text': text_simp
         })
 
@@ -34,6 +24,16 @@ def srt_to_json(srt_path, json_path):
     print(f'✅ 변환 완료: {json_path}')
 
 if __name__ == '__main__':
-    srt_file = 'audio_1752312657.srt'
-    json_file = 'audio_1752312657.json'
-    srt_to_json(srt_file, json_file) 
\ No newline at end of file
+    import sys
+
+    # 사용법: python srt_to_json.py 입력.srt [출력.json]  또는  python srt_to_json.py 폴더 (일괄 변환)
+    if len(sys.argv) < 2:
+        print("사용법: python srt_to_json.py 입력.srt [출력.json] | 폴더")
+        sys.exit(1)
+    if Path(sys.argv[1]).is_dir():
+        from convert_corpus import main
+        sys.exit(main([sys.argv[1], '--to', 'json', *sys.argv[2:]]))
+    srt_file = sys.argv[1]
+    json_file = sys.argv[2] if len(sys.argv) > 2 else str(Path(srt_file).with_suffix('.json'))
+    srt_to_json(srt_file, json_file)
+ 
\ No newline at end of file
@@ -1,14 +1,11 @@
-import json
-import re
 from pathlib import Path
 
+# 공용 SRT/VTT 스트리밍 파서
+from subtitle_parser import read_cues, parse_timestamp
+
 def time_to_seconds(time_str):
     """SRT 타임스탬프를 초로 변환"""
-    time_parts = time_str.replace(',', '.').split(':')
-    hours = int(time_parts[0])
-    minutes = int(time_parts[1])
-    seconds = float(time_parts[2])
-    return hours * 3600 + minutes * 60 + seconds
+    return parse_timestamp(time_str) / 1000
 
 def seconds_to_time(seconds):
     """초를 SRT 타임스탬프로 변환"""
@@ -17,61 +14,121 @@ def seconds_to_time(seconds):
     seconds = seconds % 60
     return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}".replace('.', ',')
 
-def create_word_highlight_json(srt_path, json_path):
-    """SRT를 글자별 하이라이트 JSON으로 변환"""
-    with open(srt_path, 'r', encoding='utf-8') as f:
-        srt_content = f.read()
+# 세그먼트 글자와 단어 글자를 맞출 때 앞으로 살펴볼 단어 글자 수
+MATCH_LOOKAHEAD = 4
+
+def char_timings(segment):
+    """
+    세그먼트 텍스트의 글자마다 (글자, 시작, 끝) 목록
+
+    Whisper 단어 타이밍(번체→간체 변환 후)을 단어 안 글자에 나눠 주고, 세그먼트 텍스트의 글자와 맞춤
+    단어 타이밍이 없는 글자(문장부호 · 공백, 또는 단어 정보가 없는 SRT)는 앞뒤 글자 사이에 균등 배치
+    """
+    text = segment['text']
+    start = segment['start']
+    end = segment['end']
+    
+    # 단어 타이밍을 글자 단위로 (단어 길이만큼 균등 분할)
+    timed = []
+    for word in segment.get('words') or ():
+        word_chars = [c for c in word['word'] if not c.isspace()]
+        if not word_chars:
+            continue
+        step = (word['end'] - word['start']) / len(word_chars)
+        for k, char in enumerate(word_chars):
+            timed.append((char, word['start'] + k * step, word['start'] + (k + 1) * step))
+    
+    # 세그먼트 글자에 단어 글자 타이밍 맞추기
+    chars = list(text)
+    times = [None] * len(chars)
+    j = 0
+    for i, char in enumerate(chars):
+        for k in range(j, min(j + MATCH_LOOKAHEAD, len(timed))):
+            if timed[k][0] == char:
+                times[i] = timed[k][1:]
+                j = k + 1
+                break
+    
+    # 맞춰지지 않은 글자는 앞뒤 글자 사이에 균등 배치
+    i = 0
+    while i < len(chars):
+        if times[i] is not None:
+            i += 1
+            continue
+        k = i
+        while k < len(chars) and times[k] is None:
+            k += 1
+        lo = times[i - 1][1] if i > 0 else start
+        hi = times[k][0] if k < len(chars) else end
+        hi = max(hi, lo)
+        step = (hi - lo) / (k - i)
+        for m in range(i, k):
+            times[m] = (lo + (m - i) * step, lo + (m - i + 1) * step)
+        i = k
+    
+    return [(char, char_start, char_end) for char, (char_start, char_end) in zip(chars, times)]
 
-    pattern = re.compile(r'(\d+)\n([\d:,]+) --> ([\d:,]+)\n(.+?)(?=\n\d+\n|\Z)', re.S)
-    segments = []
+def highlight_record(segment, index):
+    """정규화된 세그먼트 레코드 → 글자별 하이라이트 레코드"""
+    words = []
+    for char, char_start, char_end in char_timings(segment):
+        words.append({
+            "char": char,
+            "start": round(char_start, 3),
+            "end": round(char_end, 3),
+            "start_time": seconds_to_time(char_start),
+            "end_time": seconds_to_time(char_end)
+        })
     
-    for match in pattern.finditer(srt_content):
-        idx, start, end, text = match.groups()
-        text = text.replace('\n', ' ').strip()
-        
-        # 시간을 초로 변환
-        start_seconds = time_to_seconds(start)
-        end_seconds = time_to_seconds(end)
-        duration = end_seconds - start_seconds
-        
-        # 글자별로 균등 분할
-        chars = list(text)
-        char_count = len(chars)
-        
-        if char_count > 0:
-            time_per_char = duration / char_count
-            words = []
-            
-            for i, char in enumerate(chars):
-                char_start = start_seconds + (i * time_per_char)
-                char_end = start_seconds + ((i + 1) * time_per_char)
-                
-                words.append({
-                    "char": char,
-                    "start": round(char_start, 3),
-                    "end": round(char_end, 3),
-                    "start_time": seconds_to_time(char_start),
-                    "end_time": seconds_to_time(char_end)
-                })
-            
-            segments.append({
-                "id": int(idx),
-                "start_time": start,
-                "end_time": end,
-                "start_seconds": start_seconds,
-                "end_seconds": end_seconds,
-                "duration": duration,
-                "text": text,
-                "words": words
-            })
+    return {
+        "id": index,
+        "start_time": seconds_to_time(segment['start']),
+        "end_time": seconds_to_time(segment['end']),
+        "start_seconds": segment['start'],
+        "end_seconds": segment['end'],
+        "duration": segment['end'] - segment['start'],
+        "text": segment['text'],
+        "words": words
+    }
+
+def create_word_highlight_json(srt_path, json_path):
+    """
+    SRT/VTT를 글자별 하이라이트 JSON으로 변환 (단어 타이밍이 없으므로 글자별 균등 분할)
+
+    음성 인식 결과가 있으면 write_transcript()의 'highlight' 형식이 실제 단어 타이밍으로 바로 생성함
+    """
+    from transcript_writers import write_transcript
 
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(segments, f, ensure_ascii=False, indent=2)
+    stats = {'segments': 0, 'chars': 0}
+
+    def segments():
+        for cue in read_cues(srt_path):
+            text = cue.text.replace('\n', ' ').strip()
+            if text:
+                stats['segments'] += 1
+                stats['chars'] += len(text)
+            yield {'start': cue.start, 'end': cue.end, 'text': text}
+
+    write_transcript(segments(), {'highlight': json_path})
     
     print(f"✅ 글자별 하이라이트 JSON 생성 완료: {json_path}")
-    print(f"📊 총 {len(segments)}개 세그먼트, {sum(len(s['words']) for s in segments)}개 글자")
+    print(f"📊 총 {stats['segments']}개 세그먼트, {stats['chars']}개 글자")
 
 if __name__ == '__main__':
-    srt_file = '../output/output/audio_1752312657.srt'
-    json_file = '../output/audio_1752312657_word_highlight.json'
-    create_word_highlight_json(srt_file, json_file) 
\ No newline at end of file
+    import sys
+
+    # 사용법: python srt_to_word_highlight.py 입력.srt [출력.json]  또는  ... 폴더 (일괄 변환)
+    if len(sys.argv) < 2:
+        print("사용법: python srt_to_word_highlight.py 입력.srt [출력.json] | 폴더")
+        sys.exit(1)
+    if Path(sys.argv[1]).is_dir():
+        from convert_corpus import main
+        sys.exit(main([sys.argv[1], '--to', 'highlight', *sys.argv[2:]]))
+    srt_file = sys.argv[1]
+    if len(sys.argv) > 2:
+        json_file = sys.argv[2]
+    else:
+        from convert_corpus import output_path
+        json_file = str(output_path(srt_file, 'highlight'))
+    create_word_highlight_json(srt_file, json_file)
+ 
\ No newline at end of file
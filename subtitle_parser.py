@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SRT/VTT 자막 파서 (스트리밍)
+파일 핸들을 한 줄씩 읽으며 큐(Cue)를 하나씩 반환하므로 파일 크기와 관계없이 메모리가 일정합니다.
+CRLF · BOM · 여러 줄 자막 · VTT 머리말과 NOTE/STYLE/REGION 블록을 처리하고,
+타임스탬프는 정수 밀리초로 바로 계산합니다 (float 문자열 변환 없음).
+"""
+
+
+class Cue:
+    """자막 한 개 (시간은 정수 밀리초)"""
+
+    __slots__ = ('index', 'start_ms', 'end_ms', 'text')
+
+    def __init__(self, index, start_ms, end_ms, text):
+        self.index = index
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.text = text
+
+    @property
+    def start(self):
+        """시작 시간 (초)"""
+        return self.start_ms / 1000
+
+    @property
+    def end(self):
+        """끝 시간 (초)"""
+        return self.end_ms / 1000
+
+    def __repr__(self):
+        return f"Cue({self.index!r}, {self.start_ms}, {self.end_ms}, {self.text!r})"
+
+
+def parse_timestamp(value):
+    """'HH:MM:SS,mmm' · 'HH:MM:SS.mmm' · 'MM:SS.mmm' → 정수 밀리초"""
+    value = value.strip()
+    head, sep, fraction = value.replace(',', '.').rpartition('.')
+    if not sep:
+        head, fraction = value, ''
+    parts = head.split(':')
+    if len(parts) == 3:
+        hours, minutes, seconds = parts
+    elif len(parts) == 2:
+        hours = 0
+        minutes, seconds = parts
+    else:
+        raise ValueError(f"잘못된 타임스탬프: {value}")
+    millis = int((fraction + '000')[:3]) if fraction else 0
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + millis
+
+
+def format_ms(ms, separator=','):
+    """정수 밀리초 → 'HH:MM:SS,mmm' (VTT는 separator='.')"""
+    seconds, millis = divmod(int(ms), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{millis:03d}"
+
+
+def _parse_timing(line):
+    """'시작 --> 끝 [VTT 설정]' → (시작 ms, 끝 ms)"""
+    start, _, rest = line.partition('-->')
+    end = rest.split(None, 1)[0] if rest.strip() else ''
+    return parse_timestamp(start), parse_timestamp(end)
+
+
+def iter_cues(lines):
+    """
+    SRT/VTT 줄 이터레이터(파일 핸들 등)에서 Cue를 하나씩 반환
+
+    번호가 없는 SRT 큐나 VTT 식별자가 없는 큐는 순서대로 번호를 매김
+    타임스탬프가 잘못된 블록은 건너뜀
+    """
+    block = []
+    count = 0
+    first = True
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if first:
+            line = line.lstrip('\ufeff')
+            first = False
+        if line.strip():
+            block.append(line)
+            continue
+        if block:
+            cue = _parse_block(block, count)
+            block = []
+            if cue is not None:
+                count += 1
+                yield cue
+    if block:
+        cue = _parse_block(block, count)
+        if cue is not None:
+            yield cue
+
+
+def _parse_block(block, count):
+    """빈 줄로 구분된 블록 하나 → Cue (자막이 아닌 블록이면 None)"""
+    head = block[0]
+    if head.startswith('WEBVTT') or head.startswith(('NOTE', 'STYLE', 'REGION')):
+        return None
+
+    # 타이밍 줄은 첫 줄(번호 없음) 또는 둘째 줄(번호/식별자 다음)
+    if '-->' in head:
+        timing_at = 0
+    elif len(block) > 1 and '-->' in block[1]:
+        timing_at = 1
+    else:
+        return None
+    try:
+        start_ms, end_ms = _parse_timing(block[timing_at])
+    except ValueError:
+        return None
+
+    index = block[0].strip() if timing_at else ''
+    if index.isdigit():
+        index = int(index)
+    elif not index:
+        index = count + 1
+    return Cue(index, start_ms, end_ms, '\n'.join(block[timing_at + 1:]))
+
+
+def read_cues(path):
+    """자막 파일 경로에서 Cue를 하나씩 반환 (UTF-8, BOM 허용)"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        yield from iter_cues(f)
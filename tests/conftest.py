@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+테스트 공용 설정
+저장소 루트 모듈과 벤치마크 합성 데이터(benchmarks/synthetic.py)를 불러올 수 있게 경로를 추가합니다.
+네트워크 · 모델 · FFmpeg 없이 돌아가며, 합성 음성이 필요한 테스트는 numpy가 없으면 건너뜁니다.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / 'benchmarks'))
+
+
+@pytest.fixture
+def make_wav(tmp_path):
+    """합성 음성 WAV 생성 함수: make_wav(상대 경로, 초, 시드) → 경로 (16 kHz 모노 16비트)"""
+    pytest.importorskip('numpy')
+    from synthetic import write_wav_file
+
+    def make(name, seconds, seed=0):
+        return write_wav_file(tmp_path / name, seconds, seed)
+    return make
+
+
+@pytest.fixture
+def write_pcm(tmp_path):
+    """float 배열을 WAV로 저장하는 함수: write_pcm(상대 경로, 배열) → 경로"""
+    np = pytest.importorskip('numpy')
+    import wave
+
+    def write(name, audio):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pcm = (np.clip(audio, -1, 1) * 32767).astype('<i2')
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(pcm.tobytes())
+        return path
+    return write
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""audio_fingerprint: 합성 음성으로 같은 음성 · 잘라낸 음성 찾기와 결과 옮기기"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from audio_fingerprint import FingerprintIndex, SAMPLE_RATE, clip_segments, fingerprint  # noqa: E402
+from synthetic import speech_like_audio  # noqa: E402
+from transcript_cache import TranscriptCache  # noqa: E402
+
+SETTINGS = ('base', 'zh', {'word_timestamps': True})
+
+
+@pytest.fixture(scope='module')
+def full():
+    return speech_like_audio(30, seed=1)
+
+
+@pytest.fixture
+def index(tmp_path, full):
+    fingerprints = FingerprintIndex(tmp_path / 'fingerprints.sqlite')
+    fingerprints.add('full', *fingerprint(full))
+    fingerprints.add('other', *fingerprint(speech_like_audio(30, seed=2)))
+    return fingerprints
+
+
+def test_clip_is_found_at_its_offset(index, full):
+    clip = full[5 * SAMPLE_RATE:15 * SAMPLE_RATE]
+    matches = index.match(*fingerprint(clip))
+
+    assert [m['digest'] for m in matches] == ['full']
+    assert matches[0]['offset'] == pytest.approx(5.0, abs=0.05)
+    assert matches[0]['contained'] is True
+
+
+def test_same_audio_matches_itself(index, full):
+    matches = index.match(*fingerprint(full))
+    assert matches[0]['digest'] == 'full'
+    assert matches[0]['offset'] == pytest.approx(0.0, abs=0.05)
+
+
+def test_unrelated_audio_and_excluded_digest_do_not_match(index, full):
+    assert index.match(*fingerprint(speech_like_audio(10, seed=3))) == []
+    assert index.match(*fingerprint(full), exclude='full') == []
+
+
+def test_longer_audio_is_not_contained(tmp_path, full):
+    fingerprints = FingerprintIndex(tmp_path / 'fingerprints.sqlite')
+    fingerprints.add('clip', *fingerprint(full[5 * SAMPLE_RATE:15 * SAMPLE_RATE]))
+    matches = fingerprints.match(*fingerprint(full))
+    assert matches and matches[0]['contained'] is False
+
+
+def test_add_is_idempotent(index, full):
+    assert 'full' in index
+    index.add('full', *fingerprint(full))
+    assert len(index.match(*fingerprint(full))) == 1
+
+
+def test_clip_segments_shifts_and_trims():
+    segments = [
+        {'id': 0, 'start': 1.0, 'end': 4.0, 'text': '甲', 'words': [{'word': '甲', 'start': 1.0, 'end': 4.0}]},
+        {'id': 1, 'start': 4.5, 'end': 7.0, 'text': '乙', 'words': [{'word': '乙', 'start': 4.5, 'end': 7.0}]},
+        {'id': 2, 'start': 12.0, 'end': 14.0, 'text': '丙', 'words': []},
+    ]
+    clipped = clip_segments(segments, offset=3.0, duration=5.0)
+
+    assert [s['text'] for s in clipped] == ['甲', '乙']
+    assert [s['id'] for s in clipped] == [0, 1]
+    assert clipped[0]['start'] == 0.0 and clipped[0]['end'] == 1.0
+    assert clipped[0]['words'] == []  # 잘린 앞부분에서 시작한 단어는 버림
+    assert clipped[1]['start'] == pytest.approx(1.5)
+    assert clipped[1]['end'] == 4.0
+    assert segments[1]['start'] == 4.5  # 원본은 그대로
+
+
+def test_cache_reuses_transcript_of_longer_upload(tmp_path, full, write_pcm):
+    cache = TranscriptCache(tmp_path / 'cache')
+    long_audio = write_pcm('out/longvideo01/audio.wav', full)
+    json_file = long_audio.with_suffix('.json')
+    json_file.write_text(
+        '{"language": "zh", "segments": ['
+        '{"id": 0, "start": 2.0, "end": 4.0, "text": "前", "words": []},'
+        '{"id": 1, "start": 6.0, "end": 9.0, "text": "中", "words": []},'
+        '{"id": 2, "start": 20.0, "end": 22.0, "text": "后", "words": []}]}',
+        encoding='utf-8')
+    cache.store('longvideo01', str(long_audio), *SETTINGS,
+                artifacts={'audio': str(long_audio), 'json': str(json_file)})
+
+    clip = write_pcm('out/shortclip01/audio.wav', full[5 * SAMPLE_RATE:15 * SAMPLE_RATE])
+    found = cache.lookup_similar(str(clip), *SETTINGS)
+    assert found is not None
+    entry, match = found
+    result = cache.similar_result(entry, match)
+
+    assert [s['text'] for s in result['segments']] == ['中']
+    assert result['segments'][0]['start'] == pytest.approx(1.0, abs=0.05)
+    assert result['language'] == 'zh'
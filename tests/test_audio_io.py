@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""audio_io: 메모리 맵 PCM 읽기와 구간별 디코딩의 메모리 사용량"""
+
+import tracemalloc
+
+import pytest
+
+from audio_io import SAMPLE_RATE, PcmAudio, audio_duration, is_asr_ready, open_pcm, wav_data_range
+
+np = pytest.importorskip('numpy')
+
+
+class FakeWorker:
+    """구간 길이만 텍스트로 돌려주는 가짜 상주 작업자"""
+
+    loaded = True
+
+    def __init__(self):
+        self.windows = []
+
+    def transcribe(self, audio, initial_prompt=None, **options):
+        self.windows.append(len(audio))
+        text = f"{len(audio) // SAMPLE_RATE}s"
+        return {'text': text, 'segments': [{'start': 0.0, 'end': 1.0, 'text': text, 'words': []}]}
+
+
+def test_open_pcm_maps_wav_data(write_pcm):
+    samples = np.linspace(-0.5, 0.5, SAMPLE_RATE * 2, dtype=np.float32)
+    path = write_pcm('a.wav', samples)
+
+    assert is_asr_ready(path)
+    assert audio_duration(path) == 2.0
+    offset, size = wav_data_range(path)
+    assert offset == 44 and size == len(samples) * 2
+    with open_pcm(path) as audio:
+        assert isinstance(audio, PcmAudio) and len(audio) == len(samples)
+        chunk = audio[100:200]
+        assert chunk.dtype == np.float32
+        assert chunk == pytest.approx(samples[100:200], abs=1e-4)
+        windows = list(audio.iter_windows(SAMPLE_RATE // 2))
+        assert [start for start, _ in windows] == [0, 8000, 16000, 24000]
+        with pytest.raises(TypeError):
+            audio[0]
+
+
+def test_empty_and_temporary_pcm(tmp_path):
+    empty = tmp_path / 'empty.pcm'
+    empty.write_bytes(b'')
+    with PcmAudio(empty) as audio:
+        assert len(audio) == 0 and len(audio[0:10]) == 0
+
+    temp = tmp_path / 'temp.pcm'
+    temp.write_bytes(np.zeros(10, '<i2').tobytes())
+    with PcmAudio(temp, temporary=True) as audio:
+        assert len(audio) == 10
+    assert not temp.exists()
+
+
+def test_wav_data_range_rejects_other_files(tmp_path):
+    path = tmp_path / 'x.wav'
+    path.write_bytes(b'ID3' + b'\0' * 40)
+    with pytest.raises(ValueError):
+        wav_data_range(path)
+
+
+def peak_transcribe_bytes(audio_file, monkeypatch):
+    """기본 경로(_run_whisper)로 변환할 때 tracemalloc 최고 사용량"""
+    import transcript_pipeline
+    from transcript_pipeline import TranscriptPipeline
+
+    monkeypatch.setattr(transcript_pipeline, 'PARALLEL_WORKERS', 0)
+    monkeypatch.setattr(transcript_pipeline, 'CHECKPOINT', False)
+    monkeypatch.setattr(transcript_pipeline, 'STREAM_OUTPUT', False)
+    pipeline = TranscriptPipeline('base', 'cpu', simplify=False, formats=('txt',),
+                                  download_audio=None, setup=None, say=lambda text, level=None: None)
+    worker = FakeWorker()
+    tracemalloc.start()
+    try:
+        result = pipeline._run_whisper(str(audio_file), worker)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert len(result['segments']) == len(worker.windows) > 1
+    assert max(worker.windows) <= 30 * SAMPLE_RATE
+    return peak
+
+
+def test_default_transcribe_memory_does_not_grow_with_duration(write_pcm, monkeypatch):
+    short = write_pcm('short/audio.wav', np.zeros(240 * SAMPLE_RATE, np.float32))
+    long = write_pcm('long/audio.wav', np.zeros(960 * SAMPLE_RATE, np.float32))
+
+    short_peak = peak_transcribe_bytes(short, monkeypatch)
+    long_peak = peak_transcribe_bytes(long, monkeypatch)
+
+    # 음성 전체(float32 61 MB)를 올리지 않고, 에너지 계산 블록 · 디코딩 구간 하나 수준에 머묾
+    assert long_peak < 960 * SAMPLE_RATE * 4 / 4
+    assert long_peak < short_peak * 1.2
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""batch_transcribe: 단계별 실패 기록 · 요약 · 모델 미리 로드 실패"""
+
+from batch_transcribe import print_summary, read_urls, run_batch
+
+
+def download(url):
+    if url.endswith('nodl'):
+        return None
+    if url.endswith('raise'):
+        raise OSError("연결 끊김")
+    if url.endswith('cached'):
+        return {'txt': 'cached.txt'}
+    return url + '.wav'
+
+
+def transcribe(audio_file):
+    if 'badasr' in audio_file:
+        raise RuntimeError("디코딩 실패")
+    return {'text': audio_file}
+
+
+def postprocess(result, audio_file, url):
+    if 'badwrite' in url:
+        raise ValueError("쓰기 실패")
+    return {'txt': audio_file + '.txt'}
+
+
+def test_each_stage_failure_is_recorded():
+    urls = ['u/ok', 'u/nodl', 'u/raise', 'u/cached', 'u/badasr', 'u/badwrite']
+    results = run_batch(urls, download, transcribe, postprocess, download_workers=2)
+
+    by_url = {r.url: r for r in results}
+    assert [r.url for r in results] == urls
+    assert by_url['u/ok'].ok and by_url['u/ok'].outputs == {'txt': 'u/ok.wav.txt'}
+    assert (by_url['u/nodl'].stage, by_url['u/nodl'].error) == ('download', "음성 다운로드 실패")
+    assert (by_url['u/raise'].stage, by_url['u/raise'].error) == ('download', "연결 끊김")
+    assert by_url['u/cached'].ok and by_url['u/cached'].cached
+    assert (by_url['u/badasr'].stage, by_url['u/badasr'].error) == ('transcribe', "디코딩 실패")
+    assert (by_url['u/badwrite'].stage, by_url['u/badwrite'].error) == ('write', "쓰기 실패")
+
+
+def test_summary_reports_failure(capsys):
+    assert print_summary(run_batch(['u/ok', 'u/cached'], download, transcribe, postprocess)) is True
+    assert print_summary(run_batch(['u/ok', 'u/nodl'], download, transcribe, postprocess)) is False
+    out = capsys.readouterr().out
+    assert "실패 1" in out and "❌ u/nodl [download]" in out
+
+
+def test_warmup_failure_still_processes_and_summarizes(capsys):
+    def warmup():
+        raise RuntimeError("모델 없음")
+
+    results = run_batch(['u/ok', 'u/badasr'], download, transcribe, postprocess, warmup=warmup)
+
+    assert "모델 미리 로드 실패: 모델 없음" in capsys.readouterr().out
+    assert [r.ok for r in results] == [True, False]
+
+
+def test_read_urls_skips_comments(tmp_path):
+    path = tmp_path / 'urls.txt'
+    path.write_text("# 목록\nhttps://youtu.be/a\n\n  https://youtu.be/b  \n", encoding='utf-8')
+    assert read_urls(str(path)) == ['https://youtu.be/a', 'https://youtu.be/b']
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""convert_corpus: 병렬 일괄 변환 · 건너뛰기 · 매니페스트"""
+
+import json
+import os
+
+from convert_corpus import MANIFEST_NAME, convert_corpus, find_subtitles, main, output_path
+
+SRT = '1\n00:00:00,000 --> 00:00:01,000\n你好\n\n2\n00:00:01,000 --> 00:00:02,500\n世界\n'
+VTT = 'WEBVTT\n\n00:00.000 --> 00:01.000\n你好\n'
+
+
+def make_corpus(root):
+    (root / 'a').mkdir(parents=True)
+    (root / 'a' / 'one.srt').write_text(SRT, encoding='utf-8')
+    (root / 'a' / 'two.vtt').write_text(VTT, encoding='utf-8')
+    (root / 'b').mkdir()
+    (root / 'b' / 'three.srt').write_text(SRT, encoding='utf-8')
+    (root / 'b' / 'three.vtt').write_text(VTT, encoding='utf-8')  # 같은 이름의 SRT가 있어 제외
+    (root / '.hidden').mkdir()
+    (root / '.hidden' / 'skip.srt').write_text(SRT, encoding='utf-8')
+
+
+def test_find_subtitles(tmp_path):
+    make_corpus(tmp_path)
+    assert [p.relative_to(tmp_path).as_posix() for p in find_subtitles(tmp_path)] == [
+        'a/one.srt', 'a/two.vtt', 'b/three.srt']
+
+
+def test_converts_then_skips_unchanged(tmp_path):
+    make_corpus(tmp_path)
+    assert convert_corpus(tmp_path, workers=2) == (3, 0, 0)
+
+    one = tmp_path / 'a' / 'one.srt'
+    segments = json.loads(output_path(one, 'json').read_text(encoding='utf-8'))
+    assert [s['text'] for s in segments] == ['你好', '世界']
+    assert output_path(one, 'highlight').name == 'one_srt_highlight.json'
+    highlight = json.loads(output_path(one, 'highlight').read_text(encoding='utf-8'))
+    assert [w['char'] for w in highlight[1]['words']] == ['世', '界']
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding='utf-8'))
+    assert set(manifest['files']) == {'a/one.srt', 'a/two.vtt', 'b/three.srt'}
+
+    assert convert_corpus(tmp_path, workers=2) == (0, 3, 0)
+
+    # mtime만 바뀐 파일은 해시가 같아 건너뜀, 내용이 바뀐 파일만 다시 변환
+    future = one.stat().st_mtime + 100
+    os.utime(one, (future, future))
+    two = tmp_path / 'a' / 'two.vtt'
+    two.write_text(VTT.replace('你好', '再见'), encoding='utf-8')
+    os.utime(two, (future, future))
+    assert convert_corpus(tmp_path, workers=2) == (1, 2, 0)
+    assert '再见' in output_path(two, 'json').read_text(encoding='utf-8')
+
+    assert convert_corpus(tmp_path, kinds=('json',), force=True, workers=2) == (3, 0, 0)
+
+
+def test_failure_is_retried_and_deleted_inputs_leave_manifest(tmp_path):
+    make_corpus(tmp_path)
+    one = tmp_path / 'a' / 'one.srt'
+    # 결과 경로가 폴더라 쓰기 실패 (입력보다 오래되어 변환 대상)
+    output_path(one, 'json').mkdir()
+    os.utime(output_path(one, 'json'), (0, 0))
+
+    assert convert_corpus(tmp_path, workers=2) == (2, 0, 1)
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding='utf-8'))
+    assert 'hash' not in manifest['files']['a/one.srt']
+
+    output_path(one, 'json').rmdir()
+    (tmp_path / 'b' / 'three.srt').unlink()
+    (tmp_path / 'b' / 'three.vtt').unlink()
+    assert convert_corpus(tmp_path, workers=2) == (1, 1, 0)
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding='utf-8'))
+    assert set(manifest['files']) == {'a/one.srt', 'a/two.vtt'}
+
+
+def test_main_exit_code(tmp_path):
+    make_corpus(tmp_path)
+    assert main([str(tmp_path), '--to', 'highlight', '--workers', '1']) == 0
+    assert not output_path(tmp_path / 'a' / 'one.srt', 'json').exists()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""env_probe: import 없는 설치 확인과 상태 파일 재사용 · 무효화"""
+
+import sys
+
+import pytest
+
+import env_probe
+from env_probe import forget, missing_modules, probe_environment
+
+
+@pytest.fixture
+def fake_package(tmp_path, monkeypatch):
+    """import하면 표시가 남는 가짜 패키지"""
+    site = tmp_path / 'site'
+    package = site / 'probe_fake_pkg'
+    package.mkdir(parents=True)
+    (package / '__init__.py').write_text("import sys\nsys.probe_fake_imported = True\n", encoding='utf-8')
+    monkeypatch.syspath_prepend(str(site))
+    yield package
+    sys.modules.pop('probe_fake_pkg', None)
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    calls = []
+    find_module = env_probe.find_module
+
+    def counting(name):
+        calls.append(name)
+        return find_module(name)
+
+    monkeypatch.setattr(env_probe, 'find_module', counting)
+    return calls
+
+
+def test_finds_modules_without_importing(tmp_path, fake_package):
+    state = tmp_path / 'env_state.json'
+    found = probe_environment(['probe_fake_pkg', 'probe_missing_pkg'], state_file=state)
+
+    assert found['modules']['probe_fake_pkg'] == str(fake_package / '__init__.py')
+    assert found['modules']['probe_missing_pkg'] is None
+    assert 'probe_fake_pkg' not in sys.modules and not hasattr(sys, 'probe_fake_imported')
+    assert missing_modules(['probe_fake_pkg', 'probe_missing_pkg'], state_file=state) == ['probe_missing_pkg']
+
+
+def test_recorded_paths_are_reused_until_they_disappear(tmp_path, fake_package, counted):
+    state = tmp_path / 'env_state.json'
+    probe_environment(['probe_fake_pkg'], state_file=state)
+    assert state.exists() and counted == ['probe_fake_pkg']
+
+    probe_environment(['probe_fake_pkg'], state_file=state)
+    assert counted == ['probe_fake_pkg']  # 기록된 경로가 있으면 다시 찾지 않음
+
+    (fake_package / '__init__.py').unlink()
+    fake_package.rmdir()
+    assert probe_environment(['probe_fake_pkg'], state_file=state)['modules']['probe_fake_pkg'] is None
+    assert counted == ['probe_fake_pkg'] * 2
+
+
+def test_changed_path_invalidates_state(tmp_path, fake_package, counted, monkeypatch):
+    state = tmp_path / 'env_state.json'
+    probe_environment(['probe_fake_pkg'], state_file=state)
+    monkeypatch.setenv('PATH', str(tmp_path))
+    probe_environment(['probe_fake_pkg'], state_file=state)
+    assert counted == ['probe_fake_pkg'] * 2
+
+
+def test_ffmpeg_is_found_on_path_without_running_it(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    ffmpeg = bin_dir / 'ffmpeg'
+    ffmpeg.write_text("#!/bin/sh\ntouch \"$0.ran\"\n", encoding='utf-8')
+    ffmpeg.chmod(0o755)
+    monkeypatch.setenv('PATH', str(bin_dir))
+    state = tmp_path / 'env_state.json'
+
+    assert probe_environment(ffmpeg=True, state_file=state)['ffmpeg'] == str(ffmpeg)
+    assert not (bin_dir / 'ffmpeg.ran').exists()
+
+    ffmpeg.unlink()
+    assert probe_environment(ffmpeg=True, state_file=state)['ffmpeg'] is None
+
+
+def test_corrupt_state_and_forget(tmp_path, fake_package):
+    state = tmp_path / 'env_state.json'
+    state.write_text('{not json', encoding='utf-8')
+    assert probe_environment(['probe_fake_pkg'], state_file=state)['modules']['probe_fake_pkg']
+
+    forget(state_file=state)
+    assert not state.exists()
+    forget(state_file=state)  # 없어도 오류 없음
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""ffmpeg_bootstrap: 로컬 HTTP 서버로 스트리밍 다운로드 · 압축 해제 · 체크섬 확인"""
+
+import io
+import json
+import lzma
+import tarfile
+import hashlib
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import ffmpeg_bootstrap
+from ffmpeg_bootstrap import cached_ffmpeg_dir, install_ffmpeg
+
+FFMPEG = b'#!/bin/sh\necho ffmpeg\n' + bytes(range(256)) * 300
+FFPROBE = b'#!/bin/sh\necho ffprobe\n' + b'probe' * 5000
+README = b'not extracted\n' * 100
+
+
+class _Unseekable(io.RawIOBase):
+    """tell · seek이 없는 출력 (zipfile이 데이터 설명자를 쓰게 함)"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+
+def make_tar_xz():
+    raw = io.BytesIO()
+    with tarfile.open(fileobj=raw, mode='w') as tar:
+        for name, data in (('ffmpeg-7.0-static/readme.txt', README),
+                           ('ffmpeg-7.0-static/ffmpeg', FFMPEG),
+                           ('ffmpeg-7.0-static/ffprobe', FFPROBE)):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return lzma.compress(raw.getvalue())
+
+
+def make_zip(data_descriptor=False):
+    out = _Unseekable() if data_descriptor else io.BytesIO()
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('ffmpeg-win64/doc/readme.txt', README)
+        archive.writestr('ffmpeg-win64/bin/', b'')
+        archive.writestr('ffmpeg-win64/bin/ffmpeg', FFMPEG)
+        archive.writestr('ffmpeg-win64/bin/ffprobe', FFPROBE)
+    return bytes(out.buffer) if data_descriptor else out.getvalue()
+
+
+@pytest.fixture
+def server():
+    """경로 → 바이트를 돌려주는 로컬 HTTP 서버 (요청 수 기록)"""
+    files = {}
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            data = files.get(self.path)
+            if data is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            # 작은 조각으로 나눠 보내 스트리밍 경계를 시험
+            for start in range(0, len(data), 4096):
+                self.wfile.write(data[start:start + 4096])
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    def publish(name, data):
+        files['/' + name] = data
+        return f"http://127.0.0.1:{httpd.server_port}/{name}"
+
+    publish.requests = requests
+    try:
+        yield publish
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.mark.parametrize('name, archive', [
+    ('ffmpeg-release-amd64-static.tar.xz', make_tar_xz),
+    ('ffmpeg-master-latest-win64-gpl.zip', make_zip),
+    ('ffmpeg-descriptor.zip', lambda: make_zip(data_descriptor=True)),
+])
+def test_install_extracts_binaries_and_records_checksum(server, tmp_path, name, archive):
+    data = archive()
+    url = server(name, data)
+    digest = sha256(data)
+
+    bin_dir = install_ffmpeg(url, cache_dir=tmp_path, expected_sha256=digest)
+
+    assert (bin_dir / 'ffmpeg').read_bytes() == FFMPEG
+    assert (bin_dir / 'ffprobe').read_bytes() == FFPROBE
+    assert sorted(p.name for p in bin_dir.iterdir()) == ['ffmpeg', 'ffprobe']
+    manifest = json.loads((bin_dir.parent / 'manifest.json').read_text(encoding='utf-8'))
+    assert manifest['sha256'] == digest
+    assert manifest['verified'] is True
+    assert manifest['size'] == len(data)
+    assert cached_ffmpeg_dir(url, tmp_path) == bin_dir
+
+
+def test_data_descriptor_zip_really_uses_descriptors():
+    data = make_zip(data_descriptor=True)
+    flags = int.from_bytes(data[6:8], 'little')
+    assert flags & 0x8
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_second_install_uses_cache_without_download(server, tmp_path, monkeypatch):
+    data = make_tar_xz()
+    url = server('ffmpeg.tar.xz', data)
+    monkeypatch.setenv('FFMPEG_SHA256', sha256(data).upper())
+    first = install_ffmpeg(url, cache_dir=tmp_path)
+    second = install_ffmpeg(url, cache_dir=tmp_path)
+    assert first == second
+    assert len(server.requests) == 1
+    # 체크섬 없이 찾으면 이 주소로 검증해 설치한 폴더
+    monkeypatch.delenv('FFMPEG_SHA256')
+    assert cached_ffmpeg_dir(url, tmp_path) == first
+
+
+def test_refuses_to_install_without_checksum(server, tmp_path, monkeypatch):
+    monkeypatch.delenv('FFMPEG_SHA256', raising=False)
+    url = server('ffmpeg.tar.xz', make_tar_xz())
+
+    with pytest.raises(RuntimeError, match='FFMPEG_SHA256'):
+        install_ffmpeg(url, cache_dir=tmp_path)
+    assert server.requests == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_new_release_at_same_url_installs_again(server, tmp_path):
+    old = make_tar_xz()
+    url = server('ffmpeg-release-amd64-static.tar.xz', old)
+    first = install_ffmpeg(url, cache_dir=tmp_path, expected_sha256=sha256(old))
+
+    # "latest" 주소의 내용이 바뀌고 새 체크섬을 지정하면 캐시를 쓰지 않고 새로 설치
+    new = make_zip()
+    url = server('ffmpeg-release-amd64-static.tar.xz', new)
+    second = install_ffmpeg(url, cache_dir=tmp_path, expected_sha256=sha256(new))
+
+    assert first != second and first.exists() and second.exists()
+    assert len(server.requests) == 2
+    assert cached_ffmpeg_dir(url, tmp_path, sha256(old)) == first
+
+
+def test_checksum_mismatch_leaves_nothing_installed(server, tmp_path):
+    url = server('ffmpeg.zip', make_zip())
+
+    with pytest.raises(ValueError, match='체크섬'):
+        install_ffmpeg(url, cache_dir=tmp_path, expected_sha256='0' * 64)
+
+    assert cached_ffmpeg_dir(url, tmp_path) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_archive_without_ffmpeg_is_rejected(server, tmp_path):
+    raw = io.BytesIO()
+    with zipfile.ZipFile(raw, 'w') as archive:
+        archive.writestr('readme.txt', README)
+    url = server('empty.zip', raw.getvalue())
+
+    with pytest.raises(ValueError, match='ffmpeg'):
+        install_ffmpeg(url, cache_dir=tmp_path, expected_sha256=sha256(raw.getvalue()))
+    assert cached_ffmpeg_dir(url, tmp_path) is None
+
+
+def test_corrupt_zip_member_fails_crc(server, tmp_path):
+    data = bytearray(make_zip())
+    # 저장된 ffmpeg 항목의 CRC를 바꿔 내용 검증이 실패하게 함
+    offset = data.index(b'ffmpeg-win64/bin/ffmpeg') - 30
+    data[offset + 14] ^= 0xFF
+    url = server('corrupt.zip', bytes(data))
+
+    with pytest.raises(ValueError, match='CRC'):
+        install_ffmpeg(url, cache_dir=tmp_path, expected_sha256=sha256(bytes(data)))
+
+
+def test_install_dir_is_per_checksum(tmp_path):
+    url = 'http://example.invalid/a/ffmpeg-release.tar.xz'
+    a = ffmpeg_bootstrap.install_dir(url, 'a' * 64, tmp_path)
+    b = ffmpeg_bootstrap.install_dir(url, 'b' * 64, tmp_path)
+    assert a != b
+    assert a.name == 'ffmpeg-release-' + 'a' * 12
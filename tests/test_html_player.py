@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""html_player: 플레이어 페이지 · 공용 번들 위치 · 라이브러리 갱신"""
+
+import json
+import multiprocessing
+import threading
+
+import pytest
+
+from html_player import (
+    ASSETS_DIRNAME, INDEX_FILE, LIBRARY_FILE, PLAYER_CSS_NAME, PLAYER_JS_NAME,
+    cues_path_for, ensure_assets, js_string, read_cues_info, render_cue, render_head, render_tail,
+    scan_library, update_library, write_player_page,
+)
+
+
+def make_page(folder, cues=((0.0, 1.5, '你好'), (1.5, 3.25, '世界')), assets_root=None):
+    """자막 데이터 파일과 플레이어 페이지 생성 → 페이지 경로"""
+    folder.mkdir(parents=True, exist_ok=True)
+    html_file = folder / 'audio_highlight.html'
+    cues_file = cues_path_for(html_file)
+    body = render_head(folder / 'audio.wav')
+    for start, end, text in cues:
+        body += render_cue({'start': start, 'end': end, 'text': text})
+    body += render_tail(len(cues), cues[-1][1] if cues else 0.0)
+    cues_file.write_text(body, encoding='utf-8')
+    return write_player_page(html_file, cues_file, assets_root)
+
+
+def test_js_string_escapes_script_end():
+    assert js_string('</script><b>"中"') == '"<\\/script><b>\\"中\\""'
+
+
+def test_cues_file_round_trip(tmp_path):
+    html_file = make_page(tmp_path / 'vid')
+    cues_file = cues_path_for(html_file)
+    assert cues_file.name == 'audio_highlight.cues.js'
+    text = cues_file.read_text(encoding='utf-8')
+    assert text.startswith('SubtitlePlayer.register({"audio": "audio.wav", "type": "audio/wav"')
+    assert '[1.5, 3.25, "世界"]' in text
+    assert read_cues_info(cues_file) == (2, 3.25)
+
+
+def test_assets_default_next_to_page(tmp_path):
+    # 예전처럼 페이지의 상위 폴더(/tmp/player)에 번들을 만들지 않음
+    html_file = make_page(tmp_path / 'rv')
+    assert (tmp_path / 'rv' / ASSETS_DIRNAME / PLAYER_JS_NAME).exists()
+    assert not (tmp_path / ASSETS_DIRNAME).exists()
+    page = html_file.read_text(encoding='utf-8')
+    assert f'href="player/{PLAYER_CSS_NAME}"' in page
+    assert 'src="audio_highlight.cues.js"' in page
+
+
+def test_assets_under_explicit_root(tmp_path):
+    html_file = make_page(tmp_path / 'output' / 'vid', assets_root=tmp_path / 'output')
+    assert not (tmp_path / 'output' / 'vid' / ASSETS_DIRNAME).exists()
+    assert f'src="../player/{PLAYER_JS_NAME}"' in html_file.read_text(encoding='utf-8')
+
+
+def test_bundle_is_versioned_and_written_once(tmp_path):
+    css_file, js_file = ensure_assets(tmp_path)
+    assert css_file.name == PLAYER_CSS_NAME and js_file.name == PLAYER_JS_NAME
+    assert 'SubtitlePlayer' in js_file.read_text(encoding='utf-8')
+    mtime = js_file.stat().st_mtime_ns
+    assert ensure_assets(tmp_path) == (css_file, js_file)
+    assert js_file.stat().st_mtime_ns == mtime
+
+
+def test_legacy_helper_keeps_assets_next_to_srt(tmp_path, monkeypatch):
+    from youtube_to_transcript import create_subtitle_highlight_html
+
+    monkeypatch.chdir(tmp_path)
+    folder = tmp_path / 'rv'
+    folder.mkdir()
+    srt_file = folder / 'x.srt'
+    srt_file.write_text('1\n00:00:00,000 --> 00:00:01,000\n你好\n', encoding='utf-8')
+
+    html_file = create_subtitle_highlight_html(str(srt_file), str(folder / 'x.wav'))
+
+    assert html_file == folder / 'x_highlight.html'
+    assert (folder / ASSETS_DIRNAME / PLAYER_JS_NAME).exists()
+    assert not (tmp_path / ASSETS_DIRNAME).exists()
+    # 라이브러리 함수는 측정값 파일을 만들지 않음
+    assert not (tmp_path / 'output').exists()
+
+
+def test_library_adds_entries_and_drops_deleted(tmp_path):
+    root = tmp_path / 'output'
+    first = make_page(root / 'aaaaaaaaaaa', assets_root=root)
+    second = make_page(root / 'bbbbbbbbbbb', cues=((0.0, 9.0, '一'),), assets_root=root)
+
+    # 라이브러리 파일이 없으면 출력 폴더 전체를 훑음
+    index = update_library(root, first)
+    assert index == root / INDEX_FILE
+    entries = json.loads((root / ASSETS_DIRNAME / LIBRARY_FILE).read_text(encoding='utf-8'))
+    assert [(e['id'], e['count'], e['duration']) for e in entries] == [
+        ('aaaaaaaaaaa', 2, 3.25), ('bbbbbbbbbbb', 1, 9.0)]
+    assert entries[0]['html'] == 'aaaaaaaaaaa/audio_highlight.html'
+    assert '(2개 영상)' in index.read_text(encoding='utf-8')
+    assert set(scan_library(root)) == {e['html'] for e in entries}
+
+    second.unlink()
+    update_library(root)
+    entries = json.loads((root / ASSETS_DIRNAME / LIBRARY_FILE).read_text(encoding='utf-8'))
+    assert [e['id'] for e in entries] == ['aaaaaaaaaaa']
+
+
+def _add_pages(root, names):
+    for name in names:
+        update_library(root, make_page(root / name, assets_root=root))
+
+
+def test_concurrent_library_updates_keep_every_entry(tmp_path):
+    root = tmp_path / 'output'
+    update_library(root, make_page(root / 'seed', assets_root=root))
+    names = [[f'p{p}v{n}' for n in range(5)] for p in range(4)]
+
+    try:
+        context = multiprocessing.get_context('fork')
+    except ValueError:
+        pytest.skip("fork를 지원하지 않는 플랫폼")
+    processes = [context.Process(target=_add_pages, args=(root, group)) for group in names[:2]]
+    threads = [threading.Thread(target=_add_pages, args=(root, group)) for group in names[2:]]
+    for worker in processes + threads:
+        worker.start()
+    for worker in processes + threads:
+        worker.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    entries = json.loads((root / ASSETS_DIRNAME / LIBRARY_FILE).read_text(encoding='utf-8'))
+    assert sorted(e['id'] for e in entries) == sorted(['seed'] + [n for group in names for n in group])
+
+
+# 플레이어 스크립트를 node에서 돌리는 최소 DOM (가상 목록 · 현재 자막 탐색 · destroy 확인용)
+FAKE_DOM = r'''
+class Element {
+    constructor(tag) {
+        this.tagName = tag; this.children = []; this.parent = null; this.style = {}; this.dataset = {};
+        this.listeners = []; this.classes = new Set(); this.scrollTop = 0; this.clientHeight = 480;
+        this.textContent = ''; this.roles = {};
+        this.classList = {
+            add: (c) => this.classes.add(c), remove: (c) => this.classes.delete(c),
+            contains: (c) => this.classes.has(c),
+        };
+    }
+    set className(value) { this.classes = new Set(value.split(' ').filter(Boolean)); }
+    set innerHTML(html) {
+        this.children = []; this.roles = {};
+        for (const match of html.matchAll(/data-role="([a-z-]+)"/g)) { this.roles[match[1]] = new Element('div'); }
+        this.audio = new Element('audio');
+        Object.assign(this.audio, { currentTime: 0, duration: 0, paused: true, load() {}, pause() { this.paused = true; },
+                                    play() { this.paused = false; return Promise.resolve(); } });
+    }
+    querySelector(selector) {
+        if (selector === 'audio') { return this.audio; }
+        return this.roles[/data-role="([a-z-]+)"/.exec(selector)[1]];
+    }
+    appendChild(child) { child.parent = this; this.children.push(child); return child; }
+    remove() { this.parent.children = this.parent.children.filter((child) => child !== this); this.parent = null; }
+    addEventListener(type, fn, options) { this.listeners.push({ type, fn, signal: options && options.signal }); }
+    dispatch(type) {
+        for (const l of this.listeners) { if (l.type === type && !(l.signal && l.signal.aborted)) { l.fn({ target: this }); } }
+    }
+    scrollTo({ top }) { this.scrollTop = Math.max(0, top); this.dispatch('scroll'); }
+}
+global.window = { addEventListener() {} };
+global.document = { createElement: (tag) => new Element(tag), head: new Element('head'), body: new Element('body') };
+global.requestAnimationFrame = (fn) => fn();
+'''
+
+PLAYER_CHECK = r'''
+const cues = [];
+let t = 0;
+for (let i = 0; i < 20000; i++) {
+    const start = t + (i % 7 === 0 ? 1.5 : 0);  // 가끔 자막 사이에 빈 구간
+    cues.push([start, start + 2, '字' + i]);
+    t = start + 2;
+}
+const root = new Element('div');
+const player = SubtitlePlayer.mount(root, { audio: 'audio.wav', type: 'audio/wav', cues }, '');
+const audio = root.audio;
+const spacer = root.roles['spacer'];
+const container = root.roles['container'];
+
+function expected(time) {
+    for (let i = cues.length - 1; i >= 0; i--) {
+        if (cues[i][0] <= time) { return time <= cues[i][1] ? i : -1; }
+    }
+    return -1;
+}
+function active() {
+    const row = spacer.children.find((row) => row.classes.has('active'));
+    return row ? Number(row.dataset.index) : -1;
+}
+
+let maxRows = spacer.children.length;
+let mismatches = 0;
+let seed = 7;
+const times = [];
+for (let k = 0; k < 300; k++) { seed = (seed * 1103515245 + 12345) % 2147483648; times.push(seed / 2147483648 * t); }
+for (let k = 0; k < 300; k++) { times.push(100 + k * 0.25); }  // 순서대로 재생 (마지막 위치 캐시)
+for (const i of [0, 1, 6, 7, 8, 5000, 19999]) { times.push(cues[i][0]); }  // 자막 시작 시각 경계
+times.push(-1, 0, t + 5);
+for (const time of times) {
+    audio.currentTime = time;
+    audio.dispatch('timeupdate');
+    maxRows = Math.max(maxRows, spacer.children.length);
+    if (active() !== expected(time)) { mismatches++; }
+}
+
+player.destroy();
+audio.currentTime = cues[5][0] + 0.1;
+const before = container.scrollTop;
+audio.dispatch('timeupdate');
+console.log(JSON.stringify({ cues: cues.length, maxRows, mismatches, checked: times.length,
+                             spacerHeight: spacer.style.height, scrolledAfterDestroy: container.scrollTop !== before }));
+'''
+
+
+def test_player_virtual_list_and_cue_search(tmp_path):
+    import shutil
+    import subprocess
+
+    from html_player import PLAYER_JS
+
+    node = shutil.which('node')
+    if node is None:
+        pytest.skip("node가 없어 플레이어 스크립트를 실행할 수 없음")
+    script = tmp_path / 'check.js'
+    script.write_text(FAKE_DOM + PLAYER_JS + 'const SubtitlePlayer = window.SubtitlePlayer;\n' + PLAYER_CHECK,
+                      encoding='utf-8')
+
+    result = json.loads(subprocess.run([node, str(script)], check=True, capture_output=True,
+                                       text=True, timeout=60).stdout)
+
+    assert result['mismatches'] == 0 and result['checked'] == 610
+    # 2만 개 자막이어도 보이는 행 + 여유분만 그림
+    assert result['maxRows'] <= 480 // 96 + 2 * 6 + 2
+    assert result['spacerHeight'] == f"{result['cues'] * 96 + 10}px"
+    assert result['scrolledAfterDestroy'] is False
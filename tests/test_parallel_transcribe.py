@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""parallel_transcribe: 무음 지점 분할 계획 · 에너지 계산 · 결과 이어 붙이기"""
+
+import pytest
+
+import parallel_transcribe
+from audio_io import SAMPLE_RATE
+from parallel_transcribe import frame_energy_db, plan_chunks, stitch_results
+
+np = pytest.importorskip('numpy')
+
+
+def speech_with_pauses(seconds, pauses):
+    """잡음 신호에 pauses(초) 위치마다 1초 무음을 넣은 음성"""
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-0.5, 0.5, seconds * SAMPLE_RATE).astype(np.float32)
+    for pause in pauses:
+        audio[int(pause * SAMPLE_RATE):int((pause + 1) * SAMPLE_RATE)] = 0.0
+    return audio
+
+
+def test_short_audio_is_one_chunk():
+    audio = np.zeros(10 * SAMPLE_RATE, np.float32)
+    assert plan_chunks(audio, min_seconds=5, max_seconds=10) == [(0, len(audio))]
+
+
+def test_chunks_cut_in_silence_within_limits():
+    audio = speech_with_pauses(100, pauses=[17, 41, 63, 88])
+    chunks = plan_chunks(audio, min_seconds=10, max_seconds=30)
+
+    # 빈틈없이 전체를 덮음
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(audio)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    for start, end in chunks[:-1]:
+        assert 10 * SAMPLE_RATE <= end - start <= 30 * SAMPLE_RATE
+    # 자른 지점은 무음 안
+    for _, cut in chunks[:-1]:
+        assert np.all(audio[cut:cut + 160] == 0)
+
+
+def test_energy_does_not_depend_on_block_size(monkeypatch):
+    audio = speech_with_pauses(20, pauses=[5])
+    whole = frame_energy_db(audio)
+    monkeypatch.setattr(parallel_transcribe, 'ENERGY_BLOCK_FRAMES', 7)
+    assert np.allclose(frame_energy_db(audio), whole)
+    assert len(whole) == len(audio) // int(SAMPLE_RATE * parallel_transcribe.FRAME_SECONDS)
+    assert whole.min() < -100 < whole.max()
+
+
+def test_stitch_results_shifts_and_renumbers():
+    chunk_results = [
+        {'text': '甲乙', 'language': 'zh', 'segments': [
+            {'id': 0, 'start': 0.0, 'end': 1.0, 'text': '甲', 'words': []},
+            {'id': 1, 'start': 1.0, 'end': 2.0, 'text': '乙',
+             'words': [{'word': '乙', 'start': 1.0, 'end': 2.0}]},
+        ]},
+        {'text': '丙', 'language': None, 'segments': [
+            {'id': 0, 'start': 0.5, 'end': 1.5, 'text': '丙',
+             'words': [{'word': '丙', 'start': 0.5, 'end': 1.5}]},
+        ]},
+    ]
+    result = stitch_results(chunk_results, [0.0, 30.0])
+
+    assert result['text'] == '甲乙丙' and result['language'] == 'zh'
+    assert [s['id'] for s in result['segments']] == [0, 1, 2]
+    assert [(s['start'], s['end']) for s in result['segments']] == [(0.0, 1.0), (1.0, 2.0), (30.5, 31.5)]
+    assert result['segments'][2]['words'][0]['start'] == 30.5
+    # 원본 조각 결과는 바뀌지 않음
+    assert chunk_results[1]['segments'][0]['start'] == 0.5
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""pipeline_metrics: 단계 기록 · 단계별 최대 RSS · 기록 파일 돌려 쓰기 · Prometheus 출력"""
+
+import json
+import sys
+
+import pytest
+
+import pipeline_metrics
+from pipeline_metrics import render_prometheus, set_tags, stage
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    """모듈 전역 합계 · 태그를 테스트마다 비우고, 기본은 파일 기록 안 함"""
+    monkeypatch.setattr(pipeline_metrics, '_totals', {})
+    monkeypatch.setattr(pipeline_metrics, '_last_rtf', {})
+    monkeypatch.setattr(pipeline_metrics, 'METRIC_TAGS', {})
+    monkeypatch.setattr(pipeline_metrics, 'METRICS_FILE', '')
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_file_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with stage('setup'):
+        pass
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stage_record_fields(tmp_path, monkeypatch):
+    path = tmp_path / 'metrics.jsonl'
+    monkeypatch.setattr(pipeline_metrics, 'METRICS_FILE', str(path))
+    set_tags(model='base', device='cpu')
+
+    with stage('transcribe', video_id='abc', ignored=None) as metrics:
+        metrics.bytes_in = 100
+        metrics.audio_seconds = 10.0
+        metrics.extra['windows'] = 3
+    with stage('download') as metrics:
+        metrics.failed = True
+    with pytest.raises(RuntimeError):
+        with stage('write'):
+            raise RuntimeError("실패")
+
+    first, second, third = read_records(path)
+    assert first['stage'] == 'transcribe' and first['ok'] is True
+    assert (first['model'], first['device'], first['video_id']) == ('base', 'cpu', 'abc')
+    assert 'ignored' not in first
+    assert first['bytes_in'] == 100 and first['windows'] == 3
+    assert first['audio_seconds'] == 10.0
+    assert first['real_time_factor'] == pytest.approx(first['wall_seconds'] / 10.0, abs=1e-3)
+    assert second['ok'] is False and third['ok'] is False
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="VmHWM은 Linux 전용")
+def test_peak_rss_is_per_stage(tmp_path, monkeypatch):
+    if not pipeline_metrics.reset_peak_rss():
+        pytest.skip("/proc/self/clear_refs에 쓸 수 없음")
+    path = tmp_path / 'metrics.jsonl'
+    monkeypatch.setattr(pipeline_metrics, 'METRICS_FILE', str(path))
+    size = 200 * 1024 * 1024
+
+    with stage('big'):
+        buffer = bytearray(size)  # 0이 아닌 값으로 채워 실제로 페이지를 씀
+        buffer[::4096] = b'\1' * len(range(0, size, 4096))
+        del buffer
+    with stage('small'):
+        pass
+    with stage('outer'):
+        with stage('inner'):
+            pass
+
+    big, small, inner, outer = read_records(path)
+    assert big['peak_rss_scope'] == small['peak_rss_scope'] == outer['peak_rss_scope'] == 'stage'
+    assert inner['peak_rss_scope'] == 'shared'
+    # 앞 단계의 최고치가 다음 단계에 남지 않음
+    assert big['peak_rss_bytes'] - small['peak_rss_bytes'] > size // 2
+    # 프로세스 최대값은 되돌린 뒤에도 유지
+    assert pipeline_metrics.peak_rss_bytes() >= big['peak_rss_bytes']
+
+
+def test_falls_back_to_process_peak(tmp_path, monkeypatch):
+    path = tmp_path / 'metrics.jsonl'
+    monkeypatch.setattr(pipeline_metrics, 'METRICS_FILE', str(path))
+    monkeypatch.setattr(pipeline_metrics, 'reset_peak_rss', lambda: False)
+    with stage('setup'):
+        pass
+    record, = read_records(path)
+    assert record['peak_rss_scope'] == 'process'
+    assert record['peak_rss_bytes'] is None or record['peak_rss_bytes'] <= pipeline_metrics.peak_rss_bytes()
+
+
+def test_file_rotates_at_size_limit(tmp_path, monkeypatch):
+    path = tmp_path / 'metrics.jsonl'
+    monkeypatch.setattr(pipeline_metrics, 'METRICS_FILE', str(path))
+    monkeypatch.setattr(pipeline_metrics, 'METRICS_MAX_BYTES', 600)
+
+    for n in range(10):
+        with stage(f'step{n}'):
+            pass
+
+    rotated = path.with_name('metrics.jsonl.1')
+    assert rotated.exists()
+    assert path.stat().st_size < 2 * 600
+    current = [r['stage'] for r in read_records(path)]
+    assert current[-1] == 'step9'
+    assert sorted(tmp_path.iterdir()) == [path, rotated]
+
+
+def test_prometheus_totals():
+    set_tags(model='base', device='cpu')
+    for audio in (10.0, 20.0):
+        with stage('transcribe') as metrics:
+            metrics.bytes_out = 5
+            metrics.audio_seconds = audio
+    with stage('download') as metrics:
+        metrics.failed = True
+
+    text = render_prometheus()
+    assert 'transcript_stage_runs_total{stage="transcribe",model="base",device="cpu"} 2' in text
+    assert 'transcript_stage_bytes_out_total{stage="transcribe",model="base",device="cpu"} 10' in text
+    assert 'transcript_stage_audio_seconds_total{stage="transcribe",model="base",device="cpu"} 30.0' in text
+    assert 'transcript_stage_failures_total{stage="download",model="base",device="cpu"} 1' in text
+    assert 'transcript_real_time_factor{model="base",device="cpu"}' in text
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""pipeline_profile: 단계별 cProfile · tracemalloc 결과 저장과 플레임 그래프"""
+
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import pipeline_metrics
+import pipeline_profile
+from pipeline_metrics import stage
+from pipeline_profile import enable_profiling, render_flame_svg
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """훅 목록과 프로파일러 상태를 테스트마다 비움"""
+    monkeypatch.setattr(pipeline_metrics, '_stage_hooks', [])
+    monkeypatch.setattr(pipeline_metrics, '_totals', {})
+    monkeypatch.setattr(pipeline_metrics, 'METRICS_FILE', '')
+    monkeypatch.setattr(pipeline_profile, 'PROFILE', '')
+    monkeypatch.setattr(pipeline_profile, '_names', {})
+    monkeypatch.setattr(pipeline_profile, '_profiler_busy', False)
+    monkeypatch.setattr(pipeline_profile, '_tracemalloc_users', 0)
+    monkeypatch.setattr(pipeline_profile, '_tracemalloc_owned', False)
+
+
+def allocate():
+    return [str(n) * 10 for n in range(2000)]
+
+
+def test_disabled_by_default():
+    assert enable_profiling() is None
+    assert enable_profiling('0') is None
+    assert pipeline_metrics._stage_hooks == []
+
+
+def test_stage_results_are_saved_per_video_and_run(tmp_path):
+    root = enable_profiling(str(tmp_path))
+    run_id = pipeline_profile._run_id
+
+    with stage('setup'):
+        allocate()
+    with stage('transcribe', video_id='abcdefghijk'):
+        allocate()
+    with stage('transcribe', video_id='abcdefghijk'):
+        allocate()
+
+    assert root == tmp_path
+    shared = tmp_path / 'profile' / run_id
+    assert sorted(p.name for p in shared.iterdir()) == ['setup.prof', 'setup.txt']
+    video = tmp_path / 'abcdefghijk' / 'profile' / run_id
+    assert sorted(p.name for p in video.iterdir()) == [
+        'transcribe-2-memory.txt', 'transcribe-2.prof', 'transcribe-2.txt',
+        'transcribe-memory.txt', 'transcribe.prof', 'transcribe.txt',
+    ]
+    assert 'allocate' in (video / 'transcribe.txt').read_text(encoding='utf-8')
+    # 단계 안에서 할당한 위치가 메모리 기록에 남음
+    assert 'test_pipeline_profile.py' in (video / 'transcribe-memory.txt').read_text(encoding='utf-8')
+    assert not tracemalloc.is_tracing()
+
+
+def test_overlapping_stages_share_profiler_and_tracemalloc(tmp_path):
+    enable_profiling(str(tmp_path))
+
+    with stage('transcribe', video_id='v1'):
+        with stage('write', video_id='v2'):
+            allocate()
+        # 안쪽 단계가 끝나도 바깥 단계의 추적은 계속됨
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+    run = pipeline_profile._run_id
+    # cProfile은 먼저 시작한 단계만, 메모리는 두 단계 모두 기록
+    assert (tmp_path / 'v1' / 'profile' / run / 'transcribe.prof').exists()
+    assert sorted(p.name for p in (tmp_path / 'v2' / 'profile' / run).iterdir()) == ['write-memory.txt']
+
+
+def test_external_tracemalloc_is_left_running(tmp_path):
+    enable_profiling(str(tmp_path))
+    tracemalloc.start()
+    try:
+        with stage('write', video_id='v1'):
+            allocate()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_flame_graph_is_written(tmp_path):
+    enable_profiling(str(tmp_path), flame=True)
+
+    with stage('setup'):
+        deadline = time.perf_counter() + 0.2
+        while time.perf_counter() < deadline:
+            allocate()
+
+    directory = tmp_path / 'profile' / pipeline_profile._run_id
+    folded = (directory / 'setup.folded').read_text(encoding='utf-8').splitlines()
+    assert folded and all(line.rsplit(' ', 1)[1].isdigit() for line in folded)
+    assert any('allocate (test_pipeline_profile.py' in line for line in folded)
+    ET.fromstring((directory / 'setup-flame.svg').read_text(encoding='utf-8'))
+
+
+def test_render_flame_svg():
+    svg = render_flame_svg({('main', 'decode'): 3, ('main', 'write <&>'): 1}, 'transcribe')
+    tree = ET.fromstring(svg)
+    titles = [t.text for t in tree.iter('{http://www.w3.org/2000/svg}title')]
+    assert titles == ['main (4개, 100.0%)', 'decode (3개, 75.0%)', 'write <&> (1개, 25.0%)']
+    assert render_flame_svg({}, 'empty').startswith('<svg')
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""subtitle_parser: SRT/VTT 스트리밍 파싱"""
+
+import pytest
+
+from subtitle_parser import format_ms, iter_cues, parse_timestamp, read_cues
+
+
+def cues_of(text):
+    return [(c.index, c.start_ms, c.end_ms, c.text) for c in iter_cues(text.splitlines(keepends=True))]
+
+
+@pytest.mark.parametrize('value, ms', [
+    ('00:00:01,500', 1500),
+    ('01:02:03.004', 3723004),
+    ('02:03.4', 123400),
+    ('00:00:05', 5000),
+])
+def test_parse_timestamp(value, ms):
+    assert parse_timestamp(value) == ms
+
+
+def test_parse_timestamp_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_timestamp('12')
+
+
+def test_format_ms_round_trip():
+    for ms in (0, 999, 61001, 3723004):
+        assert parse_timestamp(format_ms(ms)) == ms
+        assert parse_timestamp(format_ms(ms, '.')) == ms
+    assert format_ms(3723004) == '01:02:03,004'
+
+
+def test_srt_with_bom_crlf_and_multiline():
+    text = ('\ufeff1\r\n00:00:00,000 --> 00:00:01,200\r\n第一行\r\n第二行\r\n\r\n'
+            '2\r\n00:00:01,500 --> 00:00:03,000\r\n你好\r\n')
+    assert cues_of(text) == [
+        (1, 0, 1200, '第一行\n第二行'),
+        (2, 1500, 3000, '你好'),
+    ]
+
+
+def test_srt_without_numbers_and_extra_blank_lines():
+    text = '\n\n00:00:00,000 --> 00:00:01,000\n甲\n\n\n\n00:00:02,000 --> 00:00:03,000\n乙\n'
+    assert cues_of(text) == [(1, 0, 1000, '甲'), (2, 2000, 3000, '乙')]
+
+
+def test_invalid_block_is_skipped():
+    text = ('1\n00:00:00,000 --> 00:00:01,000\n好\n\n'
+            '2\nxx:yy --> 00:00:02,000\n坏\n\n'
+            '3\n00:00:02,000 --> 00:00:03,000\n也好\n')
+    assert [c[3] for c in cues_of(text)] == ['好', '也好']
+
+
+def test_vtt_header_notes_styles_and_settings():
+    text = ('WEBVTT - 제목\nKind: captions\n\n'
+            'NOTE 이 블록은 무시\n여러 줄\n\n'
+            'STYLE\n::cue { color: red }\n\n'
+            'intro\n00:01.000 --> 00:02.500 align:start position:10%\n<v 화자>안녕</v>\n\n'
+            '00:00:03.000 --> 00:00:04.000\n두 번째\n')
+    assert cues_of(text) == [
+        ('intro', 1000, 2500, '<v 화자>안녕</v>'),
+        (2, 3000, 4000, '두 번째'),
+    ]
+
+
+def test_read_cues_from_file(tmp_path):
+    path = tmp_path / 'a.srt'
+    path.write_bytes('\ufeff1\n00:00:00,000 --> 00:00:01,000\n中文\n'.encode('utf-8'))
+    cues = list(read_cues(path))
+    assert len(cues) == 1
+    assert cues[0].start == 0.0 and cues[0].end == 1.0
+    assert cues[0].text == '中文'
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""text_normalize: 공유 변환기 · 변환 메모 · 세그먼트 정규화"""
+
+import sys
+
+import pytest
+
+import text_normalize
+from text_normalize import get_converter, normalize_segments, normalize_text, to_simplified
+
+
+class CountingConverter:
+    """변환 횟수를 세는 가짜 t2s 변환기"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def convert(self, text):
+        self.calls += 1
+        return text.replace('體', '体').replace('們', '们')
+
+
+@pytest.fixture
+def converter(monkeypatch):
+    converter = CountingConverter()
+    monkeypatch.setattr(text_normalize, '_converter', converter)
+    to_simplified.cache_clear()
+    yield converter
+    to_simplified.cache_clear()
+
+
+def test_same_text_is_converted_once(converter):
+    assert to_simplified('我們的字體') == '我们的字体'
+    assert to_simplified('我們的字體') == '我们的字体'
+    assert to_simplified('') == ''
+    assert converter.calls == 1
+
+
+def test_normalize_text(converter):
+    assert normalize_text('  我們 \n') == '我们'
+    assert normalize_text('  我們 ', simplify=False) == '我們'
+    assert normalize_text(['我們', '好']) == '我们 好'
+    assert normalize_text(12) == '12'
+
+
+def test_normalize_segments(converter):
+    segments = [
+        {'start': 0, 'end': 1.5, 'text': ' 我們 ', 'tokens': [1, 2], 'avg_logprob': -0.2,
+         'words': [{'word': ' 我們', 'start': 0, 'end': 1.5, 'probability': 0.9}]},
+        {'start': 1.5, 'end': 2, 'text': '字體'},
+    ]
+    assert normalize_segments(segments) == [
+        {'id': 1, 'start': 0.0, 'end': 1.5, 'text': '我们',
+         'words': [{'word': '我们', 'start': 0.0, 'end': 1.5}]},
+        {'id': 2, 'start': 1.5, 'end': 2.0, 'text': '字体', 'words': []},
+    ]
+    assert normalize_segments(segments, simplify=False)[1]['text'] == '字體'
+
+
+def test_missing_opencc_skips_conversion(monkeypatch, capsys):
+    monkeypatch.setattr(text_normalize, '_converter', None)
+    monkeypatch.setattr(text_normalize, '_converter_missing', False)
+    monkeypatch.setitem(sys.modules, 'opencc', None)  # import opencc → ImportError
+    to_simplified.cache_clear()
+    try:
+        assert get_converter() is None
+        assert get_converter() is None
+        assert to_simplified('字體') == '字體'
+    finally:
+        to_simplified.cache_clear()
+    # 경고는 한 번만
+    assert capsys.readouterr().out.count('⚠️') == 1
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""transcribe_server: URL 검사 · CORS · 작업 정리 · 조건부 요청 · Range"""
+
+import http.client
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import transcribe_server
+from transcribe_server import TranscriptionService, _parse_range, create_server
+
+VIDEO_URL = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+
+
+class FakePipeline:
+    """다운로드 단계에서 바로 캐시 적중 결과(파일들)를 돌려주는 가짜 파이프라인"""
+
+    def __init__(self, output_root):
+        self.output_root = output_root
+        self.downloads = []
+
+    def download_with_cache(self, url, cache):
+        self.downloads.append(url)
+        folder = self.output_root / url[-11:]
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / 'audio.txt').write_text('你好世界' * 100, encoding='utf-8')
+        return {'txt': folder / 'audio.txt'}
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = TranscriptionService(FakePipeline(tmp_path), tmp_path)
+    yield service
+    service._download_pool.shutdown(wait=True)
+
+
+@pytest.fixture
+def request_to(service):
+    server = create_server(service, '127.0.0.1', 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def request(method, path, body=None, headers=None):
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=5)
+        conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers or {})
+        response = conn.getresponse()
+        data = response.read()
+        conn.close()
+        return response, data
+
+    yield request
+    server.shutdown()
+    server.server_close()
+
+
+def wait_done(service, job):
+    deadline = time.time() + 5
+    while job.active and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.stage == 'done'
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-9', (0, 9)),
+    ('bytes=90-', (90, 99)),
+    ('bytes=-10', (90, 99)),
+    ('bytes=-500', (0, 99)),
+    ('bytes=50-500', (50, 99)),
+    ('bytes=100-', None),
+    ('bytes=9-3', None),
+    ('bytes=-0', None),
+    ('bytes=0-1,5-6', None),
+    ('items=0-1', None),
+    ('bytes=a-b', None),
+])
+def test_parse_range(header, expected):
+    assert _parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize('url', [
+    'https://example.com/video',
+    'https://www.youtube.com/',
+    'ftp://youtu.be/dQw4w9WgXcQ',
+])
+def test_rejects_urls_without_video_id(request_to, service, url):
+    response, data = request_to('POST', '/jobs', {'url': url})
+    assert response.status == 400
+    assert 'error' in json.loads(data)
+    assert service.jobs == {}
+
+
+def test_cors_only_for_configured_origin(request_to, monkeypatch):
+    monkeypatch.setattr(transcribe_server, 'CORS_ORIGINS', ['http://localhost:5173'])
+    response, _ = request_to('OPTIONS', '/jobs', headers={'Origin': 'http://localhost:5173'})
+    assert response.getheader('Access-Control-Allow-Origin') == 'http://localhost:5173'
+    response, _ = request_to('OPTIONS', '/jobs', headers={'Origin': 'https://evil.example'})
+    assert response.getheader('Access-Control-Allow-Origin') is None
+    assert response.getheader('Vary') == 'Origin'
+
+
+def test_file_conditional_and_range_requests(request_to, service):
+    response, data = request_to('POST', '/jobs', {'url': VIDEO_URL})
+    assert response.status == 202
+    job = service.jobs[json.loads(data)['id']]
+    wait_done(service, job)
+
+    response, data = request_to('GET', f'/jobs/{job.id}')
+    url = json.loads(data)['files']['txt']
+    assert url == '/files/dQw4w9WgXcQ/audio.txt'
+
+    response, body = request_to('GET', url)
+    etag, last_modified = response.getheader('ETag'), response.getheader('Last-Modified')
+    assert response.status == 200 and body.decode('utf-8') == '你好世界' * 100
+
+    response, body = request_to('GET', url, headers={'If-None-Match': etag})
+    assert response.status == 304 and body == b''
+    response, _ = request_to('GET', url, headers={'If-Modified-Since': last_modified})
+    assert response.status == 304
+    response, _ = request_to('GET', url, headers={'If-None-Match': '"other"'})
+    assert response.status == 200
+
+    response, body = request_to('GET', url, headers={'Range': 'bytes=0-2'})
+    assert response.status == 206 and body == '你'.encode('utf-8')
+    assert response.getheader('Content-Range') == f"bytes 0-2/{len(('你好世界' * 100).encode('utf-8'))}"
+    response, _ = request_to('GET', url, headers={'Range': 'bytes=99999-'})
+    assert response.status == 416
+
+    response, _ = request_to('GET', '/files/../secret')
+    assert response.status in (403, 404)
+
+
+def test_finished_job_with_deleted_files_is_redone(request_to, service):
+    job, created = service.submit(VIDEO_URL)
+    assert created
+    wait_done(service, job)
+    assert service.submit(VIDEO_URL) == (job, False)
+
+    os.unlink(job.outputs['txt'])
+    response, _ = request_to('GET', f'/jobs/{job.id}')
+    assert response.status == 410
+    again, created = service.submit(VIDEO_URL)
+    assert created and again is not job
+    wait_done(service, again)
+    assert len(service.pipeline.downloads) == 2
+
+
+def test_finished_jobs_expire_and_are_capped(service, monkeypatch):
+    monkeypatch.setattr(transcribe_server, 'MAX_JOBS', 3)
+    jobs = []
+    for n in range(5):
+        job, _ = service.submit(f'https://youtu.be/video{n:06d}')
+        wait_done(service, job)
+        jobs.append(job)
+    # 최대 개수를 넘지 않고, 오래된 끝난 작업부터 지움
+    assert len(service.jobs) == 3
+    assert set(service.jobs) == {job.id for job in jobs[2:]}
+
+    monkeypatch.setattr(transcribe_server, 'JOB_TTL_SECONDS', 0)
+    job, _ = service.submit('https://youtu.be/videoXXXXXX')
+    assert list(service.jobs) == [job.id]
+    assert service.list_jobs() == [job]
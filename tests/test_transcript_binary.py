@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""transcript_binary: .tbin 쓰기 → 메모리 맵 읽기 왕복"""
+
+import pytest
+
+from transcript_binary import HEADER, TranscriptReader, write_binary
+
+SEGMENTS = [
+    {'id': 1, 'start': 0.0, 'end': 1.25, 'text': '你好，世界。',
+     'words': [{'word': '你好', 'start': 0.0, 'end': 0.5}, {'word': '世界', 'start': 0.5, 'end': 1.25}]},
+    {'id': 2, 'start': 1.5, 'end': 2.0, 'text': '', 'words': []},
+    {'id': 3, 'start': 2.25, 'end': 5.75, 'text': 'mixed 中文 text 🎬',
+     'words': [{'word': '🎬', 'start': 5.0, 'end': 5.75}]},
+]
+
+
+def test_round_trip(tmp_path):
+    path = write_binary(SEGMENTS, tmp_path / 'audio.tbin', meta={'language': 'zh'})
+
+    with TranscriptReader(path) as reader:
+        assert reader.meta == {'language': 'zh'}
+        assert len(reader) == len(SEGMENTS)
+        for expected, actual in zip(SEGMENTS, reader):
+            assert actual['id'] == expected['id']
+            assert actual['text'] == expected['text']
+            assert actual['start'] == pytest.approx(expected['start'])
+            assert actual['end'] == pytest.approx(expected['end'])
+            assert [w['word'] for w in actual['words']] == [w['word'] for w in expected['words']]
+            assert [w['end'] for w in actual['words']] == pytest.approx([w['end'] for w in expected['words']])
+        assert reader[-1]['text'] == SEGMENTS[-1]['text']
+        with pytest.raises(IndexError):
+            reader[len(SEGMENTS)]
+
+
+def test_find_returns_segment_started_before(tmp_path):
+    path = write_binary(SEGMENTS, tmp_path / 'audio.tbin')
+    with TranscriptReader(path) as reader:
+        assert reader.find(-1.0) == -1
+        assert reader.find(0.0) == 0
+        assert reader.find(1.4) == 0
+        assert reader.find(2.25) == 2
+        assert reader.find(100.0) == 2
+
+
+def test_empty_transcript(tmp_path):
+    path = write_binary([], tmp_path / 'empty.tbin')
+    with TranscriptReader(path) as reader:
+        assert len(reader) == 0
+        assert list(reader) == []
+        assert reader.find(1.0) == -1
+
+
+def test_sections_are_aligned(tmp_path):
+    path = write_binary(SEGMENTS, tmp_path / 'audio.tbin', meta={'language': 'zh'})
+    data = path.read_bytes()
+    _, _, _, _, _, meta_len, blob_len = HEADER.unpack_from(data, 0)
+    # 텍스트 덩어리 앞까지의 구역은 모두 4바이트 단위
+    assert (len(data) - HEADER.size - blob_len) % 4 == 0
+
+
+def test_rejects_other_files(tmp_path):
+    bad = tmp_path / 'bad.tbin'
+    bad.write_bytes(b'NOPE' + b'\0' * 40)
+    with pytest.raises(ValueError):
+        TranscriptReader(bad)
+    short = tmp_path / 'short.tbin'
+    short.write_bytes(b'TB')
+    with pytest.raises(ValueError):
+        TranscriptReader(short)
+
+
+def test_zstd_round_trip(tmp_path):
+    pytest.importorskip('zstandard')
+    path = write_binary(SEGMENTS, tmp_path / 'audio.tbin', meta={'language': 'zh'}, compress=True)
+    with TranscriptReader(path) as reader:
+        assert [s['text'] for s in reader] == [s['text'] for s in SEGMENTS]
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""transcript_cache: 조회 · 보관 · 여러 인스턴스(프로세스) 사이 색인 병합"""
+
+import os
+
+import pytest
+
+from transcript_cache import TranscriptCache, extract_video_id, fetch_or_download
+
+SETTINGS = ('base', 'zh', {'word_timestamps': True})
+
+
+def make_outputs(directory, text='你好'):
+    directory.mkdir(parents=True, exist_ok=True)
+    audio = directory / 'audio.wav'
+    audio.write_bytes(b'RIFF' + text.encode('utf-8') * 100)
+    srt = directory / 'audio.srt'
+    srt.write_text(f"1\n00:00:00,000 --> 00:00:01,000\n{text}\n\n", encoding='utf-8')
+    txt = directory / 'audio.txt'
+    txt.write_text(text, encoding='utf-8')
+    return {'audio': str(audio), 'srt': str(srt), 'txt': str(txt)}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    c = TranscriptCache(tmp_path / 'cache')
+    # 지문 등록은 test_audio_fingerprint에서 따로 확인
+    monkeypatch.setattr(c, 'add_fingerprint', lambda audio_file: None)
+    return c
+
+
+@pytest.mark.parametrize('url, video_id', [
+    ('https://www.youtube.com/watch?v=Q8qW4u6mN3c', 'Q8qW4u6mN3c'),
+    ('https://youtu.be/Q8qW4u6mN3c?t=10', 'Q8qW4u6mN3c'),
+    ('https://www.youtube.com/shorts/Q8qW4u6mN3c', 'Q8qW4u6mN3c'),
+    ('https://www.youtube.com/embed/Q8qW4u6mN3c', 'Q8qW4u6mN3c'),
+    ('https://example.com/video', None),
+])
+def test_extract_video_id(url, video_id):
+    assert extract_video_id(url) == video_id
+
+
+def test_store_then_lookup_by_video_and_audio(cache, tmp_path):
+    outputs = make_outputs(tmp_path / 'out' / 'Q8qW4u6mN3c')
+    entry = cache.store('Q8qW4u6mN3c', outputs['audio'], *SETTINGS, artifacts=outputs)
+
+    assert cache.lookup_video('Q8qW4u6mN3c', *SETTINGS)['id'] == entry['id']
+    assert cache.lookup_audio(outputs['audio'], *SETTINGS)['id'] == entry['id']
+    assert cache.lookup_video('Q8qW4u6mN3c', 'small', 'zh', SETTINGS[2]) is None
+    assert cache.lookup_video('Q8qW4u6mN3c', 'base', 'zh', dict(SETTINGS[2], windowed=[120, 300])) is None
+
+
+def test_materialize_links_cached_files(cache, tmp_path):
+    outputs = make_outputs(tmp_path / 'out' / 'Q8qW4u6mN3c')
+    entry = cache.store('Q8qW4u6mN3c', outputs['audio'], *SETTINGS, artifacts=outputs)
+
+    restored = cache.materialize(entry, tmp_path / 'elsewhere')
+    assert restored['srt'].read_text(encoding='utf-8') == open(outputs['srt'], encoding='utf-8').read()
+    assert set(restored) == {'audio', 'srt', 'txt'}
+
+
+def test_missing_artifact_is_a_miss(cache, tmp_path):
+    outputs = make_outputs(tmp_path / 'out' / 'Q8qW4u6mN3c')
+    entry = cache.store('Q8qW4u6mN3c', outputs['audio'], *SETTINGS, artifacts=outputs)
+    os.unlink(cache.root / entry['artifacts']['srt'])
+    assert cache.lookup_video('Q8qW4u6mN3c', *SETTINGS) is None
+
+
+def test_index_survives_reopen(cache, tmp_path):
+    outputs = make_outputs(tmp_path / 'out' / 'Q8qW4u6mN3c')
+    cache.store('Q8qW4u6mN3c', outputs['audio'], *SETTINGS, artifacts=outputs)
+    assert TranscriptCache(cache.root).lookup_video('Q8qW4u6mN3c', *SETTINGS) is not None
+
+
+def test_two_instances_merge_instead_of_overwriting(tmp_path, monkeypatch):
+    first = TranscriptCache(tmp_path / 'cache')
+    second = TranscriptCache(tmp_path / 'cache')
+    for c in (first, second):
+        monkeypatch.setattr(c, 'add_fingerprint', lambda audio_file: None)
+
+    a = make_outputs(tmp_path / 'out' / 'aaaaaaaaaaa', '第一')
+    b = make_outputs(tmp_path / 'out' / 'bbbbbbbbbbb', '第二')
+    first.store('aaaaaaaaaaa', a['audio'], *SETTINGS, artifacts=a)
+    second.store('bbbbbbbbbbb', b['audio'], *SETTINGS, artifacts=b)
+
+    # 두 번째 저장이 첫 번째 항목을 지우지 않고, 첫 인스턴스도 다른 인스턴스의 항목을 봄
+    for c in (first, second, TranscriptCache(tmp_path / 'cache')):
+        assert c.lookup_video('aaaaaaaaaaa', *SETTINGS) is not None
+        assert c.lookup_video('bbbbbbbbbbb', *SETTINGS) is not None
+
+
+def test_audio_hash_follows_replaced_file(cache, tmp_path):
+    audio = tmp_path / 'audio.wav'
+    audio.write_bytes(b'first version')
+    before = cache.audio_hash(audio)
+    replacement = tmp_path / 'new.wav'
+    replacement.write_bytes(b'second version, longer')
+    os.replace(replacement, audio)
+    assert cache.audio_hash(audio) != before
+
+
+def test_fetch_or_download_skips_download_on_hit(cache, tmp_path):
+    outputs = make_outputs(tmp_path / 'out' / 'Q8qW4u6mN3c')
+    cache.store('Q8qW4u6mN3c', outputs['audio'], *SETTINGS, artifacts=outputs)
+
+    def download(url):
+        raise AssertionError("캐시 적중인데 다운로드함")
+
+    result = fetch_or_download(cache, 'https://youtu.be/Q8qW4u6mN3c', download, *SETTINGS,
+                               output_dir=tmp_path / 'output')
+    assert isinstance(result, dict)
+    assert result['txt'].read_text(encoding='utf-8') == '你好'
+
+
+def test_fetch_or_download_matches_same_audio_from_other_url(cache, tmp_path):
+    outputs = make_outputs(tmp_path / 'out' / 'Q8qW4u6mN3c')
+    cache.store('Q8qW4u6mN3c', outputs['audio'], *SETTINGS, artifacts=outputs)
+    copy = make_outputs(tmp_path / 'out' / 'zzzzzzzzzzz')  # 같은 내용의 음성
+
+    result = fetch_or_download(cache, 'https://youtu.be/zzzzzzzzzzz', lambda url: copy['audio'], *SETTINGS)
+    assert isinstance(result, dict)
+    # 다음부터는 새 영상 ID로도 바로 찾음
+    assert cache.lookup_video('zzzzzzzzzzz', *SETTINGS) is not None
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""transcript_checkpoint: 구간별 기록과 중단 후 이어서 변환"""
+
+import json
+
+import pytest
+
+from audio_io import SAMPLE_RATE
+from transcript_checkpoint import checkpoint_path, collect_result, remove_checkpoint, resumable_segments
+
+WINDOW = {'min_seconds': 8, 'max_seconds': 12}
+
+
+class FakeModel:
+    """구간마다 (시작 샘플, 길이)를 텍스트로 돌려주는 가짜 모델, fail_at번째 호출에서 중단"""
+
+    def __init__(self, fail_at=None):
+        self.calls = []
+        self.fail_at = fail_at
+
+    def transcribe(self, audio, initial_prompt=None, **options):
+        if self.fail_at is not None and len(self.calls) == self.fail_at:
+            raise KeyboardInterrupt("중단")
+        self.calls.append(initial_prompt)
+        text = f"[{len(audio) // SAMPLE_RATE}s#{len(self.calls)}]"
+        return {'text': text, 'segments': [{'start': 0.5, 'end': 1.5, 'text': text, 'words': []}]}
+
+
+@pytest.fixture
+def audio_file(make_wav):
+    return make_wav('video/audio.wav', 45)
+
+
+def run(model, audio_file, settings='s1'):
+    return list(resumable_segments(model, audio_file, settings, language='zh', **WINDOW))
+
+
+def test_fresh_run_decodes_every_window(audio_file):
+    model = FakeModel()
+    segments = run(model, audio_file)
+
+    assert len(segments) == len(model.calls) > 1
+    assert [s['id'] for s in segments] == list(range(len(segments)))
+    # 구간 시작 시각만큼 옮겨지고, 앞 구간 텍스트가 다음 구간 프롬프트로 이어짐
+    assert segments[0]['start'] == 0.5 and segments[1]['start'] > 8
+    assert model.calls[0] is None and model.calls[1] == segments[0]['text']
+    assert checkpoint_path(audio_file).exists()
+
+
+def test_interrupted_run_resumes_from_last_window(audio_file):
+    expected = run(FakeModel(), audio_file)
+    remove_checkpoint(audio_file)
+
+    with pytest.raises(KeyboardInterrupt):
+        run(FakeModel(fail_at=2), audio_file)
+
+    resumed = FakeModel()
+    segments = run(resumed, audio_file)
+    assert len(resumed.calls) == len(expected) - 2
+    assert resumed.calls[0] == expected[1]['text']  # 저장된 프롬프트로 이어서 디코딩
+    assert [s['start'] for s in segments] == [s['start'] for s in expected]
+    assert [s['id'] for s in segments] == list(range(len(expected)))
+
+
+def test_changed_settings_start_over(audio_file):
+    run(FakeModel(), audio_file, settings='s1')
+    model = FakeModel()
+    segments = run(model, audio_file, settings='s2')
+    assert len(model.calls) == len(segments)
+
+
+def test_truncated_last_line_is_dropped(audio_file):
+    with pytest.raises(KeyboardInterrupt):
+        run(FakeModel(fail_at=2), audio_file)
+    path = checkpoint_path(audio_file)
+    with open(path, 'ab') as f:
+        f.write(b'{"window": 2, "segm')  # 기록 중 끊긴 줄
+
+    resumed = FakeModel()
+    run(resumed, audio_file)
+    lines = path.read_bytes().splitlines()
+    assert all(json.loads(line) for line in lines)
+    assert len(lines) == 1 + 2 + len(resumed.calls)
+
+
+def test_single_window_needs_no_checkpoint(make_wav):
+    short = make_wav('short/audio.wav', 5)
+    model = FakeModel()
+    segments = run(model, short)
+    assert len(segments) == len(model.calls) == 1
+    assert not checkpoint_path(short).exists()
+
+
+def test_collect_result_and_remove(audio_file):
+    result = collect_result(run(FakeModel(), audio_file), 'zh')
+    assert result['language'] == 'zh'
+    assert result['text'] == ''.join(s['text'] for s in result['segments'])
+    remove_checkpoint(audio_file)
+    remove_checkpoint(audio_file)  # 없어도 오류 없음
+    assert not checkpoint_path(audio_file).exists()
+
+
+def test_rerun_reuses_audio_instead_of_downloading(tmp_path, monkeypatch):
+    import transcript_pipeline
+    from transcript_pipeline import TranscriptPipeline
+
+    monkeypatch.chdir(tmp_path)
+    downloads = []
+
+    def download_audio(url, audio_mode=None):
+        downloads.append(url)
+        return str(tmp_path / 'output' / 'dQw4w9WgXcQ' / 'new.wav')
+
+    pipeline = TranscriptPipeline('base', 'cpu', simplify=False, formats=('txt',),
+                                  download_audio=download_audio, setup=lambda: None,
+                                  output_dir=str(tmp_path / 'output'))
+    url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+    audio = tmp_path / 'output' / 'dQw4w9WgXcQ' / 'audio.wav'
+    audio.parent.mkdir(parents=True)
+    audio.write_bytes(b'RIFF')
+
+    # 체크포인트 모드가 아니거나 체크포인트가 없으면 다운로드
+    monkeypatch.setattr(transcript_pipeline, 'CHECKPOINT', False)
+    checkpoint_path(audio).write_text('{}\n', encoding='utf-8')
+    assert pipeline.download_with_cache(url, None, 'pcm').endswith('new.wav')
+    monkeypatch.setattr(transcript_pipeline, 'CHECKPOINT', True)
+    assert pipeline.download_with_cache(url, None, 'mp3').endswith('new.wav')
+    assert len(downloads) == 2
+
+    # 중단된 변환이면 남은 음성을 그대로 사용
+    assert pipeline.download_with_cache(url, None, 'pcm') == str(audio)
+    assert len(downloads) == 2
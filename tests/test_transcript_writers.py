@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""transcript_writers: 한 번의 순회로 여러 형식 쓰기와 스트리밍 기록"""
+
+import json
+import os
+import threading
+
+from subtitle_parser import read_cues
+from transcript_binary import TranscriptReader
+from transcript_writers import (
+    STREAM_FORMATS, AtomicFile, format_timestamp, format_timestamp_vtt, output_paths, read_jsonl,
+    stream_transcript, write_transcript,
+)
+
+SEGMENTS = [
+    {'id': 1, 'start': 0.0, 'end': 1.5, 'text': '你好',
+     'words': [{'word': '你', 'start': 0.0, 'end': 0.7}, {'word': '好', 'start': 0.7, 'end': 1.5}]},
+    {'id': 2, 'start': 61.25, 'end': 3725.5, 'text': '世界', 'words': []},
+]
+
+
+def test_timestamps():
+    assert format_timestamp(3725.5) == '01:02:05,500'
+    assert format_timestamp_vtt(0.001) == '00:00:00.001'
+
+
+def test_output_paths(tmp_path):
+    paths = output_paths(tmp_path / 'audio', ('txt', 'bin', 'highlight', 'html'))
+    assert {fmt: p.name for fmt, p in paths.items()} == {
+        'txt': 'audio.txt', 'bin': 'audio.tbin',
+        'highlight': 'audio_word_highlight.json', 'html': 'audio_highlight.html',
+    }
+
+
+def test_write_all_formats_in_one_pass(tmp_path):
+    # 출력 폴더/<영상 ID>/ 구조 (공용 플레이어 번들은 출력 폴더에 생김)
+    video = tmp_path / 'abcdefghijk'
+    video.mkdir()
+    audio = video / 'audio.wav'
+    audio.write_bytes(b'')
+    paths = output_paths(video / 'audio', ('txt', 'srt', 'vtt', 'json', 'bin', 'highlight', 'html'))
+
+    outputs = write_transcript(iter(SEGMENTS), paths, audio_file=audio, json_data={'language': 'zh'},
+                               assets_root=tmp_path)
+
+    assert outputs['txt'].read_text(encoding='utf-8') == '你好世界'
+    srt = [(c.index, c.start_ms, c.end_ms, c.text) for c in read_cues(outputs['srt'])]
+    assert srt == [(1, 0, 1500, '你好'), (2, 61250, 3725500, '世界')]
+    assert outputs['vtt'].read_text(encoding='utf-8').startswith('WEBVTT\n\n')
+    assert [c.text for c in read_cues(outputs['vtt'])] == ['你好', '世界']
+    data = json.loads(outputs['json'].read_text(encoding='utf-8'))
+    assert data['language'] == 'zh' and data['segments'] == SEGMENTS
+    with TranscriptReader(outputs['bin']) as reader:
+        assert [s['text'] for s in reader] == ['你好', '世界']
+    highlight = json.loads(outputs['highlight'].read_text(encoding='utf-8'))
+    assert len(highlight) == 2
+    assert outputs['html'].exists() and outputs['cues'].exists()
+    # 임시 파일이 남지 않음
+    assert not [name for name in os.listdir(video) if name.endswith('.tmp') or name.startswith('.')]
+
+
+def test_text_argument_overrides_txt(tmp_path):
+    outputs = write_transcript(SEGMENTS, {'txt': tmp_path / 'a.txt'}, text='全文')
+    assert outputs['txt'].read_text(encoding='utf-8') == '全文'
+
+
+def test_concurrent_atomic_writes_to_same_path(tmp_path):
+    path = tmp_path / 'same.txt'
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def write(n):
+        try:
+            with AtomicFile(path) as f:
+                f.write(f'writer {n}\n' * 1000)
+                barrier.wait(timeout=5)  # 모두 임시 파일을 연 상태에서 교체
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    lines = path.read_text(encoding='utf-8').splitlines()
+    # 한 스레드가 쓴 내용만 온전히 남음
+    assert len(lines) == 1000 and len(set(lines)) == 1
+    assert os.listdir(tmp_path) == ['same.txt']
+
+
+def test_stream_transcript_writes_as_it_goes(tmp_path):
+    paths = output_paths(tmp_path / 'audio', STREAM_FORMATS)
+    seen = []
+
+    def segments():
+        yield {'start': 0.0, 'end': 1.0, 'text': ' 第一 ', 'words': []}
+        # 다음 세그먼트를 디코딩하는 동안에도 앞 세그먼트가 파일에 있음
+        assert list(read_jsonl(paths['jsonl']))[0]['text'] == '第一'
+        assert '第一' in paths['srt'].read_text(encoding='utf-8')
+        yield {'start': 1.0, 'end': 2.5, 'text': '第二', 'words': [{'word': '第二', 'start': 1.0, 'end': 2.5}]}
+
+    count = stream_transcript(segments(), paths, simplify=False,
+                              on_segment=lambda n, record: seen.append((n, record['end'])))
+
+    assert count == 2
+    assert seen == [(1, 1.0), (2, 2.5)]
+    records = list(read_jsonl(paths['jsonl']))
+    assert [r['id'] for r in records] == [1, 2]
+    assert records[1]['words'][0]['word'] == '第二'
+    assert [c.index for c in read_cues(paths['srt'])] == [1, 2]
+
+
+def test_streaming_does_not_write_through_hardlinks(tmp_path):
+    cached = tmp_path / 'cached.srt'
+    cached.write_text('1\n00:00:00,000 --> 00:00:01,000\n旧\n\n', encoding='utf-8')
+    paths = output_paths(tmp_path / 'audio', STREAM_FORMATS)
+    os.link(cached, paths['srt'])
+
+    stream_transcript([{'start': 0.0, 'end': 1.0, 'text': '新', 'words': []}], paths, simplify=False)
+
+    assert '旧' in cached.read_text(encoding='utf-8')
+    assert '新' in paths['srt'].read_text(encoding='utf-8')
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""srt_to_word_highlight: 실제 단어 타이밍으로 글자별 하이라이트 만들기"""
+
+import json
+
+import pytest
+
+from srt_to_word_highlight import char_timings, create_word_highlight_json, highlight_record
+
+
+def spans(segment):
+    return [(char, round(start, 3), round(end, 3)) for char, start, end in char_timings(segment)]
+
+
+def test_word_timings_split_across_characters():
+    segment = {'start': 0.0, 'end': 3.0, 'text': '你好世界',
+               'words': [{'word': ' 你好', 'start': 0.2, 'end': 1.0},
+                         {'word': '世界', 'start': 2.0, 'end': 3.0}]}
+    assert spans(segment) == [('你', 0.2, 0.6), ('好', 0.6, 1.0), ('世', 2.0, 2.5), ('界', 2.5, 3.0)]
+
+
+def test_unmatched_characters_fill_gaps():
+    # 문장부호 · 공백은 앞뒤 글자 사이에 고르게 놓임
+    segment = {'start': 0.0, 'end': 4.0, 'text': '你，好 。',
+               'words': [{'word': '你', 'start': 0.0, 'end': 1.0},
+                         {'word': '好', 'start': 3.0, 'end': 3.5}]}
+    assert spans(segment) == [('你', 0.0, 1.0), ('，', 1.0, 3.0), ('好', 3.0, 3.5),
+                              (' ', 3.5, 3.75), ('。', 3.75, 4.0)]
+
+
+def test_without_words_characters_are_evenly_spaced():
+    segment = {'start': 10.0, 'end': 12.0, 'text': '一二三四'}
+    assert spans(segment) == [('一', 10.0, 10.5), ('二', 10.5, 11.0), ('三', 11.0, 11.5), ('四', 11.5, 12.0)]
+
+
+def test_mismatched_words_do_not_shift_later_characters():
+    # 단어 글자가 세그먼트 텍스트와 다르면 (간체 변환 차이 등) 그 글자만 채워 넣음
+    segment = {'start': 0.0, 'end': 2.0, 'text': '们好',
+               'words': [{'word': '們', 'start': 0.0, 'end': 1.0},
+                         {'word': '好', 'start': 1.5, 'end': 2.0}]}
+    assert spans(segment) == [('们', 0.0, 1.5), ('好', 1.5, 2.0)]
+
+
+def test_highlight_record():
+    segment = {'start': 61.0, 'end': 62.5, 'text': '好',
+               'words': [{'word': '好', 'start': 61.25, 'end': 62.5}]}
+    record = highlight_record(segment, 7)
+    assert record['id'] == 7
+    assert (record['start_time'], record['end_time']) == ('00:01:01,000', '00:01:02,500')
+    assert record['duration'] == pytest.approx(1.5)
+    assert record['words'] == [{'char': '好', 'start': 61.25, 'end': 62.5,
+                                'start_time': '00:01:01,250', 'end_time': '00:01:02,500'}]
+
+
+def test_create_word_highlight_json_from_srt(tmp_path, capsys):
+    srt = tmp_path / 'a.srt'
+    srt.write_text('1\n00:00:00,000 --> 00:00:01,000\n你好\n\n'
+                   '2\n00:00:01,000 --> 00:00:02,000\n \n\n'
+                   '3\n00:00:02,000 --> 00:00:04,000\n世\n界\n', encoding='utf-8')
+    out = tmp_path / 'a.json'
+
+    create_word_highlight_json(srt, out)
+
+    records = json.loads(out.read_text(encoding='utf-8'))
+    assert [r['text'] for r in records] == ['你好', '世 界']
+    assert [w['char'] for w in records[1]['words']] == ['世', ' ', '界']
+    assert '2개 세그먼트, 5개 글자' in capsys.readouterr().out
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+자막 텍스트 정규화
+프로세스 전체에서 OpenCC 변환기 하나와 변환 결과 메모를 공유하고,
+Whisper 세그먼트를 한 번만 정리해 모든 파일 생성기가 같은 레코드를 쓰게 합니다.
+"""
+
+import threading
+from functools import lru_cache
+
+_converter = None
+_converter_lock = threading.Lock()
+_converter_missing = False
+
+
+def get_converter():
+    """번체→간체 OpenCC 변환기 (프로세스당 한 번 생성, opencc가 없으면 None)"""
+    global _converter, _converter_missing
+    if _converter is None and not _converter_missing:
+        with _converter_lock:
+            if _converter is None and not _converter_missing:
+                try:
+                    import opencc
+                    _converter = opencc.OpenCC('t2s')  # Traditional to Simplified
+                except ImportError:
+                    _converter_missing = True
+                    print("⚠️ opencc 패키지가 설치되지 않아 번체→간체 변환을 건너뜁니다. "
+                          "pip install opencc-python-reimplemented")
+    return _converter
+
+
+@lru_cache(maxsize=65536)
+def to_simplified(text):
+    """번체를 간체로 변환 (같은 문자열은 한 번만 변환)"""
+    converter = get_converter()
+    if converter is None or not text:
+        return text
+    try:
+        return converter.convert(text)
+    except Exception as e:
+        print(f"⚠️ 번체→간체 변환 실패: {e}")
+        return text
+
+
+def normalize_text(text, simplify=True):
+    """앞뒤 공백 제거 + (선택) 간체 변환"""
+    if not isinstance(text, str):
+        text = ' '.join(map(str, text)) if isinstance(text, list) else str(text)
+    text = text.strip()
+    return to_simplified(text) if simplify else text
+
+
+def normalize_segments(segments, simplify=True):
+    """
+    Whisper 세그먼트를 정규화된 레코드 목록으로 변환
+
+    각 레코드: {'id', 'start', 'end', 'text', 'words': [{'word', 'start', 'end'}]}
+    """
+    return [normalize_segment(segment, i, simplify) for i, segment in enumerate(segments, 1)]
+
+
+def normalize_segment(segment, index, simplify=True):
+    """Whisper 세그먼트 하나를 정규화된 레코드로 변환 (스트리밍용)"""
+    words = []
+    for word in segment.get('words') or ():
+        words.append({
+            'word': normalize_text(word['word'], simplify),
+            'start': float(word['start']),
+            'end': float(word['end']),
+        })
+    return {
+        'id': index,
+        'start': float(segment['start']),
+        'end': float(segment['end']),
+        'text': normalize_text(segment['text'], simplify),
+        'words': words,
+    }
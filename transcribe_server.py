@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 HTTP 변환 서비스
+YouTube URL을 받아 작업 ID를 돌려주고, 작업 대기열에서 다운로드(여러 개 동시)와
+음성 인식(상주 모델 하나)을 youtube_to_transcript 설정의 transcript_pipeline으로 실행합니다.
+음성 인식은 스트리밍 모드로 돌려 진행 중인 세그먼트를 바로 조회할 수 있고,
+결과 파일은 ETag · Last-Modified · Cache-Control 헤더와 함께 제공합니다 (Range 요청 지원).
+
+엔드포인트:
+    POST /jobs                     {"url": ...} → 202 {"id", "status_url", ...}
+    GET  /jobs                     작업 목록
+    GET  /jobs/<id>                단계 · 진행률 · 결과 파일 주소
+    GET  /jobs/<id>/segments?since=N   N번째 이후 세그먼트 (진행 중에도 조회 가능)
+    GET  /files/<경로>             출력 폴더의 파일 (플레이어 페이지, 자막, 음성 등)
+    GET  /health                   상태 확인
+    GET  /metrics                  단계별 측정값 (Prometheus 텍스트 형식)
+
+작업 목록은 메모리에만 있고 끝난 작업은 일정 시간 · 개수를 넘으면 지우지만,
+같은 영상을 다시 요청하면 변환 캐시에서 바로 결과를 돌려줍니다.
+
+사용법:
+    python transcribe_server.py [--host 127.0.0.1] [--port 8000] [--parallel N] [--backend whisper|ct2]
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import threading
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+SERVICE_HOST = os.getenv('SERVICE_HOST', '127.0.0.1')
+SERVICE_PORT = int(os.getenv('SERVICE_PORT', '8000'))
+
+# 파이프라인이 결과를 쓰는 출력 폴더 (/files/로 제공)
+OUTPUT_ROOT = './output'
+
+# 동시 다운로드 수 (음성 인식은 상주 모델 하나에서 차례로)
+DOWNLOAD_WORKERS = int(os.getenv('SERVICE_DOWNLOAD_WORKERS', '2'))
+
+# 요청을 허용할 프런트엔드 주소 (쉼표로 구분, 기본값: Vite 개발 서버)
+CORS_ORIGINS = [origin.strip() for origin in
+                os.getenv('SERVICE_CORS_ORIGIN', 'http://localhost:5173,http://127.0.0.1:5173').split(',')
+                if origin.strip()]
+
+# 끝난 작업을 기억하는 시간 (초)과 최대 작업 수 (넘으면 오래된 끝난 작업부터 지움)
+JOB_TTL_SECONDS = int(os.getenv('SERVICE_JOB_TTL', str(24 * 3600)))
+MAX_JOBS = int(os.getenv('SERVICE_MAX_JOBS', '500'))
+
+# 이름에 내용 해시가 들어간 파일 (플레이어 번들)은 오래 캐시
+IMMUTABLE_PREFIX = 'player/player-'
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+
+CONTENT_TYPES = {
+    '.js': 'text/javascript; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.jsonl': 'application/x-ndjson; charset=utf-8',
+    '.srt': 'text/plain; charset=utf-8',
+    '.vtt': 'text/vtt; charset=utf-8',
+    '.txt': 'text/plain; charset=utf-8',
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.tbin': 'application/octet-stream',
+}
+
+
+class Job:
+    """변환 작업 하나"""
+
+    __slots__ = ('id', 'url', 'video_id', 'stage', 'error', 'audio_file', 'outputs',
+                 'duration', 'segment_count', 'last_end', 'cached', 'created', 'started', 'finished')
+
+    def __init__(self, url, video_id):
+        self.id = uuid.uuid4().hex[:12]
+        self.url = url
+        self.video_id = video_id
+        self.stage = 'queued'
+        self.error = None
+        self.audio_file = None
+        self.outputs = None
+        self.duration = None
+        self.segment_count = 0   # 스트리밍 기록기가 지금까지 쓴 세그먼트 수
+        self.last_end = 0.0      # 마지막 세그먼트 끝 (초, 진행률 계산용)
+        self.cached = False
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    @property
+    def active(self):
+        return self.stage not in ('done', 'error')
+
+
+def partial_segments_path(audio_file):
+    """스트리밍 모드가 세그먼트를 이어 쓰는 JSON Lines 경로"""
+    from transcript_writers import output_paths
+
+    return output_paths(Path(audio_file).with_suffix(''), ('jsonl',))['jsonl']
+
+
+def read_segments(path, since=0):
+    """JSON Lines에서 since번째 이후의 완성된 줄만 읽기 → (세그먼트 목록, 다음 번호)"""
+    segments = []
+    index = 0
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # 아직 쓰는 중인 줄
+                if index >= since and line.strip():
+                    segments.append(json.loads(line))
+                index += 1
+    except FileNotFoundError:
+        pass
+    return segments, max(index, since)
+
+
+class TranscriptionService:
+    """작업 대기열 · 다운로드 풀 · 상주 모델 음성 인식 스레드"""
+
+    def __init__(self, pipeline, output_root, cache=None):
+        self.pipeline = pipeline
+        self.output_root = Path(output_root).resolve()
+        self.cache = cache
+        self.jobs = {}
+        self._by_video = {}
+        self._lock = threading.Lock()
+        self._transcribe_queue = queue.Queue()
+        self._download_pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix='download')
+        self._worker = None
+
+    def start(self):
+        """모델을 미리 올리고 음성 인식 스레드 시작"""
+        import transcript_pipeline
+
+        self._worker = self.pipeline.get_default_worker()
+        if not transcript_pipeline.PARALLEL_WORKERS:
+            threading.Thread(target=self.pipeline.load_model, args=(self._worker,), name='warmup',
+                             daemon=True).start()
+        threading.Thread(target=self._transcribe_loop, name='transcribe', daemon=True).start()
+
+    def submit(self, url):
+        """
+        작업 등록 → (작업, 새 작업 여부)
+
+        같은 영상이 진행 중이거나, 끝났고 결과 파일이 아직 있으면 그 작업을 반환
+        url은 영상 ID를 뽑을 수 있는 YouTube 주소여야 함 (아니면 ValueError)
+        """
+        from transcript_cache import extract_video_id
+
+        video_id = extract_video_id(url)
+        if not video_id:
+            raise ValueError(f"영상 ID를 찾을 수 없는 URL입니다: {url}")
+        with self._lock:
+            self._prune()
+            existing = self.jobs.get(self._by_video.get(video_id))
+            if existing is not None and self._reusable(existing):
+                return existing, False
+            job = Job(url, video_id)
+            self.jobs[job.id] = job
+            self._by_video[video_id] = job.id
+        self._download_pool.submit(self._download, job)
+        return job, True
+
+    @staticmethod
+    def _reusable(job):
+        """진행 중이거나, 성공했고 결과 파일이 모두 남아 있는 작업인지"""
+        if job.active:
+            return True
+        return job.stage == 'done' and all(os.path.exists(path) for path in job.outputs.values())
+
+    def _prune(self):
+        """오래된 끝난 작업과 최대 개수를 넘는 끝난 작업 정리 (self._lock 안에서 호출)"""
+        now = time.time()
+        finished = sorted((job for job in self.jobs.values() if not job.active), key=lambda job: job.finished)
+        excess = len(self.jobs) - MAX_JOBS + 1
+        for job in finished:
+            if excess <= 0 and now - job.finished < JOB_TTL_SECONDS:
+                break
+            del self.jobs[job.id]
+            if self._by_video.get(job.video_id) == job.id:
+                del self._by_video[job.video_id]
+            excess -= 1
+
+    def list_jobs(self):
+        """최근 작업부터 작업 목록"""
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return sorted(jobs, key=lambda job: job.created, reverse=True)
+
+    def _download(self, job):
+        job.started = time.time()
+        job.stage = 'download'
+        try:
+            result = self.pipeline.download_with_cache(job.url, self.cache)
+        except Exception as e:
+            result = None
+            job.error = str(e)
+        if not result:
+            self._fail(job, job.error or "음성 다운로드 실패")
+        elif isinstance(result, dict):
+            # 캐시 적중 (또는 음성 지문 일치)
+            job.cached = True
+            self._finish(job, result)
+        else:
+            from audio_io import audio_duration
+            job.audio_file = result
+            job.duration = audio_duration(result)
+            job.stage = 'waiting'
+            self._transcribe_queue.put(job)
+
+    def _transcribe_loop(self):
+        while True:
+            job = self._transcribe_queue.get()
+            try:
+                job.stage = 'transcribe'
+                result = self.pipeline.run_whisper(job.audio_file, self._worker,
+                                                   on_segment=self._progress_callback(job))
+                job.stage = 'write'
+                outputs = self.pipeline.write_outputs(result, job.audio_file)
+                self.pipeline.store_in_cache(self.cache, job.url, outputs)
+                self._finish(job, outputs)
+            except Exception as e:
+                self._fail(job, str(e))
+            finally:
+                self._transcribe_queue.task_done()
+
+    @staticmethod
+    def _progress_callback(job):
+        """스트리밍 기록기가 세그먼트를 쓸 때마다 작업의 개수 · 진행 위치 갱신"""
+        def on_segment(count, segment):
+            job.segment_count = count
+            job.last_end = segment['end']
+        return on_segment
+
+    def _finish(self, job, outputs):
+        job.outputs = {kind: str(path) for kind, path in outputs.items()}
+        job.audio_file = job.outputs.get('audio', job.audio_file)
+        job.stage = 'done'
+        job.finished = time.time()
+
+    def _fail(self, job, error):
+        print(f"❌ 작업 {job.id} 실패: {error}")
+        job.error = error
+        job.stage = 'error'
+        job.finished = time.time()
+
+    def file_url(self, path):
+        """출력 폴더 안 파일의 /files/ 주소 (밖이면 None)"""
+        try:
+            relative = Path(path).resolve().relative_to(self.output_root)
+        except ValueError:
+            return None
+        return '/files/' + quote(relative.as_posix())
+
+    def segments_path(self, job):
+        if job.outputs and job.outputs.get('jsonl'):
+            return job.outputs['jsonl']
+        if job.audio_file:
+            return partial_segments_path(job.audio_file)
+        return None
+
+    def segments(self, job, since=0):
+        """작업의 세그먼트 (진행 중이면 지금까지 기록된 것)"""
+        path = self.segments_path(job)
+        if path and os.path.exists(path):
+            return read_segments(path, since)
+        if job.outputs and job.outputs.get('srt'):
+            from subtitle_parser import read_cues
+            segments = [{'id': i, 'start': cue.start, 'end': cue.end, 'text': cue.text}
+                        for i, cue in enumerate(read_cues(job.outputs['srt']))]
+            return segments[since:], max(len(segments), since)
+        return [], since
+
+    def status(self, job):
+        """작업 상태 JSON"""
+        # 진행률은 기록기가 갱신한 값으로 계산 (조회마다 JSON Lines를 다시 읽지 않음)
+        progress = 1.0 if job.stage == 'done' else 0.0
+        if job.stage == 'transcribe' and job.duration:
+            progress = min(0.99, job.last_end / job.duration)
+        return {
+            'id': job.id,
+            'url': job.url,
+            'video_id': job.video_id,
+            'stage': job.stage,
+            'progress': round(progress, 3),
+            'segments_written': job.segment_count,
+            'cached': job.cached,
+            'error': job.error,
+            'created': job.created,
+            'started': job.started,
+            'finished': job.finished,
+            'queue_position': self._queue_position(job),
+            'segments_url': f"/jobs/{job.id}/segments",
+            'files': {kind: self.file_url(path) for kind, path in (job.outputs or {}).items()},
+        }
+
+    def _queue_position(self, job):
+        if job.stage != 'waiting':
+            return None
+        with self._transcribe_queue.mutex:
+            waiting = list(self._transcribe_queue.queue)
+        return waiting.index(job) + 1 if job in waiting else None
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """HTTP 요청 처리 (server.service에 TranscriptionService)"""
+
+    server_version = 'TranscribeService/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+    def _cors(self):
+        # 설정된 프런트엔드 주소에만 허용 (다른 사이트의 스크립트가 작업을 등록 · 조회하지 못하게)
+        origin = self.headers.get('Origin')
+        if origin and origin in CORS_ORIGINS:
+            self.send_header('Access-Control-Allow-Origin', origin)
+        self.send_header('Vary', 'Origin')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match, Range')
+        self.send_header('Access-Control-Expose-Headers', 'ETag, Location, Content-Range')
+
+    def _json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False)
+        return self._text(status, body, 'application/json; charset=utf-8', headers)
+
+    def _text(self, status, text, content_type, headers=None):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self._cors()
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._json(status, {'error': message})
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Methods', 'GET, HEAD, POST, OPTIONS')
+        self.send_header('Content-Length', '0')
+        self._cors()
+        self.end_headers()
+
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if path != '/jobs':
+            return self._error(404, "없는 주소입니다.")
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            url = str(payload.get('url') or '').strip()
+        except (ValueError, AttributeError):
+            return self._error(400, "JSON 본문 {\"url\": ...}이 필요합니다.")
+        if not url.startswith(('http://', 'https://')):
+            return self._error(400, "YouTube URL이 필요합니다.")
+
+        try:
+            job, created = self.service.submit(url)
+        except ValueError as e:
+            return self._error(400, str(e))
+        status = dict(self.service.status(job), status_url=f"/jobs/{job.id}")
+        self._json(202 if created else 200, status, {'Location': f"/jobs/{job.id}"})
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        parts = [unquote(part) for part in parsed.path.strip('/').split('/') if part]
+
+        if parts == ['health']:
+            return self._json(200, {'ok': True, 'jobs': len(self.service.jobs),
+                                    'waiting': self.service._transcribe_queue.qsize()})
+        if parts == ['jobs']:
+            return self._json(200, [self.service.status(job) for job in self.service.list_jobs()])
+        if len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.service.jobs.get(parts[1])
+            if job is None:
+                return self._error(404, "없는 작업입니다.")
+            if job.stage == 'done' and not self.service._reusable(job):
+                return self._error(410, "결과 파일이 삭제되었습니다. 다시 요청해 주세요.")
+            if len(parts) == 2:
+                return self._json(200, self.service.status(job))
+            if parts[2] == 'segments':
+                try:
+                    since = max(0, int(parse_qs(parsed.query).get('since', ['0'])[0]))
+                except ValueError:
+                    return self._error(400, "since는 정수여야 합니다.")
+                segments, next_index = self.service.segments(job, since)
+                return self._json(200, {'segments': segments, 'next': next_index,
+                                        'stage': job.stage, 'done': not job.active})
+        if parts == ['metrics']:
+            from pipeline_metrics import render_prometheus
+            return self._text(200, render_prometheus(), 'text/plain; version=0.0.4; charset=utf-8')
+        if parts and parts[0] == 'files':
+            return self._file(parts[1:])
+        if not parts:
+            return self._file([])
+        return self._error(404, "없는 주소입니다.")
+
+    def _file(self, parts):
+        """출력 폴더의 파일 제공 (조건부 요청 · 단일 Range 지원)"""
+        root = self.service.output_root
+        path = (root.joinpath(*parts) if parts else root / 'index.html').resolve()
+        try:
+            relative = path.relative_to(root).as_posix()
+        except ValueError:
+            return self._error(403, "출력 폴더 밖의 파일입니다.")
+        if any(part.startswith('.') for part in relative.split('/')) or not path.is_file():
+            return self._error(404, "파일이 없습니다.")
+
+        stat = path.stat()
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+        cache_control = IMMUTABLE_CACHE if relative.startswith(IMMUTABLE_PREFIX) else REVALIDATE_CACHE
+
+        if self._not_modified(etag, stat.st_mtime):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+            self._cors()
+            self.end_headers()
+            return
+
+        start, end = 0, stat.st_size - 1
+        status = 200
+        requested = self.headers.get('Range')
+        if requested and stat.st_size:
+            byte_range = _parse_range(requested, stat.st_size)
+            if byte_range is None:
+                self.send_response(416)
+                self.send_header('Content-Range', f"bytes */{stat.st_size}")
+                self.send_header('Content-Length', '0')
+                self._cors()
+                self.end_headers()
+                return
+            start, end = byte_range
+            status = 206
+
+        content_type = CONTENT_TYPES.get(path.suffix.lower()) or mimetypes.guess_type(path.name)[0] \
+            or 'application/octet-stream'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(max(0, end - start + 1)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.send_header('Cache-Control', cache_control)
+        self.send_header('Accept-Ranges', 'bytes')
+        if status == 206:
+            self.send_header('Content-Range', f"bytes {start}-{end}/{stat.st_size}")
+        self._cors()
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(1 << 16, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def _not_modified(self, etag, mtime):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def _parse_range(header, size):
+    """'bytes=시작-끝' 하나 → (시작, 끝) 포함 구간, 잘못되면 None"""
+    unit, _, spec = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in spec:
+        return None
+    first, _, last = spec.strip().partition('-')
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                return None
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+def create_server(service, host=SERVICE_HOST, port=SERVICE_PORT):
+    """서비스를 감싼 HTTP 서버 (요청마다 스레드)"""
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="YouTube → 중국어 자막 로컬 HTTP 변환 서비스")
+    parser.add_argument('--host', default=SERVICE_HOST, help="바인딩 주소 (기본값: SERVICE_HOST 또는 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help="포트 (기본값: SERVICE_PORT 또는 8000)")
+    parser.add_argument('--no-cache', action='store_true', help="변환 캐시를 사용하지 않음")
+    parser.add_argument('--parallel', type=int, default=None,
+                        help="CPU 병렬 음성 인식 작업자 수 (기본값: WHISPER_PARALLEL)")
+    parser.add_argument('--backend', choices=['whisper', 'ct2'], default=None, help="음성 인식 백엔드")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import transcript_pipeline
+    from youtube_to_transcript import PIPELINE as pipeline
+
+    args = parse_args(argv)
+    # 진행 중 세그먼트를 조회할 수 있게 스트리밍 모드로 실행
+    transcript_pipeline.STREAM_OUTPUT = True
+    if args.parallel is not None:
+        transcript_pipeline.PARALLEL_WORKERS = args.parallel
+    if args.backend:
+        transcript_pipeline.ASR_BACKEND = args.backend
+
+    print("🎬 YouTube → 중국어 텍스트 변환 서비스")
+    print("=" * 50)
+    from pipeline_metrics import set_tags, stage
+    set_tags(model=pipeline.cache_settings()[0], device=pipeline.device)
+    with stage('setup'):
+        pipeline.setup()
+
+    cache = None
+    if not args.no_cache:
+        from transcript_cache import TranscriptCache
+        cache = TranscriptCache()
+
+    service = TranscriptionService(pipeline, OUTPUT_ROOT, cache)
+    service.start()
+    server = create_server(service, args.host, args.port)
+    print(f"✅ 서비스 시작: http://{args.host}:{server.server_port}/ (작업 등록: POST /jobs)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ 서비스를 종료합니다.")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+압축 바이너리 자막 형식 (.tbin)
+세그먼트/단어의 시작 · 끝 시간을 열 단위 float32 배열로, 텍스트는 UTF-8 덩어리 하나와
+오프셋 배열로 저장합니다. 읽을 때는 파일을 메모리 맵으로 열어 필요한 세그먼트만 꺼냅니다.
+
+파일 구조 (리틀 엔디언, 모든 구역은 4바이트 정렬):
+    헤더    magic 'TBIN', version u16, flags u16, 세그먼트 수 u32, 단어 수 u32,
+            메타데이터 길이 u32, 텍스트 길이 u32
+    본문    메타데이터 JSON (language 등, 4바이트 정렬로 채움)
+            segment_start f32[n], segment_end f32[n]
+            segment_text u32[n+1]  (텍스트 덩어리 안 바이트 오프셋)
+            segment_words u32[n+1] (단어 배열 안 인덱스)
+            word_start f32[w], word_end f32[w]
+            word_text u32[w+1]     (텍스트 덩어리의 단어 부분 안 바이트 오프셋)
+            텍스트 덩어리 (UTF-8, 세그먼트 텍스트들 다음에 단어 텍스트들)
+flags의 1번 비트가 켜져 있으면 본문 전체가 zstd로 압축됨 (읽을 때 한 번에 풀어 메모리에 둠)
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_right
+
+MAGIC = b'TBIN'
+VERSION = 1
+FLAG_ZSTD = 1
+
+HEADER = struct.Struct('<4sHHIIII')
+
+# TRANSCRIPT_BIN_COMPRESS=zstd 이면 기본으로 zstd 압축 (zstandard 패키지 필요)
+DEFAULT_COMPRESS = os.getenv('TRANSCRIPT_BIN_COMPRESS', '') == 'zstd'
+
+
+def _le(values):
+    """array를 리틀 엔디언 바이트로"""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pad(data):
+    return data + b'\0' * (-len(data) % 4)
+
+
+class BinaryTranscriptBuilder:
+    """세그먼트 레코드를 하나씩 받아 열 단위 배열로 모으는 생성기 (write_transcript에서 사용)"""
+
+    def __init__(self, meta=None):
+        self.meta = dict(meta or {})
+        self.segment_start = array('f')
+        self.segment_end = array('f')
+        self.segment_text = array('I', [0])
+        self.segment_words = array('I', [0])
+        self.word_start = array('f')
+        self.word_end = array('f')
+        self.word_text = array('I', [0])
+        self.blob = bytearray()
+        self.word_blob = bytearray()
+
+    def add(self, segment):
+        """정규화된 세그먼트 레코드 하나 추가"""
+        self.segment_start.append(segment['start'])
+        self.segment_end.append(segment['end'])
+        self.blob += segment['text'].encode('utf-8')
+        self.segment_text.append(len(self.blob))
+        for word in segment.get('words') or ():
+            self.word_blob += word['word'].encode('utf-8')
+            self.word_text.append(len(self.word_blob))
+            self.word_start.append(word['start'])
+            self.word_end.append(word['end'])
+        self.segment_words.append(len(self.word_start))
+
+    def to_bytes(self, compress=None):
+        """파일 내용 전체를 바이트로 (compress가 None이면 TRANSCRIPT_BIN_COMPRESS 따름)"""
+        if compress is None:
+            compress = DEFAULT_COMPRESS
+        meta = json.dumps(self.meta, ensure_ascii=False).encode('utf-8')
+        body = b''.join([
+            _pad(meta),
+            _le(self.segment_start), _le(self.segment_end),
+            _le(self.segment_text), _le(self.segment_words),
+            _le(self.word_start), _le(self.word_end), _le(self.word_text),
+            bytes(self.blob), bytes(self.word_blob),
+        ])
+
+        flags = 0
+        if compress:
+            try:
+                import zstandard
+                body = zstandard.ZstdCompressor(level=10).compress(body)
+                flags |= FLAG_ZSTD
+            except ImportError:
+                print("⚠️ zstandard 패키지가 없어 압축하지 않고 저장합니다. pip install zstandard")
+        header = HEADER.pack(MAGIC, VERSION, flags, len(self.segment_start), len(self.word_start),
+                             len(meta), len(self.blob) + len(self.word_blob))
+        return header + body
+
+
+def write_binary(segments, path, meta=None, compress=None):
+    """정규화된 세그먼트 레코드 목록을 .tbin 파일로 저장"""
+    from transcript_writers import AtomicFile
+
+    builder = BinaryTranscriptBuilder(meta)
+    for segment in segments:
+        builder.add(segment)
+    with AtomicFile(path, binary=True) as f:
+        f.write(builder.to_bytes(compress))
+    return path
+
+
+class TranscriptReader:
+    """
+    .tbin 파일을 메모리 맵으로 열어 세그먼트를 임의 접근
+
+    len(reader), reader[i] → {'id', 'start', 'end', 'text', 'words'}, reader.find(초) → 세그먼트 번호
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = None
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"바이너리 자막 파일이 아닙니다: {path}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, flags, n, w, meta_len, blob_len = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"지원하지 않는 바이너리 자막 형식: {path}")
+
+            body = memoryview(self._map)[HEADER.size:]
+            if flags & FLAG_ZSTD:
+                import zstandard
+                body = memoryview(zstandard.ZstdDecompressor().decompress(bytes(body)))
+            self._body = body
+        except BaseException:
+            self.close()
+            raise
+
+        pos = -(-meta_len // 4) * 4
+        self.meta = json.loads(bytes(body[:meta_len]).decode('utf-8'))
+
+        def column(fmt, count):
+            nonlocal pos
+            view = body[pos:pos + 4 * count].cast(fmt)
+            pos += 4 * count
+            if sys.byteorder != 'little':
+                view = array(fmt, view)
+                view.byteswap()
+            return view
+
+        self.segment_start = column('f', n)
+        self.segment_end = column('f', n)
+        self.segment_text = column('I', n + 1)
+        self.segment_words = column('I', n + 1)
+        self.word_start = column('f', w)
+        self.word_end = column('f', w)
+        self.word_text = column('I', w + 1)
+        self._blob = body[pos:pos + blob_len]
+        self._word_blob = self._blob[self.segment_text[n]:]
+
+    def __len__(self):
+        return len(self.segment_start)
+
+    def _text(self, blob, start, end):
+        return bytes(blob[start:end]).decode('utf-8')
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        words = []
+        for j in range(self.segment_words[index], self.segment_words[index + 1]):
+            words.append({
+                'word': self._text(self._word_blob, self.word_text[j], self.word_text[j + 1]),
+                'start': self.word_start[j],
+                'end': self.word_end[j],
+            })
+        return {
+            'id': index + 1,
+            'start': self.segment_start[index],
+            'end': self.segment_end[index],
+            'text': self._text(self._blob, self.segment_text[index], self.segment_text[index + 1]),
+            'words': words,
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def find(self, seconds):
+        """seconds 시점에 시작한 마지막 세그먼트 번호 (없으면 -1)"""
+        return bisect_right(self.segment_start, seconds) - 1
+
+    def close(self):
+        # memoryview를 모두 놓아야 mmap을 닫을 수 있음
+        for name in ('segment_start', 'segment_end', 'segment_text', 'segment_words',
+                     'word_start', 'word_end', 'word_text', '_word_blob', '_blob', '_body'):
+            view = self.__dict__.pop(name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+변환 결과 캐시
+(영상 ID, 음성 해시, 모델, 언어, 디코딩 옵션)을 키로 txt/srt/vtt/json 등 결과 파일을 보관하고,
+같은 설정으로 다시 실행하면 다운로드와 음성 인식 없이 바로 돌려줍니다.
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+INDEX_VERSION = 1
+
+_VIDEO_ID_PATTERNS = [
+    re.compile(r'(?:v=|/shorts/|/embed/|/live/|/v/)([A-Za-z0-9_-]{11})'),
+    re.compile(r'youtu\.be/([A-Za-z0-9_-]{11})'),
+]
+
+
+def extract_video_id(url):
+    """YouTube URL에서 영상 ID(11자리) 추출, 없으면 None"""
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_or_copy(src, dst):
+    """하드링크를 시도하고, 실패하면 복사"""
+    dst = Path(dst)
+    if dst.exists():
+        if os.path.samefile(src, dst):
+            return dst
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+@contextmanager
+def file_lock(path):
+    """여러 프로세스 사이의 배타 잠금 (잠금 파일 사용, Windows는 msvcrt)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a+b') as f:
+        try:
+            import fcntl
+        except ImportError:
+            import msvcrt
+
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK은 약 10초 뒤 포기하므로 다시 시도
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class TranscriptCache:
+    """index.json 하나로 O(1) 조회하는 영속 변환 캐시"""
+
+    def __init__(self, root=None):
+        self.root = Path(root or os.getenv('TRANSCRIPT_CACHE_DIR', './output/.cache'))
+        self.index_file = self.root / 'index.json'
+        self.lock_file = self.root / 'index.lock'
+        self._lock = threading.Lock()
+        self._audio_hashes = {}
+        self._fingerprints = None
+        self._index_stamp = None
+        self._index = self._load_index()
+
+    def _index_file_stamp(self):
+        try:
+            stat = os.stat(self.index_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _load_index(self):
+        self._index_stamp = self._index_file_stamp()
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {'version': INDEX_VERSION, 'entries': {}, 'videos': {}, 'audio': {}}
+
+    def _refresh_index(self):
+        """다른 프로세스가 색인을 바꿨으면 다시 읽기 (self._lock 안에서 호출)"""
+        if self._index_file_stamp() != self._index_stamp:
+            self._index = self._load_index()
+
+    def _update_index(self, update):
+        """
+        파일 잠금 안에서 최신 색인을 다시 읽고 update(색인)를 적용한 뒤 원자적으로 저장
+
+        같은 출력 폴더를 쓰는 다른 프로세스(서버 · 일괄 처리 등)의 항목을 덮어쓰지 않음
+        """
+        with self._lock, file_lock(self.lock_file):
+            index = self._load_index()
+            update(index)
+            tmp_file = self.index_file.with_name(f"index.json.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False)
+            os.replace(tmp_file, self.index_file)
+            self._index = index
+            self._index_stamp = self._index_file_stamp()
+
+    @staticmethod
+    def settings_key(model, language, options):
+        """모델 · 언어 · 디코딩 옵션을 하나의 문자열 키로"""
+        payload = json.dumps([model, language, options or {}], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def audio_hash(self, audio_file):
+        """음성 파일 해시 (경로 · 수정 시각 · 크기가 같으면 한 번만 계산, 파일이 바뀌면 다시 계산)"""
+        stat = os.stat(audio_file)
+        key = (os.path.abspath(audio_file), stat.st_mtime_ns, stat.st_size)
+        if key not in self._audio_hashes:
+            self._audio_hashes[key] = hash_file(audio_file)
+        return self._audio_hashes[key]
+
+    def _get(self, table, key):
+        with self._lock:
+            self._refresh_index()
+            entry_id = self._index[table].get(key)
+            entry = self._index['entries'].get(entry_id) if entry_id else None
+        if entry is None:
+            return None
+        # 결과 파일이 지워졌으면 캐시 미스로 처리
+        for rel_path in entry['artifacts'].values():
+            if not (self.root / rel_path).exists():
+                return None
+        return entry
+
+    def lookup_video(self, video_id, model, language, options=None):
+        """영상 ID + 설정으로 조회 (다운로드 전)"""
+        if not video_id:
+            return None
+        return self._get('videos', f"{video_id}:{self.settings_key(model, language, options)}")
+
+    def lookup_audio(self, audio_file, model, language, options=None):
+        """음성 해시 + 설정으로 조회 (다운로드 후, 다른 URL의 같은 음성)"""
+        digest = self.audio_hash(audio_file)
+        return self._get('audio', f"{digest}:{self.settings_key(model, language, options)}")
+
+    def fingerprint_index(self):
+        """음성 지문 색인 (처음 쓸 때 생성)"""
+        from audio_fingerprint import FINGERPRINT_FILE, FingerprintIndex
+
+        with self._lock:
+            if self._fingerprints is None:
+                self._fingerprints = FingerprintIndex(self.root / FINGERPRINT_FILE)
+            return self._fingerprints
+
+    def lookup_similar(self, audio_file, model, language, options=None):
+        """
+        음성 지문으로 조회 (다른 URL의 재업로드 · 잘라낸 쇼츠 등)
+
+        새 음성의 지문을 색인에 등록하고, 같은 음성이거나 새 음성을 포함하는 음성의 결과가 있으면
+        (항목, 일치 정보 {'offset', 'matches', ...}) 반환, 없으면 None
+        """
+        from audio_fingerprint import fingerprint_file
+
+        digest = self.audio_hash(audio_file)
+        hashes, times, duration = fingerprint_file(audio_file)
+        fingerprints = self.fingerprint_index()
+        fingerprints.add(digest, hashes, times, duration)
+        settings = self.settings_key(model, language, options)
+        for match in fingerprints.match(hashes, times, duration, exclude=digest):
+            if not match['contained']:
+                continue  # 새 음성이 더 길면 기존 결과로는 일부만 채울 수 있음
+            entry = self._get('audio', f"{match['digest']}:{settings}")
+            if entry is not None:
+                return entry, dict(match, clip_duration=duration)
+        return None
+
+    def add_fingerprint(self, audio_file):
+        """색인에 없는 음성이면 지문 등록 (실패해도 캐시 저장은 계속)"""
+        from audio_fingerprint import fingerprint_file
+
+        try:
+            digest = self.audio_hash(audio_file)
+            fingerprints = self.fingerprint_index()
+            if digest not in fingerprints:
+                fingerprints.add(digest, *fingerprint_file(audio_file))
+        except Exception as e:
+            print(f"⚠️ 음성 지문 등록 실패: {e}")
+
+    def load_segments(self, entry):
+        """캐시 항목의 세그먼트 목록 (JSON → JSON Lines → SRT 순으로 있는 것 사용)"""
+        artifacts = entry['artifacts']
+        if 'json' in artifacts:
+            with open(self.root / artifacts['json'], 'r', encoding='utf-8') as f:
+                return json.load(f)['segments']
+        if 'jsonl' in artifacts:
+            from transcript_writers import read_jsonl
+            return list(read_jsonl(self.root / artifacts['jsonl']))
+        from subtitle_parser import read_cues
+        return [{'id': i, 'start': cue.start, 'end': cue.end, 'text': cue.text, 'words': []}
+                for i, cue in enumerate(read_cues(self.root / artifacts['srt']))]
+
+    def similar_result(self, entry, match):
+        """비슷한 음성의 결과를 새 음성 시간에 맞춰 옮긴 Whisper 결과 dict"""
+        from audio_fingerprint import clip_segments
+
+        offset = max(0.0, match['offset'])
+        segments = clip_segments(self.load_segments(entry), offset, match['clip_duration'])
+        return {
+            'text': ''.join(segment['text'] for segment in segments),
+            'segments': segments,
+            'language': entry['language'],
+        }
+
+    def link_video(self, entry, video_id, model, language, options=None):
+        """기존 항목을 다른 영상 ID에서도 찾을 수 있게 연결"""
+        if not video_id:
+            return
+        key = f"{video_id}:{self.settings_key(model, language, options)}"
+
+        def update(index):
+            index['videos'][key] = entry['id']
+
+        self._update_index(update)
+
+    def store(self, video_id, audio_file, model, language, options, artifacts):
+        """결과 파일들을 캐시에 보관하고 색인에 등록"""
+        settings = self.settings_key(model, language, options)
+        digest = self.audio_hash(audio_file)
+        entry_id = f"{digest[:32]}-{settings}"
+
+        object_dir = self.root / 'objects' / entry_id
+        object_dir.mkdir(parents=True, exist_ok=True)
+        stored = {}
+        for name, path in artifacts.items():
+            if not path or not Path(path).exists():
+                continue
+            link_or_copy(path, object_dir / Path(path).name)
+            stored[name] = str(Path('objects') / entry_id / Path(path).name)
+
+        entry = {
+            'id': entry_id,
+            'video_id': video_id,
+            'audio_hash': digest,
+            'model': model,
+            'language': language,
+            'options': options or {},
+            'artifacts': stored,
+            'created': int(time.time()),
+        }
+
+        def update(index):
+            index['entries'][entry_id] = entry
+            index['audio'][f"{digest}:{settings}"] = entry_id
+            if video_id:
+                index['videos'][f"{video_id}:{settings}"] = entry_id
+
+        self._update_index(update)
+        self.add_fingerprint(audio_file)
+        return entry
+
+    def materialize(self, entry, output_dir):
+        """캐시된 결과 파일을 출력 폴더에 연결하고 {종류: 경로} 반환"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        outputs = {}
+        for name, rel_path in entry['artifacts'].items():
+            src = self.root / rel_path
+            outputs[name] = link_or_copy(src, output_dir / src.name)
+        return outputs
+
+
+def fetch_or_download(cache, youtube_url, download, model, language, options=None, output_dir="./output"):
+    """
+    캐시를 먼저 확인하고 필요할 때만 다운로드
+
+    적중하면 {종류: 경로} dict, 아니면 다운로드한 음성 파일 경로(실패 시 None) 반환
+    """
+    from output_layout import video_dir
+
+    video_id = extract_video_id(youtube_url)
+    entry = cache.lookup_video(video_id, model, language, options)
+    if entry is not None:
+        print(f"⚡ 캐시 적중 (영상 ID {video_id}): 다운로드와 음성 인식을 건너뜁니다.")
+        return cache.materialize(entry, video_dir(output_dir, video_id))
+
+    audio_file = download(youtube_url)
+    if not audio_file:
+        return None
+
+    entry = cache.lookup_audio(audio_file, model, language, options)
+    if entry is not None:
+        print(f"⚡ 캐시 적중 (같은 음성): 음성 인식을 건너뜁니다.")
+        cache.link_video(entry, video_id, model, language, options)
+        return cache.materialize(entry, Path(audio_file).parent)
+    return audio_file
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+이어서 하는 음성 인식 (체크포인트)
+긴 음성을 무음 지점에서 구간으로 나눠 차례로 변환하고, 구간이 끝날 때마다
+세그먼트와 다음 구간용 프롬프트(디코더 문맥)를 음성 옆 사이드카 파일에 추가합니다.
+같은 설정으로 다시 실행하면 마지막으로 끝난 구간 다음부터 이어서 변환합니다.
+
+사이드카 형식 (JSON Lines, 추가 전용):
+    1행: {"version", "settings", "audio", "windows": [[시작, 끝], ...]}
+    이후: {"window": 번호, "prompt": 프롬프트, "segments": [...]}
+"""
+
+import os
+import json
+from pathlib import Path
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SUFFIX = '.checkpoint.jsonl'
+
+# 체크포인트 구간 길이 (초): 실패해도 최대 이만큼만 다시 변환
+CHECKPOINT_MIN_SECONDS = 120
+CHECKPOINT_MAX_SECONDS = 300
+
+
+def checkpoint_path(audio_file):
+    """음성 파일 옆 사이드카 경로 (예: audio.wav → audio.checkpoint.jsonl)"""
+    return Path(audio_file).with_suffix(CHECKPOINT_SUFFIX)
+
+
+def find_resumable_audio(output_root, video_id, extension):
+    """output/<영상 ID>/audio.<확장자> 옆에 체크포인트가 있으면 그 음성 경로 (다시 받지 않고 이어서 변환), 없으면 None"""
+    from output_layout import AUDIO_BASENAME, video_dir
+
+    audio_file = video_dir(output_root, video_id) / f"{AUDIO_BASENAME}.{extension}"
+    if audio_file.exists() and checkpoint_path(audio_file).exists():
+        return audio_file
+    return None
+
+
+def remove_checkpoint(audio_file):
+    """결과 파일을 모두 만든 뒤 사이드카 삭제"""
+    try:
+        os.unlink(checkpoint_path(audio_file))
+    except FileNotFoundError:
+        pass
+
+
+class TranscriptCheckpoint:
+    """구간별 변환 결과를 추가 전용으로 기록하는 사이드카 파일"""
+
+    def __init__(self, audio_file, settings):
+        self.path = checkpoint_path(audio_file)
+        self.settings = settings
+        self._file = None
+
+    def _header(self, audio_hash, windows):
+        return {
+            'version': CHECKPOINT_VERSION,
+            'settings': self.settings,
+            'audio': audio_hash,
+            'windows': [[int(start), int(end)] for start, end in windows],
+        }
+
+    def resume(self, audio_hash, windows):
+        """
+        같은 설정 · 같은 음성 · 같은 구간 계획이면 끝난 구간 기록 목록을, 아니면 빈 목록 반환
+
+        중간에 끊긴 마지막 줄은 잘라내고, 이후 append()는 그 뒤에 이어 씀
+        """
+        header = self._header(audio_hash, windows)
+        done = []
+        good_size = 0
+        try:
+            with open(self.path, 'rb') as f:
+                lines = iter(f)
+                first = next(lines, b'')
+                if first.endswith(b'\n') and json.loads(first) == header:
+                    good_size = len(first)
+                    for line in lines:
+                        if not line.endswith(b'\n'):
+                            break
+                        record = json.loads(line)
+                        if record.get('window') != len(done):
+                            break
+                        done.append(record)
+                        good_size += len(line)
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"⚠️ 체크포인트 파일을 읽을 수 없어 처음부터 변환합니다: {e}")
+            done = []
+            good_size = 0
+
+        if good_size:
+            self._file = open(self.path, 'r+b')
+            self._file.truncate(good_size)
+            self._file.seek(good_size)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'wb')
+            self._write(header)
+        return done
+
+    def append(self, index, segments, prompt):
+        """끝난 구간 하나를 기록 (디스크까지 flush)"""
+        self._write({'window': index, 'prompt': prompt, 'segments': segments})
+
+    def _write(self, record):
+        self._file.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def resumable_segments(model, audio_file, settings, min_seconds=CHECKPOINT_MIN_SECONDS,
+                       max_seconds=CHECKPOINT_MAX_SECONDS, **options):
+    """
+    체크포인트를 남기며 구간별로 변환하고 세그먼트를 하나씩 반환
+
+    이미 끝난 구간의 세그먼트는 사이드카에서 읽어 먼저 반환하고, 남은 구간부터 디코딩
+    model: transcribe()가 있는 백엔드 또는 상주 작업자
+    settings: 설정 비교용 값 (설정이 바뀌면 처음부터 변환)
+    """
+    from audio_io import open_pcm
+
+    # 메모리 맵으로 열어 구간만 읽음 (음성 길이와 관계없이 메모리 일정)
+    with open_pcm(audio_file) as audio:
+        yield from _resumable_segments(model, audio, audio_file, settings, min_seconds, max_seconds, options)
+
+
+def _resumable_segments(model, audio, audio_file, settings, min_seconds, max_seconds, options):
+    from asr_backends import decode_windows
+    from parallel_transcribe import plan_chunks
+    from transcript_cache import hash_file
+
+    windows = plan_chunks(audio, min_seconds=min_seconds, max_seconds=max_seconds)
+    options = dict(options)
+    prompt = options.pop('initial_prompt', None)
+    index = 0
+
+    # 한 구간이면 체크포인트 없이 바로 변환
+    if len(windows) == 1:
+        for _, segments, _ in decode_windows(model, audio, enumerate(windows), prompt, **options):
+            for segment in segments:
+                segment['id'] = index
+                index += 1
+                yield segment
+        return
+
+    checkpoint = TranscriptCheckpoint(audio_file, settings)
+    try:
+        done = checkpoint.resume(hash_file(audio_file), windows)
+        if done:
+            print(f"⏩ 체크포인트에서 이어서 변환: {len(done)}/{len(windows)} 구간 완료됨")
+            prompt = done[-1]['prompt']
+        completed = len(done)
+        for record in done:
+            for segment in record['segments']:
+                segment['id'] = index
+                index += 1
+                yield segment
+        del done
+
+        remaining = list(enumerate(windows))[completed:]
+        for window, segments, prompt in decode_windows(model, audio, remaining, prompt, **options):
+            checkpoint.append(window, segments, prompt)
+            for segment in segments:
+                segment['id'] = index
+                index += 1
+                yield segment
+    finally:
+        checkpoint.close()
+
+
+def collect_result(segments, language):
+    """세그먼트 이터레이터를 Whisper 결과 dict 모양으로 모으기"""
+    segments = list(segments)
+    return {
+        'text': ''.join(segment['text'] for segment in segments),
+        'segments': segments,
+        'language': language,
+    }
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+YouTube → 중국어 텍스트 변환 파이프라인 (공용)
+캐시 확인 · 다운로드 · 음성 지문 · 음성 인식 · 결과 파일 생성 · 일괄 처리 · 명령행 실행 흐름을 한곳에 둡니다.
+
+youtube_to_transcript.py(번체 유지)와 youtube_transcript_standalone.py(간체 변환, JSON · 바이너리 추가)는
+모델 · 출력 형식 · 다운로드 · 환경 설정 · 출력 방식만 정해 TranscriptPipeline을 만듭니다.
+"""
+
+import os
+from pathlib import Path
+
+# 음성 다운로드 모드 (pcm: 음성 인식용 16 kHz 모노 WAV, mp3: 기존 방식)
+DEFAULT_AUDIO_MODE = os.getenv('AUDIO_MODE', 'pcm')
+
+# 인식 언어 (변환 캐시 키에도 사용)
+LANGUAGE = "zh"
+
+# CPU 병렬 변환 프로세스 수 (0이면 사용 안 함)
+PARALLEL_WORKERS = int(os.getenv('WHISPER_PARALLEL', '0'))
+
+# 음성 인식 엔진 (whisper: PyTorch, ct2: CTranslate2 int8) 과 로컬 모델 폴더
+ASR_BACKEND = os.getenv('ASR_BACKEND', 'whisper')
+ASR_MODEL_DIR = os.getenv('ASR_MODEL_DIR') or None
+
+# 세그먼트를 디코딩되는 대로 SRT/VTT/JSONL에 바로 기록 (병렬 모드에서는 사용 안 함)
+STREAM_OUTPUT = os.getenv('WHISPER_STREAM', '0') == '1'
+
+# 긴 음성은 구간마다 체크포인트를 남기고, 다시 실행하면 이어서 변환 (선택, 병렬 모드에서는 사용 안 함)
+# 구간 길이에 따라 결과가 달라질 수 있어 구간 계획(window_plan)을 캐시 키에 넣음
+CHECKPOINT = os.getenv('WHISPER_CHECKPOINT', '0') == '1'
+
+# 결과 파일 종류별 표시 이름
+OUTPUT_LABELS = {
+    'audio': '🎵 음성',
+    'txt': '📄 텍스트',
+    'srt': '🎬 SRT 자막',
+    'vtt': '🌐 VTT 자막',
+    'json': '📊 JSON 데이터',
+    'bin': '📦 바이너리 자막',
+    'highlight': '🔤 글자별 하이라이트 JSON',
+    'html': '🎯 자막 하이라이트',
+}
+
+
+def window_plan():
+    """구간별 디코딩의 (최소 초, 최대 초), 병렬 모드(무음 구간 분할)면 None"""
+    if PARALLEL_WORKERS:
+        return None  # 병렬 모드는 무음 구간 분할 (캐시 키의 chunked)
+    if CHECKPOINT and not STREAM_OUTPUT:
+        from transcript_checkpoint import CHECKPOINT_MIN_SECONDS, CHECKPOINT_MAX_SECONDS
+        return CHECKPOINT_MIN_SECONDS, CHECKPOINT_MAX_SECONDS
+    from asr_backends import STREAM_MIN_SECONDS, STREAM_MAX_SECONDS
+    return STREAM_MIN_SECONDS, STREAM_MAX_SECONDS
+
+
+def plain(text, level=None):
+    """기본 출력 (level: info/ok/warn/error/title/done/path/text, 색상 없는 출력에서는 무시)"""
+    print(text)
+
+
+def parse_args(argv=None, description="YouTube → 중국어 텍스트 변환기"):
+    """명령행 인자 파싱"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('url', nargs='?', help="처리할 YouTube URL")
+    parser.add_argument('--batch', metavar='FILE', help="URL 목록 파일 (한 줄에 하나, '-'는 표준 입력)")
+    parser.add_argument('--no-cache', action='store_true', help="변환 캐시를 사용하지 않음")
+    parser.add_argument('--audio-format', choices=['pcm', 'mp3'], default=None,
+                        help="음성 다운로드 형식 (기본값: AUDIO_MODE 환경 변수 또는 pcm)")
+    parser.add_argument('--parallel', type=int, metavar='N', default=None,
+                        help="무음 구간으로 나눠 N개 프로세스에서 병렬 변환 (CPU 전용, 기본값: WHISPER_PARALLEL)")
+    parser.add_argument('--backend', choices=['whisper', 'ct2'], default=None,
+                        help="음성 인식 엔진 (whisper: PyTorch, ct2: CTranslate2 int8, 기본값: ASR_BACKEND)")
+    parser.add_argument('--model-dir', metavar='DIR', default=None,
+                        help="로컬 모델 폴더 (기본값: ASR_MODEL_DIR)")
+    parser.add_argument('--checkpoint', action='store_true',
+                        help="2~5분 구간마다 체크포인트를 남겨 중단 후 이어서 변환 (기본값: WHISPER_CHECKPOINT=1)")
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help="WHISPER_CHECKPOINT=1이어도 체크포인트를 사용하지 않음")
+    parser.add_argument('--stream', action='store_true',
+                        help="세그먼트가 나오는 대로 SRT/VTT/JSONL에 바로 기록 (기본값: WHISPER_STREAM=1)")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT', default=None,
+                        help="Prometheus 측정값 서버 포트 (GET /metrics, 기본값: METRICS_PORT)")
+    parser.add_argument('--profile', action='store_true',
+                        help="단계별 cProfile · tracemalloc 결과를 output/<영상 ID>/profile/에 저장 (기본값: PIPELINE_PROFILE=1)")
+    parser.add_argument('--profile-dir', metavar='DIR', default=None,
+                        help="프로파일 결과를 출력 폴더 대신 DIR/<영상 ID>/profile/에 저장 (--profile 포함)")
+    parser.add_argument('--profile-flame', action='store_true',
+                        help="스택 샘플링 플레임 그래프까지 생성 (--profile 포함, 기본값: PIPELINE_PROFILE_FLAME=1)")
+    return parser.parse_args(argv)
+
+
+def apply_args(args):
+    """명령행 인자로 환경 변수 기본값 덮어쓰기"""
+    global PARALLEL_WORKERS, ASR_BACKEND, ASR_MODEL_DIR, STREAM_OUTPUT, CHECKPOINT
+    if args.parallel is not None:
+        PARALLEL_WORKERS = args.parallel
+    if args.backend:
+        ASR_BACKEND = args.backend
+    if args.model_dir:
+        ASR_MODEL_DIR = args.model_dir
+    if args.stream:
+        STREAM_OUTPUT = True
+    if args.checkpoint:
+        CHECKPOINT = True
+    if args.no_checkpoint:
+        CHECKPOINT = False
+
+
+class TranscriptPipeline:
+    """
+    실행 스크립트 하나의 변환 파이프라인
+
+    model_size, device: Whisper 모델과 디바이스 (device=None이면 백엔드가 선택)
+    simplify: 번체→간체 변환 여부 (캐시 키에도 들어감)
+    formats: 결과 파일 형식 (transcript_writers.OUTPUT_SUFFIXES의 키)
+    download_audio(url, audio_mode=...): 음성 파일 경로 또는 None
+    setup(): 의존성 확인 · 설치
+    say(text, level): 출력 함수 (plain 또는 색상 출력)
+    output_dir: download_audio가 음성을 두는 출력 루트 (output/<영상 ID>/audio.<확장자>),
+                HTML 플레이어 공용 번들 · 라이브러리도 여기에 둠
+    """
+
+    def __init__(self, model_size, device, simplify, formats, download_audio, setup,
+                 say=plain, header=None, description="YouTube → 중국어 텍스트 변환기",
+                 setup_title=None, ask_url=None, output_dir="./output"):
+        self.model_size = model_size
+        self.device = device
+        self.simplify = simplify
+        self.formats = tuple(formats)
+        self.download_audio = download_audio
+        self.setup = setup
+        self.say = say
+        self.header = header
+        self.description = description
+        self.setup_title = setup_title
+        self.ask_url = ask_url
+        self.output_dir = output_dir
+        self.decode_options = {'word_timestamps': True}
+        if simplify:
+            self.decode_options['simplify'] = 't2s'
+
+    def cache_settings(self):
+        """캐시 키용 (모델, 언어, 디코딩 옵션)"""
+        options = dict(self.decode_options, chunked=True) if PARALLEL_WORKERS else self.decode_options
+        windows = window_plan()
+        if windows:
+            options = dict(options, windowed=list(windows))  # 구간별 디코딩이라 결과가 다를 수 있음
+        model = self.model_size if ASR_BACKEND == 'whisper' else f"{ASR_BACKEND}:{self.model_size}"
+        return model, LANGUAGE, options
+
+    def download_with_cache(self, youtube_url, cache, audio_mode=None):
+        """캐시 적중이면 결과 파일 dict, 아니면 다운로드한 음성 경로 반환"""
+        from pipeline_metrics import stage, file_size
+        from transcript_cache import fetch_or_download, extract_video_id
+
+        audio_mode = audio_mode or DEFAULT_AUDIO_MODE
+
+        def download(url):
+            with stage('download', video_id=extract_video_id(url)) as metrics:
+                audio_file = self.resumable_audio(url, audio_mode)
+                metrics.extra['resumed'] = audio_file is not None
+                if audio_file is None:
+                    audio_file = self.download_audio(url, audio_mode=audio_mode)
+                metrics.bytes_out = file_size(audio_file)
+                metrics.failed = not audio_file
+                return audio_file
+
+        if cache is None:
+            return download(youtube_url)
+        result = fetch_or_download(cache, youtube_url, download, *self.cache_settings())
+        if isinstance(result, str):
+            # 다운로드 직후 음성 지문으로 재업로드 · 잘라낸 영상 확인
+            result = self.reuse_similar_transcript(cache, youtube_url, result) or result
+        if isinstance(result, dict) and 'html' in result:
+            self.update_library_index(result['html'])
+        return result
+
+    def resumable_audio(self, youtube_url, audio_mode):
+        """체크포인트 모드에서 중단된 변환의 음성이 남아 있으면 그 경로 (다시 다운로드하지 않음), 없으면 None"""
+        from audio_io import audio_extension
+        from transcript_cache import extract_video_id
+        from transcript_checkpoint import find_resumable_audio
+
+        video_id = extract_video_id(youtube_url)
+        if not CHECKPOINT or not video_id:
+            return None
+        audio_file = find_resumable_audio(self.output_dir, video_id, audio_extension(audio_mode))
+        if audio_file is None:
+            return None
+        self.say(f"⏩ 중단된 변환의 음성 파일을 다시 사용합니다: {audio_file}", 'ok')
+        return str(audio_file)
+
+    def reuse_similar_transcript(self, cache, youtube_url, audio_file):
+        """음성 지문이 일치하는 기존 결과가 있으면 시간을 맞춰 결과 파일 생성 ({종류: 경로}, 없으면 None)"""
+        from output_layout import video_id_of
+        from pipeline_metrics import stage, file_size
+
+        try:
+            with stage('fingerprint', video_id=video_id_of(audio_file)) as metrics:
+                metrics.bytes_in = file_size(audio_file)
+                found = cache.lookup_similar(audio_file, *self.cache_settings())
+                metrics.extra['matched'] = found is not None
+            if found is None:
+                return None
+            entry, match = found
+            self.say(f"⚡ 비슷한 음성 발견 (일치 {match['matches']}개, {match['offset']:.1f}초 위치): "
+                     f"기존 결과를 옮겨 씁니다.", 'ok')
+            result = cache.similar_result(entry, match)
+        except Exception as e:
+            self.say(f"⚠️ 음성 지문 확인 실패: {e}", 'warn')
+            return None
+
+        outputs = self.write_outputs(result, audio_file)
+        self.store_in_cache(cache, youtube_url, outputs)
+        return outputs
+
+    def update_library_index(self, html_file):
+        """출력 폴더의 라이브러리(index.html)에 플레이어 페이지 등록"""
+        from html_player import update_library
+        from pipeline_metrics import stage
+
+        try:
+            with stage('library'):
+                update_library(self.output_dir, html_file)
+        except Exception as e:
+            self.say(f"⚠️ 라이브러리 갱신 실패: {e}", 'warn')
+
+    def store_in_cache(self, cache, youtube_url, outputs):
+        """생성한 결과 파일들을 캐시에 등록"""
+        from transcript_cache import extract_video_id
+
+        if cache is None:
+            return
+        try:
+            cache.store(extract_video_id(youtube_url), outputs['audio'], *self.cache_settings(), artifacts=outputs)
+        except Exception as e:
+            self.say(f"⚠️ 캐시 저장 실패: {e}", 'warn')
+
+    def get_default_worker(self):
+        """설정에 맞는 상주 Whisper 작업자 반환"""
+        from whisper_worker import get_worker
+        return get_worker(self.model_size, self.device, backend=ASR_BACKEND, model_dir=ASR_MODEL_DIR)
+
+    @staticmethod
+    def load_model(worker):
+        """아직 올라오지 않은 모델을 로드 (로딩 시간 측정)"""
+        from pipeline_metrics import stage
+
+        if worker.loaded:
+            return
+        with stage('model_load'):
+            worker.load()
+
+    def run_whisper(self, audio_file, worker=None, on_segment=None):
+        """상주 Whisper 모델로 음성 인식만 수행 (결과 dict 반환, 모델 로딩과 인식 시간 · 실시간 배율 기록)"""
+        from audio_io import audio_duration
+        from output_layout import video_id_of
+        from pipeline_metrics import stage, file_size
+
+        # 상주 모델 사용 (프로세스당 한 번만 로드)
+        if worker is None:
+            worker = self.get_default_worker()
+        if not PARALLEL_WORKERS:
+            self.load_model(worker)
+
+        with stage('transcribe', video_id=video_id_of(audio_file)) as metrics:
+            metrics.bytes_in = file_size(audio_file)
+            result = self._run_whisper(audio_file, worker, on_segment)
+            metrics.audio_seconds = audio_duration(audio_file)
+            if metrics.audio_seconds is None and result.get('segments'):
+                metrics.audio_seconds = result['segments'][-1]['end']  # WAV가 아니면 마지막 세그먼트 끝
+        return result
+
+    def _run_whisper(self, audio_file, worker, on_segment=None):
+        """음성 인식 본체 (병렬 · 체크포인트 · 스트리밍 모드 선택, on_segment는 스트리밍 모드에서 세그먼트마다 호출)"""
+        # CPU 병렬 모드: 무음 지점에서 나눠 여러 프로세스에서 변환
+        if PARALLEL_WORKERS:
+            from parallel_transcribe import transcribe_parallel
+            return transcribe_parallel(
+                audio_file, self.model_size, device=self.device or 'cpu', workers=PARALLEL_WORKERS,
+                backend=ASR_BACKEND, model_dir=ASR_MODEL_DIR,
+                language=LANGUAGE, word_timestamps=True
+            )
+
+        # 음성은 메모리 맵으로 열어 무음 지점에서 자른 구간씩 디코딩 (음성 길이와 관계없이 메모리 일정)
+        min_seconds, max_seconds = window_plan()
+        options = dict(language=LANGUAGE, word_timestamps=True, verbose=True)
+        if CHECKPOINT:
+            # 체크포인트 모드: 구간마다 음성 옆 사이드카에 기록, 중단 후 다시 실행하면 이어서 변환
+            from transcript_cache import TranscriptCache
+            from transcript_checkpoint import resumable_segments
+            segments = resumable_segments(
+                worker, audio_file, TranscriptCache.settings_key(*self.cache_settings()),
+                min_seconds=min_seconds, max_seconds=max_seconds, **options
+            )
+        else:
+            from asr_backends import stream_windows
+            segments = stream_windows(worker, str(audio_file), min_seconds, max_seconds, **options)
+
+        # 스트리밍 모드: 세그먼트가 나오는 즉시 SRT/VTT/JSONL에 기록 (메모리에 모으지 않음)
+        if STREAM_OUTPUT:
+            from transcript_writers import STREAM_FORMATS, output_paths, stream_transcript
+            paths = output_paths(Path(audio_file).with_suffix(''), STREAM_FORMATS)
+            self.say("🔄 음성 인식 처리 중 (자막 실시간 기록)...", 'warn')
+            stream_transcript(segments, paths, simplify=self.simplify, on_segment=on_segment)
+            return {'language': LANGUAGE, 'streamed': paths}
+
+        # 세그먼트만 모아 결과 dict로 (음성 배열은 구간이 끝나면 바로 해제)
+        from transcript_checkpoint import collect_result
+        self.say("🔄 음성 인식 처리 중...", 'warn')
+        return collect_result(segments, LANGUAGE)
+
+    def write_outputs(self, result, audio_file):
+        """인식 결과로 설정된 형식의 결과 파일을 한 번의 순회로 생성 ({종류: 경로} 반환)"""
+        from text_normalize import normalize_text, normalize_segments
+        from output_layout import video_id_of
+        from pipeline_metrics import stage, file_size
+        from transcript_writers import STREAM_FORMATS, output_paths, write_transcript, read_jsonl
+
+        streamed = result.get('streamed')
+        if streamed:
+            # 스트리밍 모드: SRT/VTT/JSONL은 이미 기록됨, 나머지는 JSONL을 다시 읽으며 생성
+            segments = read_jsonl(streamed['jsonl'])
+            text_content = ''.join(segment['text'] for segment in read_jsonl(streamed['jsonl']))
+            formats = [fmt for fmt in self.formats if fmt not in STREAM_FORMATS]
+        else:
+            # 정규화 단계: 공백 정리 (+ 번체→간체 변환)를 세그먼트마다 한 번만 수행
+            segments = normalize_segments(result["segments"], simplify=self.simplify)
+            text_content = normalize_text(result["text"], simplify=self.simplify)
+            formats = self.formats
+
+        # 결과 파일들 생성 (각 파일은 임시 파일 → 이름 변경으로 원자적 저장, 한 번의 순회라 형식별 크기만 따로 기록)
+        paths = output_paths(Path(audio_file).with_suffix(''), formats)
+        with stage('write', video_id=video_id_of(audio_file)) as metrics:
+            outputs = write_transcript(segments, paths, text=text_content, audio_file=audio_file,
+                                       json_data={'language': result.get('language')},
+                                       assets_root=self.output_dir)
+            sizes = {kind: file_size(path) for kind, path in outputs.items()}
+            metrics.bytes_out = sum(sizes.values())
+            metrics.extra['formats'] = sizes
+        outputs.update(streamed or {})
+        outputs['audio'] = audio_file
+
+        # 결과 파일을 모두 만들었으므로 체크포인트 삭제
+        from transcript_checkpoint import remove_checkpoint
+        remove_checkpoint(audio_file)
+
+        # 라이브러리 목록 갱신 (영상을 열 때 자막 데이터만 불러옴)
+        self.update_library_index(outputs['html'])
+
+        self.say(f"✅ 변환 완료!", 'ok')
+        for kind in self.formats:
+            self.say(f"{OUTPUT_LABELS[kind]}: {outputs[kind]}", 'path')
+
+        # 결과 미리보기
+        self.say(f"\n📝 텍스트 미리보기{' (간체)' if self.simplify else ''}:", 'title')
+        self.say("=" * 50, 'path')
+        preview_text = text_content[:200] + "..." if len(text_content) > 200 else text_content
+        self.say(preview_text, 'text')
+        self.say("=" * 50, 'path')
+
+        return outputs
+
+    def transcribe_audio(self, audio_file, worker=None):
+        """Whisper로 음성을 중국어 텍스트로 변환 (결과 파일 {종류: 경로}, 실패 시 None)"""
+        self.say(f"🎯 Whisper로 중국어 텍스트 변환 중...", 'info')
+
+        try:
+            result = self.run_whisper(audio_file, worker)
+            return self.write_outputs(result, audio_file)
+
+        except Exception as e:
+            self.say(f"❌ 텍스트 변환 중 오류: {e}", 'error')
+            return None
+
+    def process_batch(self, urls, cache=None, audio_mode=None):
+        """여러 URL을 다운로드/인식/파일 생성 파이프라인으로 일괄 처리 (모두 성공하면 True)"""
+        from batch_transcribe import run_batch, print_summary
+
+        worker = self.get_default_worker()
+
+        def postprocess(result, audio_file, youtube_url):
+            outputs = self.write_outputs(result, audio_file)
+            self.store_in_cache(cache, youtube_url, outputs)
+            return outputs
+
+        results = run_batch(
+            urls,
+            download=lambda youtube_url: self.download_with_cache(youtube_url, cache, audio_mode),
+            transcribe=lambda audio_file: self.run_whisper(audio_file, worker),
+            postprocess=postprocess,
+            download_workers=2,  # 영상별 임시 폴더를 쓰므로 동시 다운로드 안전
+            warmup=None if PARALLEL_WORKERS else lambda: self.load_model(worker),
+        )
+        return print_summary(results)
+
+    def main(self, argv=None):
+        """명령행 실행 (종료 코드 반환: 0 성공, 1 실패가 하나라도 있음)"""
+        args = parse_args(argv, self.description)
+        apply_args(args)
+        if self.header:
+            self.header()
+
+        # 측정값 태그 (모델 · 디바이스), 포트를 지정하면 /metrics 서버 시작
+        from pipeline_metrics import set_tags, stage, start_metrics_server
+        set_tags(model=self.cache_settings()[0], device=self.device or ('cpu' if ASR_BACKEND == 'ct2' else 'auto'))
+        start_metrics_server(args.metrics_port)
+
+        # 프로파일링 (--profile 또는 PIPELINE_PROFILE): 측정 단계마다 결과 저장
+        from pipeline_profile import enable_profiling
+        enable_profiling(args.profile_dir or ('1' if args.profile or args.profile_flame else None), args.profile_flame)
+
+        if args.batch:
+            from batch_transcribe import read_urls
+
+            urls = read_urls(args.batch)
+            self.say(f"\n📺 일괄 처리할 영상: {len(urls)}개", 'title')
+        else:
+            youtube_url = args.url or self.ask_url()
+            self.say(f"\n📺 처리할 영상: {youtube_url}", 'title')
+
+        # 1. 의존성 확인 · 설치
+        steps = iter(['1️⃣', '2️⃣', '3️⃣'])
+        if self.setup_title:
+            self.say(f"\n{next(steps)} {self.setup_title}", 'info')
+        with stage('setup'):
+            self.setup()
+
+        cache = None
+        if not args.no_cache:
+            from transcript_cache import TranscriptCache
+            cache = TranscriptCache()
+
+        if args.batch:
+            return 0 if self.process_batch(urls, cache, args.audio_format) else 1
+
+        # 2. 음성 다운로드
+        self.say(f"\n{next(steps)} 음성 파일 다운로드 중...", 'info')
+        audio_file = self.download_with_cache(youtube_url, cache, args.audio_format)
+
+        if not audio_file:
+            self.say("❌ 음성 다운로드에 실패했습니다.", 'error')
+            return 1
+
+        if isinstance(audio_file, dict):
+            self.say(f"\n🎉 캐시된 결과를 사용했습니다!", 'done')
+            self.say(f"📁 결과 파일들:", 'title')
+            for kind, path in audio_file.items():
+                self.say(f"   {kind}: {path}", 'path')
+            return 0
+
+        # 3. 텍스트 변환 + 결과 파일 생성 (설정된 형식 한 번에)
+        self.say(f"\n{next(steps)} 중국어 텍스트 변환 중...", 'info')
+        outputs = self.transcribe_audio(audio_file)
+
+        if not outputs:
+            self.say("❌ 텍스트 변환에 실패했습니다.", 'error')
+            return 1
+
+        self.store_in_cache(cache, youtube_url, outputs)
+
+        self.say(f"\n🎉 모든 작업이 완료되었습니다!", 'done')
+        self.say(f"📁 결과 파일들:", 'title')
+        for kind in ('audio',) + self.formats:
+            self.say(f"   {OUTPUT_LABELS[kind]}: {outputs[kind]}", 'path')
+
+        self.say(f"\n💡 HTML 파일을 브라우저에서 열어서 자막 하이라이트를 확인하세요!", 'warn')
+        return 0
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+자막 파일 생성기
+정규화된 세그먼트 레코드를 한 번만 순회하면서 txt · SRT · VTT · JSON · 바이너리 · HTML을 함께 쓰고,
+각 파일은 임시 파일에 쓴 뒤 이름을 바꿔(원자적 교체) 중간 상태가 남지 않게 합니다.
+StreamingWriter는 디코딩 중인 세그먼트를 SRT · VTT · JSON Lines에 바로 이어 씁니다.
+"""
+
+import os
+import json
+import threading
+from contextlib import ExitStack
+from pathlib import Path
+
+# 형식별 파일 이름 접미사 (base_path + 접미사)
+OUTPUT_SUFFIXES = {
+    'txt': '.txt',
+    'srt': '.srt',
+    'vtt': '.vtt',
+    'json': '.json',
+    'jsonl': '.jsonl',
+    'bin': '.tbin',
+    'highlight': '_word_highlight.json',
+    'html': '_highlight.html',
+}
+
+# StreamingWriter가 이어 쓰는 형식
+STREAM_FORMATS = ('srt', 'vtt', 'jsonl')
+
+
+def format_timestamp(seconds):
+    """초를 SRT 형식 타임스탬프로 변환"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    seconds = seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}".replace('.', ',')
+
+
+def format_timestamp_vtt(seconds):
+    """초를 VTT 형식 타임스탬프로 변환"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    seconds = seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}"
+
+
+class AtomicFile:
+    """임시 파일에 쓰고, 성공했을 때만 최종 경로로 교체하는 텍스트(또는 바이너리) 파일"""
+
+    def __init__(self, path, binary=False):
+        self.path = Path(path)
+        # 같은 경로를 여러 프로세스 · 스레드가 동시에 써도 임시 파일이 겹치지 않게 함
+        self.tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        self.binary = binary
+        self._file = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.binary:
+            self._file = open(self.tmp_path, 'wb')
+        else:
+            self._file = open(self.tmp_path, 'w', encoding='utf-8')
+        return self._file
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            try:
+                os.unlink(self.tmp_path)
+            except OSError:
+                pass
+        return False
+
+
+def output_paths(base_path, formats):
+    """base_path(확장자 제외)에서 형식별 출력 경로 생성"""
+    base_path = Path(base_path)
+    return {fmt: base_path.with_name(base_path.name + OUTPUT_SUFFIXES[fmt]) for fmt in formats}
+
+
+def write_transcript(segments, paths, text=None, audio_file=None, json_data=None, assets_root=None):
+    """
+    세그먼트 목록을 한 번 순회하며 paths에 지정된 형식을 모두 생성
+
+    segments: normalize_segments()가 만든 레코드 목록
+    paths: {형식: 경로} ('txt', 'srt', 'vtt', 'json', 'bin', 'highlight', 'html')
+    text: txt 파일 내용 (없으면 세그먼트 텍스트를 이어 붙임)
+    audio_file: HTML 플레이어가 재생할 음성 파일
+    json_data: JSON · 바이너리 머리말에 넣을 값 (language 등, 'segments'는 무시)
+    assets_root: HTML 플레이어 공용 번들(player/)을 둘 폴더 (없으면 페이지 옆)
+
+    JSON은 세그먼트와 단어만 담는 가벼운 형식:
+        {"language", "text", "segments": [{"id", "start", "end", "text", "words": [{"word", "start", "end"}]}]}
+    highlight는 단어 타이밍을 글자에 나눠 준 글자별 하이라이트 JSON (srt_to_word_highlight 형식)
+    html은 자막 데이터 파일(*.cues.js, 반환값의 'cues')을 스트리밍으로 쓰고, 공용 번들을 불러오는 작은 페이지를 만듦
+    """
+    from html_player import cues_path_for, render_head, render_cue, render_tail, write_player_page
+    from transcript_binary import BinaryTranscriptBuilder
+
+    if 'html' in paths and audio_file is None:
+        raise ValueError("HTML 플레이어에는 audio_file이 필요합니다.")
+
+    meta = {k: v for k, v in (json_data or {}).items() if k not in ('segments', 'text')}
+    outputs = dict(paths)
+    if 'html' in outputs:
+        outputs['cues'] = cues_path_for(outputs['html'])
+    binary = BinaryTranscriptBuilder(meta) if 'bin' in paths else None
+
+    with ExitStack() as stack:
+        files = {fmt: stack.enter_context(AtomicFile(path, binary=(fmt == 'bin')))
+                 for fmt, path in outputs.items() if fmt != 'html'}
+        txt = files.get('txt')
+        srt = files.get('srt')
+        vtt = files.get('vtt')
+        js = files.get('json')
+        html = files.get('cues')
+        highlight = files.get('highlight')
+
+        # 머리말
+        if vtt:
+            vtt.write("WEBVTT\n\n")
+        if js:
+            header = dict(meta)
+            if text is not None:
+                header['text'] = text
+            js.write(json.dumps(header, ensure_ascii=False)[:-1])
+            js.write(', ' if header else '')
+            js.write('"segments": [')
+        if html:
+            html.write(render_head(audio_file))
+            duration = 0.0
+        if highlight:
+            from srt_to_word_highlight import highlight_record
+            highlight.write('[')
+            highlight_count = 0
+
+        # 세그먼트 한 번 순회
+        text_parts = [] if txt and text is None else None
+        i = 0
+        for i, segment in enumerate(segments, 1):
+            seg_text = segment['text']
+            if text_parts is not None:
+                text_parts.append(seg_text)
+            if srt:
+                srt.write(f"{i}\n{format_timestamp(segment['start'])} --> "
+                          f"{format_timestamp(segment['end'])}\n{seg_text}\n\n")
+            if vtt:
+                vtt.write(f"{format_timestamp_vtt(segment['start'])} --> "
+                          f"{format_timestamp_vtt(segment['end'])}\n{seg_text}\n\n")
+            if js:
+                js.write(('\n  ' if i == 1 else ',\n  ') + json.dumps(segment, ensure_ascii=False))
+            if binary:
+                binary.add(segment)
+            if highlight and seg_text:
+                highlight_count += 1
+                highlight.write(('\n  ' if highlight_count == 1 else ',\n  ')
+                                + json.dumps(highlight_record(segment, i), ensure_ascii=False))
+            if html:
+                html.write(render_cue(segment))
+                duration = segment['end']
+
+        # 맺음말
+        if txt:
+            txt.write(text if text is not None else ''.join(text_parts))
+        if js:
+            js.write('\n]}\n')
+        if binary:
+            files['bin'].write(binary.to_bytes())
+        if highlight:
+            highlight.write('\n]\n')
+        if html:
+            html.write(render_tail(i, duration))
+
+    # 페이지는 자막 데이터 파일이 완성된 뒤에 만듦
+    if 'html' in outputs:
+        write_player_page(outputs['html'], outputs['cues'], assets_root)
+    return outputs
+
+
+class StreamingWriter:
+    """
+    세그먼트가 나오는 즉시 SRT · VTT · JSON Lines 파일에 추가하고 flush
+
+    진행 중에도 다른 프로그램이 부분 자막을 읽을 수 있고, 세그먼트를 메모리에 모아 두지 않습니다.
+    paths: {형식: 경로} ('srt', 'vtt', 'jsonl' 중 일부)
+    """
+
+    def __init__(self, paths):
+        self.paths = {fmt: Path(path) for fmt, path in paths.items() if fmt in STREAM_FORMATS}
+        self.count = 0
+        self._files = {}
+
+    def __enter__(self):
+        for fmt, path in self.paths.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 기존 파일은 캐시 objects/와 하드링크일 수 있으므로 지우고 새 파일로 씀 (캐시 내용 보존)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            self._files[fmt] = open(path, 'x', encoding='utf-8')
+        if 'vtt' in self._files:
+            self._files['vtt'].write("WEBVTT\n\n")
+            self._files['vtt'].flush()
+        return self
+
+    def append(self, segment):
+        """정규화된 세그먼트 레코드 하나를 모든 파일에 추가"""
+        self.count += 1
+        files = self._files
+        if 'srt' in files:
+            files['srt'].write(f"{self.count}\n{format_timestamp(segment['start'])} --> "
+                               f"{format_timestamp(segment['end'])}\n{segment['text']}\n\n")
+        if 'vtt' in files:
+            files['vtt'].write(f"{format_timestamp_vtt(segment['start'])} --> "
+                               f"{format_timestamp_vtt(segment['end'])}\n{segment['text']}\n\n")
+        if 'jsonl' in files:
+            files['jsonl'].write(json.dumps(segment, ensure_ascii=False) + '\n')
+        for f in files.values():
+            f.flush()
+
+    def __exit__(self, exc_type, exc, tb):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        return False
+
+
+def read_jsonl(path):
+    """JSON Lines 세그먼트 파일을 한 줄씩 읽어 레코드 반환"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def stream_transcript(segments, paths, simplify=True, on_segment=None):
+    """
+    디코딩 중인 Whisper 세그먼트를 하나씩 정규화해 바로 이어 쓰기
+
+    segments: 백엔드 stream()이 반환하는 세그먼트 이터레이터
+    paths: {형식: 경로} ('srt', 'vtt', 'jsonl')
+    on_segment: 기록할 때마다 on_segment(지금까지 개수, 레코드) 호출 (진행률 표시 등)
+    반환값: 기록한 세그먼트 수
+    """
+    from text_normalize import normalize_segment
+
+    with StreamingWriter(paths) as writer:
+        for segment in segments:
+            record = normalize_segment(segment, writer.count + 1, simplify)
+            writer.append(record)
+            if on_segment is not None:
+                on_segment(writer.count, record)
+    return writer.count
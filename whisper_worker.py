@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Whisper 모델 상주 작업자
+모델을 한 번만 로드해 메모리에 유지하고, 여러 음성 파일을 차례로 변환합니다.
+실제 엔진(openai-whisper, CTranslate2)은 asr_backends에서 선택합니다.
+"""
+
+import threading
+
+# (모델 크기, 디바이스, 백엔드, 모델 폴더) → 작업자, 프로세스 전체에서 공유
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+class WhisperWorker:
+    """Whisper 모델을 로드한 채로 유지하는 장기 실행 작업자"""
+
+    def __init__(self, model_size="base", device=None, backend=None, model_dir=None):
+        from asr_backends import create_backend
+
+        self.model_size = model_size
+        self.device = device
+        self.backend = create_backend(backend, model_size, device=device, model_dir=model_dir)
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self):
+        """모델을 처음 필요할 때 한 번만 로드"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    print(f"📥 Whisper 모델 로딩 중: {self.model_size} [{self.backend.name}] (최초 1회)")
+                    self.backend.load()
+                    self._model = self.backend
+        return self._model
+
+    @property
+    def loaded(self):
+        """모델이 이미 메모리에 있는지"""
+        return self._model is not None
+
+    def load(self):
+        """모델을 미리 로드 (첫 작업의 지연 제거)"""
+        return self.model
+
+    def transcribe(self, audio, **options):
+        """상주 모델로 음성 변환 (동시 호출은 순서대로 처리)"""
+        model = self.model
+        with self._model_lock:
+            return model.transcribe(audio, **options)
+
+    def stream(self, audio, **options):
+        """
+        상주 모델로 세그먼트를 디코딩되는 대로 하나씩 반환
+
+        디코딩(다음 세그먼트 꺼내기)할 때만 모델 잠금을 잡고, 세그먼트를 넘겨준 동안은 풀어 둠
+        → 느린 소비자(fsync하는 스트리밍 기록 등)가 다른 요청을 막지 않음
+        """
+        model = self.model
+        segments = model.stream(audio, **options)
+        try:
+            while True:
+                with self._model_lock:
+                    segment = next(segments, None)
+                if segment is None:
+                    return
+                yield segment
+        finally:
+            close = getattr(segments, 'close', None)
+            if close is not None:
+                with self._model_lock:
+                    close()
+
+    def close(self):
+        """모델 해제"""
+        with self._model_lock:
+            self._model = None
+            self.backend.model = None
+
+
+def get_worker(model_size="base", device=None, backend=None, model_dir=None):
+    """(모델 크기, 디바이스, 백엔드, 모델 폴더)별로 공유되는 상주 작업자 반환"""
+    key = (model_size, device, backend, model_dir)
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None:
+            worker = WhisperWorker(model_size, device, backend, model_dir)
+            _workers[key] = worker
+        return worker
+
+
+def close_all():
+    """모든 상주 작업자 종료"""
+    with _workers_lock:
+        workers = list(_workers.values())
+        _workers.clear()
+    for worker in workers:
+        worker.close()